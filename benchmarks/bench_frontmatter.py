@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""Compare the old whole-file frontmatter parse with the streaming reader.
+
+Usage: python benchmarks/bench_frontmatter.py [--copies 150] [--body-kb 32]
+
+The baseline is the pre-cache implementation: read the whole file, split on
+``\\n---\\n`` and run ``yaml.safe_load``. The new reader stops at the closing
+delimiter and uses ``CSafeLoader`` when available; a fresh ``ParseCache`` is
+used per pass so every file is a cold miss.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import yaml
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / "src"))
+
+import pussla_frontmatter  # noqa: E402
+from scaled_dataset import make_scaled_dataset  # noqa: E402
+
+
+def _baseline(path: Path) -> tuple[dict, str]:
+    text = path.read_text(encoding="utf-8")
+    parts = text.split("\n---\n", 1)
+    return yaml.safe_load(parts[0][4:]) or {}, parts[1]
+
+
+def _baseline_summary(path: Path) -> str:
+    _data, body = _baseline(path)
+    for line in body.splitlines():
+        if line.strip():
+            return line.strip()
+    return ""
+
+
+def _time(fn, paths: list[Path], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(paths)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--copies", type=int, default=150)
+    parser.add_argument("--body-kb", type=int, default=32)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = make_scaled_dataset(Path(tmp), args.copies, args.body_kb)
+        people = sorted((root / "planning" / "people").glob("*.md"))
+        projects = sorted((root / "planning" / "projects").glob("*.md"))
+        print(f"loader: {pussla_frontmatter._YAML_LOADER.__name__}")
+        print(f"files: {len(people)} people, {len(projects)} projects (body padding {args.body_kb} KiB)")
+        print(f"{'case':<28}{'baseline ms/file':>18}{'reader ms/file':>16}{'speedup':>10}")
+
+        cases = [
+            ("people frontmatter", people,
+             lambda ps: [_baseline(p) for p in ps],
+             lambda ps: [pussla_frontmatter.ParseCache().load(p) for p in ps]),
+            ("project frontmatter+summary", projects,
+             lambda ps: [_baseline_summary(p) for p in ps],
+             lambda ps: [(c.load(p), c.summary(p)) for c in [pussla_frontmatter.ParseCache()] for p in ps]),
+        ]
+        for label, paths, old, new in cases:
+            old_s = _time(old, paths, args.repeat)
+            new_s = _time(new, paths, args.repeat)
+            per_old = old_s * 1000 / len(paths)
+            per_new = new_s * 1000 / len(paths)
+            print(f"{label:<28}{per_old:>18.3f}{per_new:>16.3f}{old_s / new_s:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
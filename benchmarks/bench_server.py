@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""Load-test the threaded and asyncio dashboard servers side by side.
+
+Usage: python benchmarks/bench_server.py [--copies 50] [--clients 50 500] [--requests 20]
+
+Each server runs ``run_dashboard.py`` as a separate process on a scaled copy
+of the sample data. For every ``--clients`` level, that many clients each
+keep a connection open, reconnecting when the server closes it. Each client
+fetches the gzipped v2 payload and then revalidates it with
+``If-None-Match`` ``--requests`` times, which is what an open dashboard tab
+does. ``--full`` fetches the whole payload every time instead. Reported:
+throughput, latency percentiles, failed requests (including 503s) and the
+peak number of server threads.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / "src"))
+
+from scaled_dataset import make_scaled_dataset  # noqa: E402
+
+RUN_DASHBOARD = Path(__file__).resolve().parent.parent / "src" / "dashboard" / "run_dashboard.py"
+PATH = "/api/dashboard-data?format=v2"
+
+
+async def _read_response(reader: asyncio.StreamReader) -> tuple[int, dict[str, str], int]:
+    head = await reader.readuntil(b"\r\n\r\n")
+    status_line, *lines = head.decode("iso-8859-1").split("\r\n")
+    headers = {}
+    for line in lines:
+        name, sep, value = line.partition(":")
+        if sep:
+            headers[name.strip().lower()] = value.strip()
+    status = int(status_line.split()[1])
+    size = 0
+    if headers.get("transfer-encoding") == "chunked":
+        while True:
+            chunk = int((await reader.readline()).split(b";")[0], 16)
+            size += len(await reader.readexactly(chunk + 2)) - 2
+            if chunk == 0:
+                break
+    elif status != 304:
+        size = len(await reader.readexactly(int(headers.get("content-length", "0"))))
+    return status, headers, size
+
+
+async def _client(port: int, requests: int, full: bool, latencies: list[float], failures: list[str]) -> None:
+    etag = None
+    remaining = requests + 1
+    while remaining:
+        try:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port, limit=1 << 20)
+        except OSError as exc:
+            failures.append(f"connect: {exc}")
+            return
+        try:
+            # Reconnect, like a browser, when the server closes the connection.
+            while remaining:
+                request = f"GET {PATH} HTTP/1.1\r\nHost: bench\r\nAccept-Encoding: gzip\r\n"
+                if etag is not None and not full:
+                    request += f"If-None-Match: {etag}\r\n"
+                start = time.perf_counter()
+                writer.write((request + "\r\n").encode("ascii"))
+                status, headers, _size = await _read_response(reader)
+                latencies.append(time.perf_counter() - start)
+                remaining -= 1
+                if status not in (200, 304):
+                    failures.append(f"HTTP {status}")
+                etag = headers.get("etag", etag)
+                if headers.get("connection") == "close":
+                    break
+        except (OSError, asyncio.IncompleteReadError, ValueError) as exc:
+            failures.append(type(exc).__name__)
+            return
+        finally:
+            writer.close()
+
+
+def _thread_count(pid: int) -> int:
+    try:
+        with open(f"/proc/{pid}/status", encoding="ascii") as handle:
+            for line in handle:
+                if line.startswith("Threads:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return 0
+
+
+def _start_server(mode: str, data_dir: Path, workers: int | None) -> tuple[subprocess.Popen, int]:
+    command = [sys.executable, "-u", str(RUN_DASHBOARD), "--data-dir", str(data_dir), "--port", "0", "--server", mode, "--watch"]
+    if workers is not None:
+        command += ["--workers", str(workers)]
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    for line in process.stdout:
+        if "running at" in line:
+            return process, int(line.rsplit(":", 1)[1])
+    raise SystemExit(f"{mode} server did not start")
+
+
+def _run_level(port: int, pid: int, clients: int, requests: int, full: bool) -> dict[str, float]:
+    latencies: list[float] = []
+    failures: list[str] = []
+    peak = [0]
+    done = threading.Event()
+
+    def sample() -> None:
+        while not done.wait(0.05):
+            peak[0] = max(peak[0], _thread_count(pid))
+
+    sampler = threading.Thread(target=sample, daemon=True)
+    sampler.start()
+
+    async def run() -> None:
+        await asyncio.gather(*(_client(port, requests, full, latencies, failures) for _ in range(clients)))
+
+    start = time.perf_counter()
+    asyncio.run(run())
+    elapsed = time.perf_counter() - start
+    done.set()
+    sampler.join()
+    latencies.sort()
+
+    def percentile(p: float) -> float:
+        return latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000 if latencies else float("nan")
+
+    return {
+        "rps": len(latencies) / elapsed,
+        "p50": percentile(0.50),
+        "p99": percentile(0.99),
+        "failed": len(failures),
+        "threads": peak[0],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--copies", type=int, default=50)
+    parser.add_argument("--clients", type=int, nargs="+", default=[50, 500])
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=None, help="--workers for the asyncio server")
+    parser.add_argument("--full", action="store_true", help="Fetch the full payload on every request")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = make_scaled_dataset(Path(tmp), args.copies)
+        people = len(list((root / "planning" / "people").glob("*.md")))
+        mode_label = "full fetches" if args.full else "revalidations"
+        print(f"people files: {people}; {args.requests} {mode_label} per client after the first fetch")
+        print(f"{'server':<10}{'clients':>8}{'req/s':>10}{'p50 ms':>9}{'p99 ms':>9}{'failed':>8}{'threads':>9}")
+        for mode in ("threaded", "asyncio"):
+            process, port = _start_server(mode, root, args.workers)
+            try:
+                for clients in args.clients:
+                    result = _run_level(port, process.pid, clients, args.requests, args.full)
+                    print(
+                        f"{mode:<10}{clients:>8}{result['rps']:>10.0f}{result['p50']:>9.1f}"
+                        f"{result['p99']:>9.1f}{result['failed']:>8}{result['threads']:>9}"
+                    )
+            finally:
+                process.terminate()
+                process.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""Compare full-dump and minimal-diff writes of a large people file.
+
+Usage: python benchmarks/bench_writer.py [--entries 400] [--weeks 26]
+
+Builds one people file with ``--entries`` allocation entries of ``--weeks``
+weeks each, replaces one week the way ``update_week_allocations`` does, and
+times rendering the result with ``dump_frontmatter`` (the old writer) and
+``patch_frontmatter``, as well as a full ``update_week_allocations`` call.
+Also reports how many lines each writer changes.
+"""
+
+from __future__ import annotations
+
+import argparse
+import copy
+import difflib
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import yaml
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT / "src"))
+sys.path.append(str(ROOT / "src" / "dashboard"))
+
+import pussla_engine  # noqa: E402
+import pussla_writer  # noqa: E402
+from pussla_weeks import week_from_ordinal, week_of  # noqa: E402
+
+
+def _people_file(entries: int, weeks: int) -> str:
+    first = week_of("2026-W01").ordinal
+    lines = ["---", "alias: bench", "role_id: Consultant", "skills: [python, sql]", "allocations:"]
+    for n in range(entries):
+        labels = [week_from_ordinal(first + (n + k) % 52).label for k in range(weeks)]
+        lines += [
+            f"  - project: Project-{n:04d}",
+            f"    weeks: [{', '.join(sorted(labels))}]",
+            f"    load: {10 + n % 50}",
+        ]
+    return "\n".join(lines) + "\n---\nNotes\n"
+
+
+def _changed_lines(before: str, after: str) -> int:
+    diff = difflib.unified_diff(before.splitlines(), after.splitlines(), lineterm="", n=0)
+    return sum(1 for line in diff if line[:1] in "+-" and line[:3] not in ("+++", "---"))
+
+
+def _time(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=400)
+    parser.add_argument("--weeks", type=int, default=26)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    text = _people_file(args.entries, args.weeks)
+    read = yaml.safe_load(text.split("\n---\n", 1)[0][4:])
+    edits = [{"project": "Project-0000", "load": 60}]
+    week, entries = pussla_engine._normalize_week_edit("bench", "2026-W10", edits)
+    data = copy.deepcopy(read)
+    original = data["allocations"]
+    pussla_engine._replace_week_allocations(data, week, entries)
+
+    full = pussla_writer.dump_frontmatter(data, "Notes\n")
+    patched = pussla_writer.patch_frontmatter(text, data, original)
+    assert yaml.safe_load(patched.split("\n---\n", 1)[0][4:]) == data
+
+    print(f"people file: {len(text) / 1024:.0f} KB, {args.entries} entries x {args.weeks} weeks")
+    full_ms = _time(lambda: pussla_writer.dump_frontmatter(data, "Notes\n"), args.repeat) * 1000
+    patch_ms = _time(lambda: pussla_writer.patch_frontmatter(text, data, original), args.repeat) * 1000
+    print(f"full dump:   {full_ms:7.1f} ms  {_changed_lines(text, full):6d} lines changed")
+    print(f"patch:       {patch_ms:7.1f} ms  {_changed_lines(text, patched):6d} lines changed")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        people = Path(tmp) / "planning" / "people"
+        people.mkdir(parents=True)
+        path = people / "bench.md"
+
+        def update() -> None:
+            path.write_text(text, encoding="utf-8")
+            pussla_engine.update_week_allocations(Path(tmp) / "planning", "bench", "2026-W10", edits)
+
+        print(f"update_week_allocations end to end: {_time(update, args.repeat) * 1000:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Build a scaled copy of the ``tst-data`` layout for benchmarks.
+
+Every people, identity and project file is cloned ``copies`` times under a
+new alias / project name, so the generated tree has the same shape as the
+sample data but thousands of files. Roles and ``skills.md`` are copied once.
+"""
+
+from __future__ import annotations
+
+import argparse
+import shutil
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+SAMPLE_DATA = REPO_ROOT / "tst-data"
+
+
+def _clone(source: Path, target: Path, replacements: dict[str, str], body_padding: str = "") -> None:
+    text = source.read_text(encoding="utf-8")
+    for old, new in replacements.items():
+        text = text.replace(old, new)
+    target.write_text(text + body_padding, encoding="utf-8")
+
+
+def make_scaled_dataset(target: Path, copies: int, body_kb: int = 0) -> Path:
+    """Write ``copies`` clones of the sample data below ``target``; return ``target``."""
+    planning = target / "planning"
+    for sub in ("people", "projects", "roles"):
+        (planning / sub).mkdir(parents=True, exist_ok=True)
+    (target / "identity").mkdir(parents=True, exist_ok=True)
+
+    for role in sorted((SAMPLE_DATA / "planning" / "roles").glob("*.md")):
+        shutil.copy(role, planning / "roles" / role.name)
+    shutil.copy(SAMPLE_DATA / "planning" / "skills.md", planning / "skills.md")
+
+    projects = sorted((SAMPLE_DATA / "planning" / "projects").glob("*.md"))
+    people = sorted((SAMPLE_DATA / "planning" / "people").glob("*.md"))
+    identities = {p.stem: p for p in (SAMPLE_DATA / "identity").glob("*.md")}
+    padding = ""
+    if body_kb > 0:
+        line = "Background notes for the delivery team and the steering group.\n"
+        padding = "\n## Notes\n" + line * max(1, (body_kb * 1024) // len(line))
+
+    for n in range(copies):
+        suffix = f"{n:04d}"
+        project_names = {p.stem: f"{p.stem}-{suffix}" for p in projects}
+        for path in projects:
+            new_name = project_names[path.stem]
+            _clone(path, planning / "projects" / f"{new_name}.md", {f"name: {path.stem}": f"name: {new_name}"}, padding)
+        for path in people:
+            alias = f"{path.stem}{suffix}"
+            replacements = {f"alias: {path.stem}": f"alias: {alias}"}
+            replacements.update({f"project: {old}": f"project: {new}" for old, new in project_names.items()})
+            _clone(path, planning / "people" / f"{alias}.md", replacements)
+            if path.stem in identities:
+                _clone(identities[path.stem], target / "identity" / f"{alias}.md", {f"alias: {path.stem}": f"alias: {alias}"})
+    return target
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate a scaled copy of tst-data")
+    parser.add_argument("target", help="Output folder (gets planning/ and identity/)")
+    parser.add_argument("--copies", type=int, default=100)
+    parser.add_argument("--body-kb", type=int, default=0, help="Pad project bodies with this many KiB of markdown")
+    args = parser.parse_args()
+    make_scaled_dataset(Path(args.target), args.copies, args.body_kb)
+    print(f"Wrote scaled dataset to {args.target}")
+
+
+if __name__ == "__main__":
+    main()
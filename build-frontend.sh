@@ -31,4 +31,8 @@ fi
 echo "Building frontend"
 npm run build
 
+cd - >/dev/null
+echo "Precompressing frontend assets"
+python3 src/dashboard/precompress_static.py "${FRONTEND_DIR}/dist"
+
 echo "Frontend build complete: ${FRONTEND_DIR}/dist"
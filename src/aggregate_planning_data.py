@@ -8,10 +8,12 @@ import sys
 from collections import defaultdict
 from pathlib import Path
 from typing import Any
-from datetime import datetime
 
 import yaml
 
+from pussla_frontmatter import FrontmatterError, load_frontmatter
+from pussla_weeks import week_of, weeks_in
+
 
 def read_yaml(path: Path) -> Any:
     with path.open("r", encoding="utf-8") as f:
@@ -19,21 +21,18 @@ def read_yaml(path: Path) -> Any:
 
 
 def parse_frontmatter(path: Path) -> dict[str, Any]:
-    text = path.read_text(encoding="utf-8")
-    if not text.startswith("---\n"):
-        return {}
-    parts = text.split("\n---\n", 1)
-    if len(parts) != 2:
+    try:
+        return load_frontmatter(path)
+    except FrontmatterError:
         return {}
-    data = yaml.safe_load(parts[0][4:]) or {}
-    return data if isinstance(data, dict) else {}
 
 
 def get_month_from_iso_week(iso_week: str) -> str:
     """Map YYYY-Www to YYYY-MM based on the first day of the ISO week."""
-    # datetime.strptime(..., "%G-W%V-%u") is supported in 3.6+
-    d = datetime.strptime(iso_week + '-1', "%G-W%V-%u")
-    return d.strftime("%Y-%m")
+    week = week_of(iso_week)
+    if week is None:
+        raise ValueError(f"invalid ISO week '{iso_week}' (expected YYYY-Www)")
+    return week.month
 
 
 def aggregate_data(people_dir: Path) -> dict[str, dict[str, int]]:
@@ -48,14 +47,21 @@ def aggregate_data(people_dir: Path) -> dict[str, dict[str, int]]:
         for entry in entries:
             load = entry.get("load", 0)
             weeks = entry.get("weeks", [])
-            for week in weeks:
-                totals[alias][week] += load
+            for item in weeks:
+                named = weeks_in(item)
+                for week in [item] if named is None else [parsed.label for parsed in named]:
+                    totals[alias][week] += load
     return totals
 
 
+def _summary_sort_key(week: str) -> tuple[int, str]:
+    parsed = week_of(week)
+    return (parsed.ordinal, week) if parsed is not None else (-1, str(week))
+
+
 def generate_summary(totals: dict[str, dict[str, int]]):
     """Generate a summary report."""
-    all_weeks = sorted({w for by_week in totals.values() for w in by_week})
+    all_weeks = sorted({w for by_week in totals.values() for w in by_week}, key=_summary_sort_key)
     if not all_weeks:
         print("No planning data found.")
         return
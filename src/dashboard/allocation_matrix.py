@@ -0,0 +1,146 @@
+"""Columnar alias x week allocation store used to assemble the dashboard.
+
+Hours and capacity live in flat, row-major ``array('d')`` buffers (one row
+per alias, one column per week, columns looked up by week ordinal) instead
+of nested per-user dicts, with one layer per assignment state and one week
+vector per project. An entry is added a run of consecutive columns at a
+time with slice assignments. Utilization, its average, the overbooked
+count and the per-state and per-project totals are computed with builtin
+reductions over those buffers rather than Python-level bucket loops.
+"""
+
+from __future__ import annotations
+
+from array import array
+from itertools import repeat
+from operator import add
+from typing import TYPE_CHECKING, Any, Iterable, Iterator
+
+if TYPE_CHECKING:
+    from pussla_weeks import IsoWeek
+
+STATES = ("committed", "tentative")
+
+
+def _runs(columns: list[int]) -> Iterator[tuple[int, int]]:
+    """Split sorted ``columns`` into ``[start, stop)`` runs of consecutive columns."""
+    start = 0
+    for idx in range(1, len(columns) + 1):
+        if idx == len(columns) or columns[idx] != columns[idx - 1] + 1:
+            yield columns[start], columns[idx - 1] + 1
+            start = idx
+
+
+def _add_to_slice(values: array, start: int, stop: int, amount: float) -> None:
+    if stop - start == 1:
+        values[start] += amount
+    else:
+        values[start:stop] = array("d", map(add, values[start:stop], repeat(amount, stop - start)))
+
+
+class AllocationMatrix:
+    """Dense planned-hours and capacity matrices for a fixed alias/week grid.
+
+    ``layers`` holds the planned hours per cell for each assignment state
+    and ``planned`` their sum, and ``capacity`` holds the capacity
+    of the last allocation written to a cell (``default_capacity`` when the
+    cell has none). ``project_hours`` holds one week vector of hours per
+    project, and ``project_weeks`` marks every week a project appears in,
+    even with zero hours.
+    """
+
+    def __init__(self, aliases: list[str], weeks: list[IsoWeek], default_capacity: float):
+        self.aliases = aliases
+        self.weeks = weeks
+        self.alias_index = {alias: idx for idx, alias in enumerate(aliases)}
+        self.week_index = {week.ordinal: idx for idx, week in enumerate(weeks)}
+        self.default_capacity = default_capacity
+        size = len(aliases) * len(weeks)
+        self._planned: array | None = None
+        self.capacity = array("d", [default_capacity]) * size
+        self.layers = {state: array("d", bytes(8 * size)) for state in STATES}
+        self.slot_projects: list[list[dict[str, Any]] | None] = [None] * size
+        self.project_hours: dict[str, array] = {}
+        self.project_weeks: dict[str, bytearray] = {}
+
+    @property
+    def planned(self) -> array:
+        """Total planned hours per cell, the element-wise sum of the state layers."""
+        if self._planned is None:
+            self._planned = array("d", map(add, *self.layers.values()))
+        return self._planned
+
+    def cell(self, alias: str, week: IsoWeek) -> int:
+        return self.alias_index[alias] * len(self.weeks) + self.week_index[week.ordinal]
+
+    def add(
+        self,
+        alias: str,
+        project: str,
+        weeks: Iterable[IsoWeek],
+        hours: float,
+        capacity: float,
+        state: str,
+        slot: dict[str, Any],
+    ) -> None:
+        """Add one allocation entry to every listed week of ``alias``.
+
+        ``slot`` is the per-week project record emitted in ``weekly_stats``;
+        the same object is shared by all weeks of the entry.
+        """
+        width = len(self.weeks)
+        row = self.alias_index[alias] * width
+        layer = self.layers[state]
+        project_hours = self.project_hours.get(project)
+        if project_hours is None:
+            project_hours = self.project_hours[project] = array("d", bytes(8 * width))
+            self.project_weeks[project] = bytearray(width)
+        project_weeks = self.project_weeks[project]
+        self._planned = None
+        columns = sorted(self.week_index[week.ordinal] for week in weeks)
+        for start, stop in _runs(columns):
+            _add_to_slice(layer, row + start, row + stop, hours)
+            _add_to_slice(project_hours, start, stop, hours)
+            if capacity > 0:
+                self.capacity[row + start:row + stop] = array("d", [capacity]) * (stop - start)
+            project_weeks[start:stop] = b"\x01" * (stop - start)
+        slots = self.slot_projects
+        for col in columns:
+            bucket = slots[row + col]
+            if bucket is None:
+                slots[row + col] = [slot]
+            else:
+                bucket.append(slot)
+
+    def load_percentages(self) -> list[float]:
+        """Per-cell utilization in percent, rounded to one decimal, row-major."""
+        return [round((hours / cap) * 100, 1) for hours, cap in zip(self.planned, self.capacity)]
+
+    @staticmethod
+    def utilization_metrics(loads: list[float]) -> tuple[float, int]:
+        """Average load (one decimal) and the number of cells above 100 %."""
+        if not loads:
+            return 0.0, 0
+        return round(sum(loads) / len(loads), 1), sum(map((100.0).__lt__, loads))
+
+    def row(self, values: Any, alias_idx: int) -> Any:
+        width = len(self.weeks)
+        return values[alias_idx * width:(alias_idx + 1) * width]
+
+    def project_bounds(self, project: str) -> tuple[IsoWeek, IsoWeek] | None:
+        """First and last week ``project`` appears in, or None when unused."""
+        mask = self.project_weeks.get(project)
+        if mask is None:
+            return None
+        first = mask.find(1)
+        if first < 0:
+            return None
+        return self.weeks[first], self.weeks[mask.rfind(1)]
+
+    def project_totals(self) -> dict[str, float]:
+        """Total planned hours per project across all aliases and weeks."""
+        return {project: sum(hours) for project, hours in self.project_hours.items()}
+
+    def state_totals(self) -> dict[str, float]:
+        """Total planned hours per assignment state."""
+        return {state: sum(layer) for state, layer in self.layers.items()}
@@ -0,0 +1,281 @@
+"""Asyncio HTTP/1.1 front end for ``BaseHTTPRequestHandler`` subclasses.
+
+A threaded HTTP server ties up a thread for every connection as long as
+the connection stays open, so a few hundred open dashboards mean a few
+hundred mostly idle threads, or a long wait for a pool thread.
+``AsyncHTTPServer`` keeps connections on one event loop instead. It reads
+each request (head and body) itself and then runs the handler on a bounded
+thread pool against an in-memory copy of the request, so the handler code
+and routes are shared with the threaded server.
+
+Back-pressure works both ways:
+
+* At most ``max_connections`` connections are open; further ones are
+  answered with 503 and ``Retry-After`` and closed.
+* At most ``max_pending`` requests have their body read, wait for the pool
+  or run on it. A request takes its slot right after its head is read, so
+  beyond that, bodies stay unread until a slot frees up. Overload is
+  pushed back to the clients through TCP instead of piling up in memory,
+  and memory is bounded by ``max_pending`` bodies and
+  ``max_connections`` heads.
+* A handler writing faster than its client reads waits until the transport
+  buffer has drained. A client that stops reading for ``write_timeout``
+  seconds is disconnected.
+
+Idle keep-alive connections are closed after ``keep_alive_timeout`` seconds.
+Subclasses can serve long-lived responses such as event streams directly
+on the loop by overriding ``serve_stream``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import email.utils
+import http.client
+import io
+import os
+import socket
+import sys
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from email.message import Message
+from http.server import BaseHTTPRequestHandler
+from typing import Any, Awaitable, Callable
+
+# Longest request line plus headers; longer heads are answered with 431.
+MAX_REQUEST_HEAD_BYTES = 64 * 1024
+# Default cap on request bodies, which are read into memory before the handler runs.
+MAX_REQUEST_BODY_BYTES = 16 * 1024 * 1024
+# Handler output is handed to the loop in blocks of up to this size.
+WRITE_BLOCK_BYTES = 64 * 1024
+
+
+class _Exchange:
+    """Socket stand-in for one request: the buffered request in, the event loop out."""
+
+    def __init__(self, request: bytes, writer: asyncio.StreamWriter, loop: asyncio.AbstractEventLoop, write_timeout: float):
+        self._request = request
+        self._writer = writer
+        self._loop = loop
+        self._write_timeout = write_timeout
+        self.keep_alive = False
+
+    def makefile(self, mode: str, buffering: int = -1) -> io.IOBase:
+        if "r" in mode:
+            return io.BytesIO(self._request)
+        return io.BufferedWriter(_LoopWriter(self), buffering if buffering > 0 else WRITE_BLOCK_BYTES)
+
+    def sendall(self, data: bytes) -> None:
+        """Write from a pool thread, waiting until the loop has drained the data."""
+        try:
+            future = asyncio.run_coroutine_threadsafe(self._send(bytes(data)), self._loop)
+        except RuntimeError as exc:  # the loop has shut down
+            raise ConnectionAbortedError("server is shutting down") from exc
+        future.result()
+
+    async def _send(self, data: bytes) -> None:
+        self._writer.write(data)
+        try:
+            await asyncio.wait_for(self._writer.drain(), self._write_timeout)
+        except asyncio.TimeoutError:
+            self._writer.transport.abort()
+            raise ConnectionResetError("client stopped reading the response") from None
+
+
+class _LoopWriter(io.RawIOBase):
+    def __init__(self, exchange: _Exchange):
+        self._exchange = exchange
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._exchange.sendall(data)
+        return len(data)
+
+
+class _SingleRequest:
+    """Mixed into the handler class: handle exactly one buffered request."""
+
+    wbufsize = WRITE_BLOCK_BYTES
+
+    def handle(self) -> None:
+        self.handle_one_request()
+        self.request.keep_alive = not self.close_connection
+
+    def handle_expect_100(self) -> bool:
+        # The front end has already sent 100 Continue and read the body.
+        return True
+
+
+class AsyncHTTPServer:
+    """Serve ``handler_class`` over asyncio with a bounded pool of handler threads.
+
+    Mirrors the ``socketserver`` life cycle: the socket is bound on
+    construction, ``serve_forever()`` runs until ``shutdown()`` is called
+    from another thread, and ``server_close()`` releases the socket and
+    the pool. Handlers see this object as ``self.server``.
+    """
+
+    # Seconds an idle keep-alive connection stays open.
+    keep_alive_timeout = 75.0
+    # Seconds a response write may wait for a client that is not reading.
+    write_timeout = 30.0
+    max_body_bytes = MAX_REQUEST_BODY_BYTES
+    max_connections = 1024
+    # Seconds suggested to rejected clients.
+    retry_after = 1
+
+    def __init__(
+        self,
+        server_address: tuple[str, int],
+        handler_class: type[BaseHTTPRequestHandler],
+        handler_kwargs: dict[str, Any] | None = None,
+        workers: int | None = None,
+        max_pending: int | None = None,
+    ):
+        if workers is not None and workers < 1:
+            raise ValueError(f"workers must be at least 1, got {workers}")
+        if max_pending is not None and max_pending < 1:
+            raise ValueError(f"max_pending must be at least 1, got {max_pending}")
+        self.workers = workers or min(32, (os.cpu_count() or 1) + 4)
+        self.max_pending = max_pending or 4 * self.workers
+        self.socket = socket.create_server(server_address)
+        self.server_address = self.socket.getsockname()
+        self._handler_class = type(handler_class.__name__, (_SingleRequest, handler_class), {})
+        self._handler_kwargs = handler_kwargs or {}
+        self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix="http-worker")
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._stop: asyncio.Event | None = None
+        self._pending: asyncio.Semaphore | None = None
+        self._started = threading.Event()
+        self._stopped = threading.Event()
+
+    def serve_forever(self) -> None:
+        try:
+            asyncio.run(self._serve())
+        finally:
+            self._stopped.set()
+
+    def shutdown(self) -> None:
+        """Stop ``serve_forever`` and wait for it to return; call from another thread."""
+        self._started.wait()
+        try:
+            self._loop.call_soon_threadsafe(self._stop.set)
+        except RuntimeError:  # the loop has already finished
+            pass
+        self._stopped.wait()
+
+    def server_close(self) -> None:
+        self.socket.close()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def run_blocking(self, fn: Callable[..., Any], *args: Any) -> Awaitable[Any]:
+        """Run ``fn(*args)`` on the handler pool; await the result from the loop."""
+        return asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    async def serve_stream(self, method: str, target: str, headers: Message, writer: asyncio.StreamWriter) -> bool:
+        """Hook for responses served on the loop; return True if the request was handled.
+
+        The connection is closed afterwards.
+        """
+        return False
+
+    async def _serve(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._stop = asyncio.Event()
+        self._pending = asyncio.Semaphore(self.max_pending)
+        connections: set[asyncio.Task] = set()
+
+        async def accepted(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+            if len(connections) >= self.max_connections:
+                await self._reject_connection(reader, writer)
+                return
+            task = asyncio.current_task()
+            connections.add(task)
+            try:
+                await self._serve_connection(reader, writer)
+            finally:
+                connections.discard(task)
+
+        server = await asyncio.start_server(accepted, sock=self.socket, limit=MAX_REQUEST_HEAD_BYTES)
+        self._started.set()
+        await self._stop.wait()
+        server.close()
+        for task in list(connections):
+            task.cancel()
+        await asyncio.gather(*connections, return_exceptions=True)
+
+    async def _serve_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        peer = writer.get_extra_info("peername")
+        try:
+            while True:
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), self.keep_alive_timeout)
+                except asyncio.LimitOverrunError:
+                    await self._reject(writer, 431, "Request Header Fields Too Large")
+                    return
+                except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+                    return
+
+                request_line, _sep, header_block = head.partition(b"\r\n")
+                headers = http.client.parse_headers(io.BytesIO(header_block))
+                try:
+                    length = max(0, int(headers.get("Content-Length", "0")))
+                except ValueError:
+                    length = 0  # the handler answers 400
+                if length > self.max_body_bytes:
+                    await self._reject(writer, 413, "Content Too Large")
+                    return
+                words = request_line.decode("iso-8859-1").split()
+                if len(words) == 3 and await self.serve_stream(words[0], words[1], headers, writer):
+                    return
+
+                async with self._pending:
+                    body = b""
+                    if length:
+                        if headers.get("Expect", "").lower() == "100-continue":
+                            writer.write(b"HTTP/1.1 100 Continue\r\n\r\n")
+                        try:
+                            body = await asyncio.wait_for(reader.readexactly(length), self.keep_alive_timeout)
+                        except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+                            return
+                    exchange = _Exchange(head + body, writer, self._loop, self.write_timeout)
+                    await self.run_blocking(self._handle, exchange, peer)
+                if not exchange.keep_alive:
+                    return
+        finally:
+            writer.close()
+
+    def _handle(self, exchange: _Exchange, peer: Any) -> None:
+        try:
+            self._handler_class(exchange, peer, self, **self._handler_kwargs)
+        except OSError:
+            exchange.keep_alive = False
+        except Exception:
+            exchange.keep_alive = False
+            print(f"Exception while handling a request from {peer}:", file=sys.stderr)
+            traceback.print_exc()
+
+    async def _reject_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            # Read the request first; closing with it unread would reset the connection.
+            await asyncio.wait_for(reader.read(MAX_REQUEST_HEAD_BYTES), 1.0)
+            await self._reject(writer, 503, "Service Unavailable", f"Retry-After: {self.retry_after}\r\n")
+        except (asyncio.TimeoutError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _reject(self, writer: asyncio.StreamWriter, status: int, reason: str, extra_headers: str = "") -> None:
+        writer.write(
+            f"HTTP/1.1 {status} {reason}\r\n"
+            f"Date: {email.utils.formatdate(usegmt=True)}\r\n"
+            f"{extra_headers}"
+            "Content-Length: 0\r\nConnection: close\r\n\r\n".encode("ascii")
+        )
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
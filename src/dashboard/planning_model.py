@@ -0,0 +1,752 @@
+from __future__ import annotations
+
+import hashlib
+import queue
+import sys
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any, Callable, Iterable
+
+from pussla_engine import (
+    _load_identity_file,
+    _load_people_file,
+    _load_project_file,
+    _load_role_file,
+    apply_identities,
+    assemble_dashboard_data,
+    bulk_update_week_allocations,
+    update_project_metadata,
+    update_week_allocations,
+)
+from pussla_frontmatter import PARSE_CACHE, prefetch_frontmatter
+from pussla_snapshot import restore_snapshot, save_snapshot
+from write_behind import StagedChanges, WriteBehindQueue, default_journal_path
+
+FileSignature = tuple[int, int, int]
+EVENT_BACKLOG = 256
+# Changes remembered for ``dashboard_delta``; older clients reload in full.
+CHANGE_LOG_SIZE = 256
+# (fingerprint, last_modified, payload) of one assembled dashboard payload.
+VersionedPayload = tuple[str, float, dict[str, Any]]
+
+
+def _payload_key(payload_version: int, filters: dict[str, Any]) -> tuple:
+    return (
+        payload_version,
+        tuple(
+            (name, tuple(value) if isinstance(value, (list, set, tuple)) else value)
+            for name, value in sorted(filters.items())
+        ),
+    )
+
+
+def _file_signature(path: Path) -> FileSignature | None:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size, st.st_ino
+
+
+class _SourceDir:
+    """Parsed records for every ``*.md`` file in one directory.
+
+    Each record is stored with the stat signature it was parsed from, so a
+    refresh only re-parses files whose signature changed. A pinned record
+    (edits not yet written, see ``WriteBehindQueue``) is kept whatever the
+    file on disk looks like until it is unpinned.
+
+    Every replaced record is logged as ``(old, new)`` until
+    ``take_changes`` collects the log; either side is ``None`` for an
+    added or removed file.
+    """
+
+    def __init__(self, directory: Path, loader: Callable[[Path], Any]):
+        self.directory = directory
+        self._loader = loader
+        self._entries: dict[Path, tuple[Any, Any]] = {}
+        self._records: list[Any] | None = None
+        self._pinned: set[Path] = set()
+        self._changes: list[tuple[Any, Any]] = []
+
+    def _store(self, path: Path, entry: tuple[Any, Any] | None) -> None:
+        old = self._entries.pop(path, None) if entry is None else self._entries.get(path)
+        if entry is not None:
+            self._entries[path] = entry
+        self._records = None
+        self._changes.append((old[1] if old is not None else None, entry[1] if entry is not None else None))
+
+    def take_changes(self) -> list[tuple[Any, Any]]:
+        changes, self._changes = self._changes, []
+        return changes
+
+    def scan(self) -> tuple[dict[Path, FileSignature], list[Path]]:
+        """Stat the directory; return current signatures and the paths needing a parse."""
+        current: dict[Path, FileSignature] = {}
+        if self.directory.exists():
+            for path in self.directory.glob("*.md"):
+                signature = _file_signature(path)
+                if signature is not None:
+                    current[path] = signature
+        stale = [
+            path
+            for path, signature in current.items()
+            if path not in self._pinned and (path not in self._entries or self._entries[path][0] != signature)
+        ]
+        return current, stale
+
+    def refresh(self, current: dict[Path, FileSignature] | None = None) -> bool:
+        if current is None:
+            current, _stale = self.scan()
+
+        changed = False
+        for path in [p for p in self._entries if p not in current and p not in self._pinned]:
+            self._store(path, None)
+            changed = True
+        for path, signature in current.items():
+            known = self._entries.get(path)
+            if path in self._pinned or (known is not None and known[0] == signature):
+                continue
+            self._store(path, (signature, self._loader(path)))
+            changed = True
+        return changed
+
+    def update(self, path: Path) -> bool:
+        """Re-parse one file if its signature changed; return True if the records did."""
+        if path in self._pinned:
+            return False
+        signature = _file_signature(path)
+        known = self._entries.get(path)
+        if signature is None:
+            if known is None:
+                return False
+            self._store(path, None)
+        elif known is not None and known[0] == signature:
+            return False
+        else:
+            self._store(path, (signature, self._loader(path)))
+        return True
+
+    def reload(self, path: Path) -> None:
+        signature = _file_signature(path)
+        if signature is None:
+            if path in self._entries:
+                self._store(path, None)
+            return
+        self._store(path, (signature, self._loader(path)))
+
+    def pin(self, path: Path, record: Any, version: str) -> None:
+        self._pinned.add(path)
+        self._store(path, (("staged", version), record))
+
+    def unpin(self, path: Path) -> None:
+        self._pinned.discard(path)
+        self.reload(path)
+
+    def signatures(self) -> list[tuple[str, Any]]:
+        return [(str(path), entry[0]) for path, entry in self._entries.items()]
+
+    def records(self) -> list[Any]:
+        """Loaded records in sorted path order, skipping files the loader rejected."""
+        if self._records is None:
+            self._records = [
+                self._entries[path][1]
+                for path in sorted(self._entries)
+                if self._entries[path][1] is not None
+            ]
+        return self._records
+
+
+def _allocation_cells(record: dict[str, Any] | None) -> set[tuple]:
+    if record is None:
+        return set()
+    return {
+        (week.label, entry["project"], entry["load"], entry["hours"], entry["capacity_hours"], entry["state"])
+        for entry in record["allocations"]
+        for week in entry["weeks"]
+    }
+
+
+def _person_fields(record: dict[str, Any] | None) -> dict[str, Any] | None:
+    if record is None:
+        return None
+    return {name: value for name, value in record.items() if name not in ("allocations", "version")}
+
+
+def _tally_changes(
+    people: list[tuple[Any, Any]],
+    roles: list[tuple[Any, Any]],
+    projects: list[tuple[Any, Any]],
+    people_records: list[dict[str, Any]],
+    week_refs: Counter,
+) -> dict[str, set]:
+    """Reduce logged record changes to what they touch in the dashboard payload.
+
+    Returns ``aliases`` (people whose record changed at all), ``rows``
+    (people whose whole row changed: added, removed, or a new role or
+    skills, including everyone holding a changed role), ``cells``
+    (``(alias, week)`` pairs whose allocations changed), ``projects`` and
+    ``weeks_added`` (weeks no one was allocated in before). ``week_refs``
+    counts the people allocated in each week and is updated in place.
+    """
+    aliases: set[str] = set()
+    rows: set[str] = set()
+    cells: set[tuple[str, str]] = set()
+    project_names: set[str] = set()
+    weeks_added: set[str] = set()
+    for old, new in people:
+        if old == new:
+            continue
+        alias = (new or old)["alias"]
+        aliases.update(record["alias"] for record in (old, new) if record is not None)
+        if old is None or new is None or _person_fields(old) != _person_fields(new):
+            rows.update(record["alias"] for record in (old, new) if record is not None)
+        old_cells, new_cells = _allocation_cells(old), _allocation_cells(new)
+        for cell in old_cells ^ new_cells:
+            cells.add((alias, cell[0]))
+            project_names.add(cell[1])
+        old_weeks = {cell[0] for cell in old_cells}
+        new_weeks = {cell[0] for cell in new_cells}
+        for week in old_weeks - new_weeks:
+            week_refs[week] -= 1
+            if not week_refs[week]:
+                del week_refs[week]
+        for week in new_weeks - old_weeks:
+            if not week_refs[week]:
+                weeks_added.add(week)
+            week_refs[week] += 1
+    role_ids = {
+        record["role_id"] for old, new in roles if old != new for record in (old, new) if record is not None
+    }
+    if role_ids:
+        rows.update(record["alias"] for record in people_records if record.get("role_id") in role_ids)
+        aliases.update(rows)
+    for old, new in projects:
+        if old != new:
+            project_names.update(record[0] for record in (old, new) if record is not None)
+    return {"aliases": aliases, "rows": rows, "cells": cells, "projects": project_names, "weeks_added": weeks_added}
+
+
+def _sources_fingerprint(sources: list[_SourceDir]) -> str:
+    """Hash the path and stat signature of every file in ``sources``."""
+    digest = hashlib.sha1()
+    for source in sources:
+        for path, signature in sorted(source.signatures()):
+            digest.update(f"{path}\0{signature}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+class PlanningModel:
+    """Long-lived planning model for one planning/identity directory pair.
+
+    The model is built once, refreshed incrementally from file stat
+    signatures, and caches the assembled dashboard payload until a source
+    file changes, so repeated reads only pay for serialization.
+
+    Payloads are assembled outside the model lock, and concurrent requests
+    for the same payload share one build (single flight). With
+    ``stale_while_revalidate`` a request arriving after a change gets the
+    last payload built for it right away while a background thread builds
+    the new one.
+
+    Payloads are built alias-only, so one build serves both privacy
+    modes. Real names live in a separate identity index that is only
+    loaded when names are first asked for (``identities()``, or a v1
+    payload with ``include_pii``) and has its own fingerprint.
+
+    With ``write_behind`` (a debounce in seconds) week edits are journaled
+    and served from memory right away, and each people file is written
+    once per burst of edits; see ``WriteBehindQueue``. ``close()`` writes
+    whatever is still pending. The journal defaults to
+    ``default_journal_path(planning_dir)``, outside the planning repository.
+
+    Set ``watched`` once a ``PlanningWatcher`` feeds file changes to
+    ``apply_changes``; reads then stop stat-scanning the directories.
+
+    ``subscribe()`` returns a queue that receives one event per change
+    after the initial load: ``{"version", "data_version", "aliases",
+    "weeks", "projects"}`` (plus ``"names": True`` for identity changes),
+    where ``version`` is the new fingerprint. A subscriber that falls
+    ``EVENT_BACKLOG`` events behind gets a single ``{"version", "resync":
+    True}`` instead.
+
+    ``data_version`` counts planning changes. v2 payloads carry the
+    ``data_version`` they were built at, and ``dashboard_delta`` answers
+    what changed since a given one from a log of the last
+    ``CHANGE_LOG_SIZE`` changes.
+    """
+
+    def __init__(
+        self,
+        planning_dir: str | Path,
+        identity_dir: str | Path,
+        jobs: int = 1,
+        cache_dir: str | Path | None = None,
+        stale_while_revalidate: bool = False,
+        write_behind: float | None = None,
+        journal_path: str | Path | None = None,
+    ):
+        self.planning_dir = Path(planning_dir)
+        self.identity_dir = Path(identity_dir)
+        self.jobs = jobs
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self.stale_while_revalidate = stale_while_revalidate
+        self._snapshot_restored = False
+        self._snapshot_dirty = False
+        self.lock = threading.RLock()
+        self._people = _SourceDir(self.planning_dir / "people", _load_people_file)
+        self._roles = _SourceDir(self.planning_dir / "roles", _load_role_file)
+        self._projects = _SourceDir(self.planning_dir / "projects", _load_project_file)
+        self._identities = _SourceDir(self.identity_dir, _load_identity_file)
+        self._payloads: dict[tuple, VersionedPayload] = {}
+        self._stale: dict[tuple, VersionedPayload] = {}
+        self._inflight: dict[tuple[str, tuple], Future] = {}
+        self._fingerprint: str | None = None
+        self._last_modified = 0.0
+        self._identity_index: tuple[str, dict[str, dict[str, str | None]]] | None = None
+        self._identity_modified = 0.0
+        self._named: dict[tuple, VersionedPayload] = {}
+        self.watched = False
+        self._subscribers: list[queue.Queue] = []
+        # Starts at the creation time in ms so versions keep growing across restarts.
+        self.data_version = int(time.time() * 1000)
+        self._change_log: deque[tuple[int, dict[str, set]]] = deque(maxlen=CHANGE_LOG_SIZE)
+        self._week_refs: Counter = Counter()
+        self.write_behind: WriteBehindQueue | None = None
+        if write_behind is not None:
+            self.write_behind = WriteBehindQueue(
+                self.planning_dir,
+                journal_path if journal_path is not None else default_journal_path(self.planning_dir),
+                delay=write_behind,
+                on_change=self._staged_changed,
+            )
+            self.write_behind.replay()
+
+    def refresh(self) -> bool:
+        """Re-parse files that changed on disk; return True if anything changed."""
+        with self.lock:
+            if self.cache_dir is not None and not self._snapshot_restored:
+                restored = restore_snapshot(self.cache_dir, [self.planning_dir, self.identity_dir])
+                self._snapshot_dirty = not restored["complete"]
+                self._snapshot_restored = True
+            work_before = PARSE_CACHE.misses + PARSE_CACHE.computed
+            sources = (self._people, self._roles, self._projects)
+            scans = [source.scan() for source in sources]
+            stale = [path for _current, paths in scans for path in paths]
+            if self.jobs > 1 and stale:
+                prefetch_frontmatter(stale, self.jobs)
+
+            changed = False
+            for source, (current, _paths) in zip(sources, scans):
+                if source.refresh(current):
+                    changed = True
+            if changed:
+                newest_ns = max((sig[0] for current, _paths in scans for sig in current.values()), default=0)
+                self._changed(newest_ns / 1e9)
+            if PARSE_CACHE.misses + PARSE_CACHE.computed != work_before:
+                self._snapshot_dirty = True
+            return changed
+
+    def _changed(self, modified: float | None = None) -> None:
+        """Drop derived state after a source change; bump ``last_modified``.
+
+        Removals and in-place edits do not always raise the newest file
+        mtime, so after the initial load the wall clock is used instead.
+        """
+        initial = self._last_modified == 0.0
+        if self.stale_while_revalidate:
+            self._stale.update(self._payloads)
+        self._payloads.clear()
+        self._named.clear()
+        self._fingerprint = None
+        if initial and modified is not None:
+            self._last_modified = modified
+        else:
+            self._last_modified = max(self._last_modified, time.time())
+
+        changes = [source.take_changes() for source in (self._people, self._roles, self._projects)]
+        tally = _tally_changes(*changes, self._people.records(), self._week_refs)
+        self.data_version += 1
+        if initial:
+            return
+        self._change_log.append((self.data_version, tally))
+        if self._subscribers:
+            self._publish(
+                {
+                    "version": self._current_fingerprint(),
+                    "data_version": self.data_version,
+                    "aliases": sorted(tally["aliases"]),
+                    "weeks": sorted({week for _alias, week in tally["cells"]}),
+                    "projects": sorted(tally["projects"]),
+                }
+            )
+
+    def _current_fingerprint(self) -> str:
+        if self._fingerprint is None:
+            self._fingerprint = _sources_fingerprint([self._people, self._roles, self._projects])
+        return self._fingerprint
+
+    def subscribe(self, events: queue.Queue | None = None) -> queue.Queue:
+        """Return a queue receiving change events; see the class docstring.
+
+        Pass ``events`` to receive into a queue of your own, e.g. one that
+        also wakes an event loop; it should be bounded by ``EVENT_BACKLOG``.
+        """
+        if events is None:
+            events = queue.Queue(maxsize=EVENT_BACKLOG)
+        with self.lock:
+            self._subscribers.append(events)
+        return events
+
+    def unsubscribe(self, events: queue.Queue) -> None:
+        with self.lock:
+            if events in self._subscribers:
+                self._subscribers.remove(events)
+
+    def _publish(self, event: dict[str, Any]) -> None:
+        for events in self._subscribers:
+            try:
+                events.put_nowait(event)
+            except queue.Full:
+                while not events.empty():
+                    events.get_nowait()
+                events.put_nowait({"version": event["version"], "resync": True})
+
+    def version(self, with_identities: bool = False) -> tuple[str, float]:
+        """Return ``(fingerprint, last_modified)`` of the current source files.
+
+        The fingerprint hashes the path and stat signature of every people,
+        role and project file, so it changes whenever any of them does.
+        ``with_identities`` folds in the identity index as well, for
+        payloads that carry real names.
+        """
+        with self.lock:
+            if not self.watched:
+                self.refresh()
+            self._current_fingerprint()
+            if not with_identities:
+                return self._fingerprint, self._last_modified
+            identity_fingerprint, identity_modified, _index = self.identities()
+            return f"{self._fingerprint}+{identity_fingerprint}", max(self._last_modified, identity_modified)
+
+    def identities(self) -> tuple[str, float, dict[str, dict[str, str | None]]]:
+        """Return ``(fingerprint, last_modified, {alias: {"real_name": ...}})``.
+
+        The index is loaded on first use and refreshed from stat
+        signatures like the planning sources.
+        """
+        with self.lock:
+            work_before = PARSE_CACHE.misses + PARSE_CACHE.computed
+            if self._identity_index is None or not self.watched:
+                current, _stale = self._identities.scan()
+                if self._identities.refresh(current) or self._identity_index is None:
+                    self._index_identities(current)
+            if PARSE_CACHE.misses + PARSE_CACHE.computed != work_before:
+                self._snapshot_dirty = True
+            return self._identity_index[0], self._identity_modified, self._identity_index[1]
+
+    def _index_identities(self, current: dict[Path, FileSignature] | None = None) -> None:
+        initial = self._identity_index is None
+        if initial and current is not None:
+            self._identity_modified = max(current.values(), default=(0,))[0] / 1e9
+        else:
+            self._identity_modified = max(self._identity_modified, time.time())
+        self._identity_index = (
+            _sources_fingerprint([self._identities]),
+            dict(self._identities.records()),
+        )
+        self._named.clear()
+
+        changes = self._identities.take_changes()
+        if self._subscribers and not initial:
+            aliases = {record[0] for old, new in changes if old != new for record in (old, new) if record is not None}
+            self._publish(
+                {
+                    "version": self._current_fingerprint(),
+                    "data_version": self.data_version,
+                    "aliases": sorted(aliases),
+                    "weeks": [],
+                    "projects": [],
+                    "names": True,
+                }
+            )
+
+    def apply_changes(self, paths: Iterable[Path] | None) -> bool:
+        """Re-parse only ``paths``, as reported by a watcher; return True if anything changed.
+
+        ``None`` means the watcher lost track (for example an overflowed
+        event queue) and every directory is scanned again. Paths outside
+        the model's directories, or of files it does not load, are ignored.
+        """
+        with self.lock:
+            if paths is None:
+                changed = self.refresh()
+                if self._identity_index is not None and self._identities.refresh():
+                    self._index_identities()
+                    changed = True
+                return changed
+
+            work_before = PARSE_CACHE.misses + PARSE_CACHE.computed
+            sources = {source.directory: source for source in (self._people, self._roles, self._projects)}
+            planning_changed = False
+            identities_changed = False
+            for path in map(Path, paths):
+                if path.suffix != ".md":
+                    continue
+                if path.parent == self.identity_dir:
+                    # Not loaded yet: ``identities()`` will scan on first use.
+                    if self._identity_index is not None and self._identities.update(path):
+                        identities_changed = True
+                    continue
+                source = sources.get(path.parent)
+                if source is not None and source.update(path):
+                    planning_changed = True
+            if planning_changed:
+                self._changed()
+            if identities_changed:
+                self._index_identities()
+            if PARSE_CACHE.misses + PARSE_CACHE.computed != work_before:
+                self._snapshot_dirty = True
+            return planning_changed or identities_changed
+
+    def save_snapshot(self) -> Path | None:
+        """Persist parsed frontmatter to ``cache_dir`` if it changed since the last save."""
+        if self.cache_dir is None:
+            return None
+        with self.lock:
+            if not self._snapshot_dirty:
+                return None
+            self._snapshot_dirty = False
+            return save_snapshot(self.cache_dir, [self.planning_dir, self.identity_dir])
+
+    def dashboard_data(
+        self,
+        include_pii: bool = True,
+        payload_version: int = 1,
+        **filters: Any,
+    ) -> dict[str, Any]:
+        """Return the dashboard payload; see ``assemble_dashboard_data`` for ``filters``."""
+        return self.dashboard_payload(include_pii, payload_version, **filters)[2]
+
+    def dashboard_payload(
+        self,
+        include_pii: bool = True,
+        payload_version: int = 1,
+        **filters: Any,
+    ) -> VersionedPayload:
+        """Return ``(fingerprint, last_modified, payload)`` for the requested view.
+
+        The fingerprint is that of the source files the payload was built
+        from (``version(with_identities=True)`` for v1 with PII), which is
+        older than the current one when a stale payload is served.
+        Unfiltered payloads are cached until a source file changes;
+        filtered ones are only shared between concurrent requests.
+        """
+        filters = {name: value for name, value in filters.items() if value is not None}
+        key = _payload_key(payload_version, filters)
+        base = self._alias_payload(key, payload_version, filters)
+        if not (include_pii and payload_version == 1):
+            return base
+
+        # Legacy v1 payloads with PII: overlay real names on the shared build.
+        identity_fingerprint, identity_modified, identities = self.identities()
+        fingerprint = f"{base[0]}+{identity_fingerprint}"
+        with self.lock:
+            named = self._named.get(key)
+            if named is not None and named[0] == fingerprint:
+                return named
+        named = (fingerprint, max(base[1], identity_modified), apply_identities(base[2], identities))
+        if not filters:
+            with self.lock:
+                self._named[key] = named
+        return named
+
+    def dashboard_delta(self, since: int) -> VersionedPayload:
+        """Return ``(fingerprint, last_modified, delta)``: the v2 payload changes after ``since``.
+
+        The delta holds the current ``weeks``, ``metrics`` and
+        ``data_version``, the rows of ``users`` that changed (with only
+        the ``weekly_stats`` of changed weeks, unless the whole row
+        changed), the ``projects`` entries that changed, and the
+        ``removed_aliases`` and ``removed_projects``. Clients merge user
+        stats by week and then keep only the weeks in ``weeks``. When
+        ``since`` is unknown or older than the change log, the delta is
+        ``{"full_reload": True}`` instead.
+        """
+        fingerprint, last_modified, payload = self._alias_payload(_payload_key(2, {}), 2, {})
+        current = payload["data_version"]
+        with self.lock:
+            entries = [tally for version, tally in self._change_log if since < version <= current]
+            first = next((version for version, _tally in self._change_log if version > since), None)
+        header = {"payload_version": 2, "data_version": current, "since": since}
+        if since > current or (since < current and first != since + 1):
+            return fingerprint, last_modified, {**header, "full_reload": True}
+
+        rows: set[str] = set()
+        touched: set[str] = set()
+        project_names: set[str] = set()
+        weeks_added: set[str] = set()
+        cell_weeks: dict[str, set[str]] = {}
+        for tally in entries:
+            rows |= tally["rows"]
+            touched |= tally["aliases"]
+            project_names |= tally["projects"]
+            weeks_added |= tally["weeks_added"]
+            for alias, week in tally["cells"]:
+                cell_weeks.setdefault(alias, set()).add(week)
+
+        users = []
+        for user in payload["users"]:
+            alias = user["alias"]
+            if alias in rows:
+                users.append(user)
+                continue
+            weeks = weeks_added | cell_weeks.get(alias, set())
+            if weeks or alias in touched:
+                users.append({**user, "weekly_stats": [stats for stats in user["weekly_stats"] if stats["week"] in weeks]})
+        present = {user["alias"] for user in payload["users"]}
+        project_entries = [project for project in payload["projects"] if project["name"] in project_names]
+        delta = {
+            **header,
+            "weeks": payload["weeks"],
+            "users": users,
+            "removed_aliases": sorted((rows | touched) - present),
+            "projects": project_entries,
+            "removed_projects": sorted(project_names - {project["name"] for project in payload["projects"]}),
+            "metrics": payload["metrics"],
+        }
+        return fingerprint, last_modified, delta
+
+    def _alias_payload(self, key: tuple, payload_version: int, filters: dict[str, Any]) -> VersionedPayload:
+        with self.lock:
+            fingerprint, last_modified = self.version()
+            cached = self._payloads.get(key)
+            if cached is not None:
+                return cached
+            stale = self._stale.get(key) if self.stale_while_revalidate else None
+            flight = self._inflight.get((fingerprint, key))
+            if flight is None:
+                flight = self._inflight[(fingerprint, key)] = Future()
+                inputs = {
+                    "people": self._people.records(),
+                    "roles": {role["role_id"]: role for role in self._roles.records()},
+                    "project_context": dict(self._projects.records()),
+                    "identities": {},
+                    "include_pii": False,
+                    "payload_version": payload_version,
+                    **filters,
+                }
+                build = (fingerprint, last_modified, key, inputs, flight, self.data_version)
+            else:
+                build = None
+
+        if build is None:
+            return stale if stale is not None else flight.result()
+        if stale is not None:
+            threading.Thread(target=self._build_in_background, args=build, daemon=True).start()
+            return stale
+        return self._build(*build)
+
+    def _build(
+        self,
+        fingerprint: str,
+        last_modified: float,
+        key: tuple,
+        inputs: dict[str, Any],
+        flight: Future,
+        data_version: int,
+    ) -> VersionedPayload:
+        try:
+            payload = assemble_dashboard_data(**inputs)
+            if inputs["payload_version"] == 2:
+                payload["data_version"] = data_version
+            result = (fingerprint, last_modified, payload)
+        except BaseException as exc:
+            with self.lock:
+                self._inflight.pop((fingerprint, key), None)
+            flight.set_exception(exc)
+            raise
+        with self.lock:
+            self._inflight.pop((fingerprint, key), None)
+            if not key[1]:
+                if fingerprint == self._fingerprint:
+                    self._payloads[key] = result
+                    self._stale.pop(key, None)
+                elif self.stale_while_revalidate:
+                    self._stale[key] = result
+        flight.set_result(result)
+        return result
+
+    def _build_in_background(self, *build: Any) -> None:
+        try:
+            self._build(*build)
+        except Exception as exc:  # surfaced to waiters through the future
+            print(f"Background dashboard rebuild failed: {exc}", file=sys.stderr)
+
+    def close(self) -> None:
+        """Write pending write-behind edits; the model stays usable for reads."""
+        if self.write_behind is not None:
+            self.write_behind.close()
+
+    def _staged_changed(self, changes: StagedChanges) -> None:
+        with self.lock:
+            for path, staged in changes.items():
+                if staged is None:
+                    self._people.unpin(path)
+                else:
+                    self._people.pin(path, *staged)
+            self._changed()
+
+    # Writes run under the engine's per-file locks, outside ``self.lock``,
+    # so edits to different files proceed in parallel.
+
+    def update_week_allocations(
+        self,
+        alias: str,
+        week: str,
+        allocations: list[dict[str, Any]],
+        expected_version: str | None = None,
+    ) -> dict[str, Any]:
+        if self.write_behind is not None:
+            return self.write_behind.stage(alias, week, allocations, expected_version)
+        result = update_week_allocations(
+            planning_dir=self.planning_dir,
+            alias=alias,
+            week=week,
+            allocations=allocations,
+            expected_version=expected_version,
+        )
+        with self.lock:
+            self._people.reload(self.planning_dir / "people" / f"{alias}.md")
+            self._changed()
+        return result
+
+    def bulk_update_week_allocations(self, edits: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        if self.write_behind is not None:
+            return self.write_behind.stage_bulk(edits)
+        results = bulk_update_week_allocations(planning_dir=self.planning_dir, edits=edits)
+        with self.lock:
+            for alias in dict.fromkeys(result["alias"] for result in results):
+                self._people.reload(self.planning_dir / "people" / f"{alias}.md")
+            self._changed()
+        return results
+
+    def update_project_metadata(
+        self,
+        project: str,
+        updates: dict[str, Any],
+        expected_version: str | None = None,
+    ) -> dict[str, Any]:
+        result = update_project_metadata(
+            planning_dir=self.planning_dir,
+            project=project,
+            updates=updates,
+            expected_version=expected_version,
+        )
+        with self.lock:
+            self._projects.reload(self.planning_dir / "projects" / result["file"])
+            self._changed()
+        return result
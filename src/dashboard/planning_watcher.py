@@ -0,0 +1,276 @@
+"""Watch the planning and identity directories and feed changes to the model.
+
+Without a watcher every dashboard request stat-scans all planning files to
+notice edits made outside the API (a ``git pull``, an editor). A
+``PlanningWatcher`` instead waits for changes in ``people/``, ``projects/``,
+``roles/`` and the identity directory, collects them until the burst is
+over (a checkout touching hundreds of files arrives as one batch), and
+hands only the changed paths to ``PlanningModel.apply_changes``. Changes
+that keep arriving are still delivered every ``max_latency`` seconds.
+
+On Linux the watcher uses inotify through ``ctypes``; elsewhere, or when
+inotify cannot be set up, it polls file stat signatures with ``os.scandir``.
+A directory that does not exist yet is waited for through a watch on its
+closest existing parent. When a watch is lost (the directory was removed
+or moved) or the kernel dropped events, the watches are set up again and
+the model is refreshed in full.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+# inotify(7) event bits.
+_IN_MODIFY = 0x00000002
+_IN_ATTRIB = 0x00000004
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_MOVE_SELF = 0x00000800
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_WATCH_MASK = (
+    _IN_MODIFY | _IN_ATTRIB | _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO
+    | _IN_CREATE | _IN_DELETE | _IN_DELETE_SELF | _IN_MOVE_SELF
+)
+_EVENT_HEADER = struct.Struct("iIII")
+# Longest time a backend blocks, so ``stop()`` is noticed promptly.
+_MAX_WAIT = 0.5
+
+
+def _watched_dirs(planning_dir: Path, identity_dir: Path) -> list[Path]:
+    # Only the directories the model loads; skills.md is not part of the dashboard.
+    return [
+        planning_dir / "people",
+        planning_dir / "projects",
+        planning_dir / "roles",
+        identity_dir,
+    ]
+
+
+def _relevant(path: Path) -> bool:
+    return path.suffix == ".md"
+
+
+class _InotifyBackend:
+    """Directory watches on one inotify descriptor."""
+
+    name = "inotify"
+
+    def __init__(self, directories: list[Path]):
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify is only available on Linux")
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._directories = directories
+        self._open()
+
+    def _open(self) -> None:
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._dirs: dict[int, Path] = {}
+        # Missing directories (or their missing ancestors) whose creation is awaited.
+        self._awaited: set[Path] = set()
+        try:
+            for directory in self._directories:
+                target = directory
+                while not target.is_dir() and target.parent != target:
+                    self._awaited.add(target)
+                    target = target.parent
+                wd = self._libc.inotify_add_watch(self._fd, os.fsencode(target), _WATCH_MASK)
+                if wd < 0:
+                    raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {target}")
+                self._dirs[wd] = target
+        except BaseException:
+            os.close(self._fd)
+            raise
+
+    def reset(self) -> None:
+        """Set all watches up again, e.g. after a watched directory was replaced."""
+        os.close(self._fd)
+        self._open()
+
+    def wait(self, timeout: float) -> set[Path] | None:
+        """Return paths changed within ``timeout`` seconds, or None if events were lost."""
+        readable, _w, _x = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return set()
+        try:
+            buffer = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+
+        changed: set[Path] = set()
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(buffer):
+            wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(buffer, offset)
+            offset += _EVENT_HEADER.size
+            name = buffer[offset:offset + length].rstrip(b"\0")
+            offset += length
+            if mask & (_IN_Q_OVERFLOW | _IN_IGNORED | _IN_DELETE_SELF | _IN_MOVE_SELF):
+                return None
+            directory = self._dirs.get(wd)
+            if directory is not None and name:
+                path = directory / os.fsdecode(name)
+                if path in self._awaited:
+                    return None
+                changed.add(path)
+        return changed
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+class _PollingBackend:
+    """Stat polling of the watched directories every ``interval`` seconds."""
+
+    name = "poll"
+
+    def __init__(self, directories: list[Path], interval: float, stop: threading.Event):
+        self._directories = directories
+        self._interval = interval
+        self._stop = stop
+        self._signatures = self._scan()
+
+    def _scan(self) -> dict[Path, tuple[int, int, int]]:
+        signatures = {}
+        for directory in self._directories:
+            try:
+                entries = list(os.scandir(directory))
+            except OSError:
+                continue
+            for entry in entries:
+                if not entry.name.endswith(".md"):
+                    continue
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue
+                signatures[directory / entry.name] = (st.st_mtime_ns, st.st_size, st.st_ino)
+        return signatures
+
+    def wait(self, timeout: float) -> set[Path] | None:
+        # A poll that finds nothing new ends a burst, so ``timeout`` is not needed.
+        if self._stop.wait(self._interval):
+            return set()
+        current = self._scan()
+        previous, self._signatures = self._signatures, current
+        return {path for path in previous.keys() | current.keys() if previous.get(path) != current.get(path)}
+
+    def close(self) -> None:
+        pass
+
+
+class PlanningWatcher:
+    """Background thread feeding planning file changes into a ``PlanningModel``.
+
+    ``backend`` is ``"auto"`` (inotify, else polling), ``"inotify"`` or
+    ``"poll"``. Changes are delivered ``debounce`` seconds after the last
+    event of a burst; the polling backend delivers after the first poll
+    that finds nothing new. A burst that does not end is delivered
+    ``max_latency`` seconds after its first event, and collecting starts
+    over.
+    """
+
+    def __init__(
+        self,
+        model: Any,
+        backend: str = "auto",
+        debounce: float = 0.2,
+        poll_interval: float = 1.0,
+        max_latency: float = 2.0,
+    ):
+        if backend not in {"auto", "inotify", "poll"}:
+            raise ValueError("backend must be 'auto', 'inotify' or 'poll'")
+        self.model = model
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.max_latency = max_latency
+        self.requested_backend = backend
+        self.backend: str | None = None
+        self.batches = 0
+        self._backend: _InotifyBackend | _PollingBackend | None = None
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        """Set up the watches, catch up on changes made before them, and start watching."""
+        directories = _watched_dirs(self.model.planning_dir, self.model.identity_dir)
+        if self.requested_backend in {"auto", "inotify"}:
+            try:
+                self._backend = _InotifyBackend(directories)
+            except (OSError, AttributeError) as exc:
+                if self.requested_backend == "inotify":
+                    raise
+                print(f"inotify unavailable ({exc}); polling planning files instead", file=sys.stderr)
+        if self._backend is None:
+            self._backend = _PollingBackend(directories, self.poll_interval, self._stop)
+        self.backend = self._backend.name
+
+        self.model.refresh()
+        self.model.watched = True
+        self._thread = threading.Thread(target=self._run, name="planning-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        if self._backend is not None:
+            self._backend.close()
+        self.model.watched = False
+
+    def _run(self) -> None:
+        pending: set[Path] = set()
+        rescan = False
+        deadline = 0.0
+        while not self._stop.is_set():
+            if pending or rescan:
+                timeout = max(0.0, min(self.debounce, deadline - time.monotonic()))
+            else:
+                timeout = _MAX_WAIT
+            changes = self._backend.wait(timeout)
+            collecting = pending or rescan
+            if changes is None:
+                # Watches were lost or events dropped: watch again, then refresh everything.
+                self._reset_backend()
+                rescan = True
+            elif changes:
+                pending.update(path for path in changes if _relevant(path))
+            if not (pending or rescan):
+                continue
+            if not collecting:
+                deadline = time.monotonic() + self.max_latency
+            elif changes == set() or time.monotonic() >= deadline:
+                self._deliver(None if rescan else pending)
+                pending, rescan = set(), False
+
+    def _reset_backend(self) -> None:
+        if not isinstance(self._backend, _InotifyBackend):
+            return
+        try:
+            self._backend.reset()
+        except OSError as exc:
+            print(f"Re-adding inotify watches failed ({exc}); polling planning files instead", file=sys.stderr)
+            directories = _watched_dirs(self.model.planning_dir, self.model.identity_dir)
+            self._backend = _PollingBackend(directories, self.poll_interval, self._stop)
+            self.backend = self._backend.name
+
+    def _deliver(self, paths: set[Path] | None) -> None:
+        try:
+            self.model.apply_changes(None if paths is None else sorted(paths))
+        except Exception as exc:
+            print(f"Applying planning file changes failed: {exc}", file=sys.stderr)
+        self.batches += 1
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""Write ``.gz`` (and ``.br`` when brotli is installed) siblings for a built frontend.
+
+``run_dashboard.py`` serves these instead of the original file when the
+browser accepts the encoding, so static assets are compressed once at
+build time rather than per request.
+"""
+from __future__ import annotations
+
+import argparse
+import gzip
+from pathlib import Path
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+COMPRESSIBLE_SUFFIXES = {".html", ".js", ".mjs", ".css", ".json", ".svg", ".txt", ".map", ".webmanifest"}
+MIN_BYTES = 1024
+
+
+def precompress(static_dir: str | Path) -> list[Path]:
+    """Compress every text asset under ``static_dir``; return the files written."""
+    written: list[Path] = []
+    for path in sorted(Path(static_dir).rglob("*")):
+        if not path.is_file() or path.suffix not in COMPRESSIBLE_SUFFIXES:
+            continue
+        raw = path.read_bytes()
+        if len(raw) < MIN_BYTES:
+            continue
+        variants = [(".gz", gzip.compress(raw, compresslevel=9, mtime=0))]
+        if brotli is not None:
+            variants.append((".br", brotli.compress(raw, quality=11)))
+        for suffix, data in variants:
+            if len(data) >= len(raw):
+                continue
+            target = path.with_name(path.name + suffix)
+            target.write_bytes(data)
+            written.append(target)
+    return written
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Precompress a built frontend for run_dashboard.py")
+    parser.add_argument("static_dir", nargs="?", default="src/frontend/dist")
+    args = parser.parse_args()
+    written = precompress(args.static_dir)
+    print(f"Wrote {len(written)} precompressed files in {args.static_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,37 +1,121 @@
 from __future__ import annotations
 
+import copy
+import hashlib
 import json
+import os
 import re
+import sys
+import threading
 import argparse
-from collections import defaultdict
+from contextlib import ExitStack
 from datetime import date, datetime
 from tempfile import NamedTemporaryFile
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable, Iterator
+
+_SRC_DIR = str(Path(__file__).resolve().parent.parent)
+if _SRC_DIR not in sys.path:
+    sys.path.append(_SRC_DIR)
+
+from allocation_matrix import AllocationMatrix  # noqa: E402
+from pussla_frontmatter import (  # noqa: E402
+    PARSE_CACHE,
+    FrontmatterError,
+    load_frontmatter,
+    prefetch_frontmatter,
+    read_body,
+    read_frontmatter,
+    read_summary,
+)
+from pussla_projects import project_index  # noqa: E402
+from pussla_snapshot import restore_snapshot, save_snapshot  # noqa: E402
+from pussla_writer import dump_frontmatter, patch_frontmatter  # noqa: E402
+from pussla_weeks import (  # noqa: E402,F401
+    ISO_WEEK_RE,
+    IsoWeek,
+    compact_weeks,
+    expand_weeks,
+    week_from_ordinal,
+    week_of,
+)
 
-import yaml
-
-ISO_WEEK_RE = re.compile(r"^(\d{4})-W(0[1-9]|[1-4][0-9]|5[0-3])$")
 DEFAULT_CAPACITY_HOURS = 40.0
+PAYLOAD_VERSIONS = (1, 2)
+# Writers to the same planning file queue on one lock per absolute path.
+_FILE_LOCKS: dict[str, threading.Lock] = {}
+_FILE_LOCKS_GUARD = threading.Lock()
 
 
-def _parse_iso_week(value: str) -> tuple[int, int] | None:
-    m = ISO_WEEK_RE.match(value)
-    if not m:
+class VersionConflictError(Exception):
+    """Raised when a write names a file version that is no longer current.
+
+    ``current_version`` is the version token of the file as it is now, or
+    ``None`` if it is gone.
+    """
+
+    def __init__(self, message: str, current_version: str | None):
+        super().__init__(message)
+        self.current_version = current_version
+
+
+def content_version(content: bytes) -> str:
+    """Version token for file ``content``; see ``file_version``."""
+    return hashlib.sha1(content).hexdigest()[:16]
+
+
+def file_version(path: str | Path) -> str | None:
+    """Version token of a planning file: a hash of its content, or ``None`` if missing."""
+    try:
+        with open(path, "rb") as handle:
+            return content_version(handle.read())
+    except OSError:
         return None
-    return int(m.group(1)), int(m.group(2))
 
 
-def _normalize_week(value: str) -> str | None:
-    parsed = _parse_iso_week(value)
+def _cached_file_version(path: str | Path) -> str | None:
+    """``file_version`` hashed once per stat signature through the parse cache.
+
+    Loads use this; conflict checks under ``file_lock`` hash the file itself.
+    """
+    try:
+        return PARSE_CACHE.derived(path, "version", lambda handle: content_version(handle.read()))
+    except OSError:
+        return None
+
+
+def file_lock(path: str | Path) -> threading.Lock:
+    """The lock that serializes read-modify-write cycles on ``path``."""
+    key = os.path.abspath(path)
+    with _FILE_LOCKS_GUARD:
+        lock = _FILE_LOCKS.get(key)
+        if lock is None:
+            lock = _FILE_LOCKS[key] = threading.Lock()
+        return lock
+
+
+def _check_version(path: Path, expected_version: str | None) -> None:
+    """Raise ``VersionConflictError`` unless ``path`` is still at ``expected_version``."""
+    if expected_version is None:
+        return
+    current = file_version(path)
+    if current != expected_version:
+        raise VersionConflictError(
+            f"{path.name} was changed by someone else (version {current}, expected {expected_version})",
+            current,
+        )
+
+
+def _parse_iso_week(value: str) -> tuple[int, int] | None:
+    parsed = week_of(value)
     if parsed is None:
         return None
-    return f"{parsed[0]:04d}-W{parsed[1]:02d}"
+    return parsed.year, parsed.week
 
 
-def _week_sort_key(value: str) -> tuple[int, int]:
-    parsed = _parse_iso_week(value)
-    return parsed if parsed is not None else (9999, 53)
+def _normalize_week(value: str) -> str | None:
+    parsed = week_of(value)
+    return parsed.label if parsed is not None else None
 
 
 def _to_hours_from_load(load: int, capacity_hours: float) -> float:
@@ -56,19 +140,19 @@ def _resolve_planning_dir(data_dir: Path, planning_override: str | None) -> Path
 
 
 def _parse_frontmatter(path: Path) -> tuple[dict[str, Any], str]:
-    text = path.read_text(encoding="utf-8")
-    if not text.startswith("---\n"):
-        return {}, text
-
-    parts = text.split("\n---\n", 1)
-    if len(parts) != 2:
-        return {}, text
+    """Cached frontmatter read; the returned dict is shared, copy before mutating."""
+    try:
+        return read_frontmatter(path)
+    except FrontmatterError as exc:
+        return {}, read_body(path, exc.body_offset)
 
-    frontmatter = yaml.safe_load(parts[0][4:]) or {}
-    if not isinstance(frontmatter, dict):
-        frontmatter = {}
 
-    return frontmatter, parts[1]
+def _load_frontmatter(path: Path) -> dict[str, Any]:
+    """Like ``_parse_frontmatter`` but never reads the markdown body."""
+    try:
+        return load_frontmatter(path)
+    except FrontmatterError:
+        return {}
 
 
 def _normalize_iso_date(value: Any) -> str | None:
@@ -83,143 +167,157 @@ def _normalize_iso_date(value: Any) -> str | None:
     return date_value
 
 
+def _load_identity_file(path: Path) -> tuple[str, dict[str, str | None]] | None:
+    frontmatter = _load_frontmatter(path)
+    alias = frontmatter.get("alias")
+    if not isinstance(alias, str) or not alias.strip():
+        return None
+
+    real_name = frontmatter.get("real_name")
+    return alias, {
+        "real_name": real_name if isinstance(real_name, str) else None,
+    }
+
+
 def _collect_identities(identity_dir: Path) -> dict[str, dict[str, str | None]]:
     identities: dict[str, dict[str, str | None]] = {}
     if not identity_dir.exists():
         return identities
 
     for path in sorted(identity_dir.glob("*.md")):
-        frontmatter, _ = _parse_frontmatter(path)
-        alias = frontmatter.get("alias")
-        if not isinstance(alias, str) or not alias.strip():
-            continue
-
-        real_name = frontmatter.get("real_name")
-        identities[alias] = {
-            "real_name": real_name if isinstance(real_name, str) else None,
-        }
+        loaded = _load_identity_file(path)
+        if loaded is not None:
+            identities[loaded[0]] = loaded[1]
 
     return identities
 
 
+def _load_role_file(path: Path) -> dict[str, str] | None:
+    frontmatter = _load_frontmatter(path)
+    role_id = frontmatter.get("role_id")
+    name = frontmatter.get("name")
+    if not isinstance(role_id, str) or not role_id.strip():
+        return None
+    role_id = role_id.strip()
+    if not isinstance(name, str) or not name.strip():
+        name = role_id
+    return {
+        "role_id": role_id,
+        "name": name.strip(),
+    }
+
+
 def _collect_roles(roles_dir: Path) -> dict[str, dict[str, str]]:
     roles: dict[str, dict[str, str]] = {}
     if not roles_dir.exists():
         return roles
 
     for path in sorted(roles_dir.glob("*.md")):
-        frontmatter, _ = _parse_frontmatter(path)
-        role_id = frontmatter.get("role_id")
-        name = frontmatter.get("name")
-        if not isinstance(role_id, str) or not role_id.strip():
-            continue
-        role_id = role_id.strip()
-        if not isinstance(name, str) or not name.strip():
-            name = role_id
-        roles[role_id] = {
-            "role_id": role_id,
-            "name": name.strip(),
-        }
+        role = _load_role_file(path)
+        if role is not None:
+            roles[role["role_id"]] = role
 
     return roles
 
 
+def _load_project_file(path: Path) -> tuple[str, dict[str, Any]]:
+    frontmatter = _load_frontmatter(path)
+    name = frontmatter.get("name")
+    if not isinstance(name, str) or not name.strip():
+        name = path.stem
+
+    summary = read_summary(path)
+
+    status = frontmatter.get("status")
+    owner_alias = frontmatter.get("owner_alias")
+    start_week = frontmatter.get("start_week")
+    end_week = frontmatter.get("end_week")
+    start_week_override = frontmatter.get("start_week_override")
+    end_week_override = frontmatter.get("end_week_override")
+    hourly_rate = frontmatter.get("hourly_rate")
+    milestones = frontmatter.get("milestones")
+    if not isinstance(milestones, list):
+        milestones = []
+    activities = frontmatter.get("activities")
+    if not isinstance(activities, list):
+        activities = []
+    normalized_milestones: list[dict[str, Any]] = []
+    for idx, ms in enumerate(milestones):
+        if not isinstance(ms, dict):
+            continue
+        title = ms.get("title")
+        milestone_date = _normalize_iso_date(ms.get("date"))
+        if not isinstance(title, str) or not title.strip():
+            continue
+        if milestone_date is None:
+            continue
+        normalized_milestones.append(
+            {
+                "id": ms.get("id") if isinstance(ms.get("id"), str) else f"ms-{idx+1}",
+                "title": title.strip(),
+                "date": milestone_date,
+            }
+        )
+    normalized_milestones.sort(key=lambda m: m["date"])
+    normalized_activities: list[dict[str, Any]] = []
+    for idx, activity in enumerate(activities):
+        if not isinstance(activity, dict):
+            continue
+        label = activity.get("label")
+        start_date = _normalize_iso_date(activity.get("start_date"))
+        end_date = _normalize_iso_date(activity.get("end_date"))
+        if not isinstance(label, str) or not label.strip():
+            continue
+        if start_date is None or end_date is None:
+            continue
+        if start_date > end_date:
+            continue
+        normalized_activities.append(
+            {
+                "id": activity.get("id") if isinstance(activity.get("id"), str) else f"act-{idx+1}",
+                "label": label.strip(),
+                "start_date": start_date,
+                "end_date": end_date,
+            }
+        )
+    normalized_activities.sort(
+        key=lambda a: (a["start_date"], a["end_date"], a["label"])
+    )
+    return name, {
+        "project_id": frontmatter.get("project_id") if isinstance(frontmatter.get("project_id"), str) else path.stem,
+        "status": status if isinstance(status, str) else None,
+        "owner_alias": owner_alias if isinstance(owner_alias, str) else None,
+        "start_week": start_week if isinstance(start_week, str) else None,
+        "end_week": end_week if isinstance(end_week, str) else None,
+        "start_week_override": start_week_override if isinstance(start_week_override, str) else None,
+        "end_week_override": end_week_override if isinstance(end_week_override, str) else None,
+        "hourly_rate": float(hourly_rate) if isinstance(hourly_rate, (int, float)) else None,
+        "milestones": normalized_milestones,
+        "activities": normalized_activities,
+        "summary": summary,
+        "source_file": path.name,
+        "version": _cached_file_version(path),
+    }
+
+
 def _collect_project_context(projects_dir: Path) -> dict[str, dict[str, Any]]:
     contexts: dict[str, dict[str, Any]] = {}
     if not projects_dir.exists():
         return contexts
 
-    for path in sorted(projects_dir.glob("*.md")):
-        frontmatter, body = _parse_frontmatter(path)
-        name = frontmatter.get("name")
-        if not isinstance(name, str) or not name.strip():
-            name = path.stem
-
-        summary = ""
-        for line in body.splitlines():
-            if line.strip():
-                summary = line.strip()
-                break
-
-        status = frontmatter.get("status")
-        owner_alias = frontmatter.get("owner_alias")
-        start_week = frontmatter.get("start_week")
-        end_week = frontmatter.get("end_week")
-        start_week_override = frontmatter.get("start_week_override")
-        end_week_override = frontmatter.get("end_week_override")
-        hourly_rate = frontmatter.get("hourly_rate")
-        milestones = frontmatter.get("milestones")
-        if not isinstance(milestones, list):
-            milestones = []
-        activities = frontmatter.get("activities")
-        if not isinstance(activities, list):
-            activities = []
-        normalized_milestones: list[dict[str, Any]] = []
-        for idx, ms in enumerate(milestones):
-            if not isinstance(ms, dict):
-                continue
-            title = ms.get("title")
-            milestone_date = _normalize_iso_date(ms.get("date"))
-            if not isinstance(title, str) or not title.strip():
-                continue
-            if milestone_date is None:
-                continue
-            normalized_milestones.append(
-                {
-                    "id": ms.get("id") if isinstance(ms.get("id"), str) else f"ms-{idx+1}",
-                    "title": title.strip(),
-                    "date": milestone_date,
-                }
-            )
-        normalized_milestones.sort(key=lambda m: m["date"])
-        normalized_activities: list[dict[str, Any]] = []
-        for idx, activity in enumerate(activities):
-            if not isinstance(activity, dict):
-                continue
-            label = activity.get("label")
-            start_date = _normalize_iso_date(activity.get("start_date"))
-            end_date = _normalize_iso_date(activity.get("end_date"))
-            if not isinstance(label, str) or not label.strip():
-                continue
-            if start_date is None or end_date is None:
-                continue
-            if start_date > end_date:
-                continue
-            normalized_activities.append(
-                {
-                    "id": activity.get("id") if isinstance(activity.get("id"), str) else f"act-{idx+1}",
-                    "label": label.strip(),
-                    "start_date": start_date,
-                    "end_date": end_date,
-                }
-            )
-        normalized_activities.sort(
-            key=lambda a: (a["start_date"], a["end_date"], a["label"])
-        )
-        contexts[name] = {
-            "project_id": frontmatter.get("project_id") if isinstance(frontmatter.get("project_id"), str) else path.stem,
-            "status": status if isinstance(status, str) else None,
-            "owner_alias": owner_alias if isinstance(owner_alias, str) else None,
-            "start_week": start_week if isinstance(start_week, str) else None,
-            "end_week": end_week if isinstance(end_week, str) else None,
-            "start_week_override": start_week_override if isinstance(start_week_override, str) else None,
-            "end_week_override": end_week_override if isinstance(end_week_override, str) else None,
-            "hourly_rate": float(hourly_rate) if isinstance(hourly_rate, (int, float)) else None,
-            "milestones": normalized_milestones,
-            "activities": normalized_activities,
-            "summary": summary,
-            "source_file": path.name,
-        }
+    for path in project_index(projects_dir).paths():
+        name, context = _load_project_file(path)
+        contexts[name] = context
 
     return contexts
 
 
-def update_week_allocations(
-    planning_dir: str | Path,
+def _normalize_week_edit(
     alias: str,
     week: str,
     allocations: list[dict[str, Any]],
-) -> dict[str, Any]:
+) -> tuple[str, list[dict[str, Any]]]:
+    """Validate one week edit; return the week label and the merged entries to write."""
     if not isinstance(alias, str) or not alias.strip():
         raise ValueError("alias must be a non-empty string")
 
@@ -311,15 +409,16 @@ def update_week_allocations(
             }
         )
 
-    planning_path = Path(planning_dir)
-    people_file = planning_path / "people" / f"{alias}.md"
-    if not people_file.exists():
-        raise FileNotFoundError(f"people file not found for alias '{alias}'")
+    return normalized_week, normalized_entries
+
 
+def _read_people_frontmatter(people_file: Path, alias: str) -> tuple[dict[str, Any], str]:
+    """Return a private copy of a people file's frontmatter and its body."""
     try:
         data, body = _parse_frontmatter(people_file)
     except Exception as exc:
         raise ValueError(f"failed to parse people file for '{alias}'") from exc
+    data = copy.deepcopy(data)
 
     if not isinstance(data, dict):
         raise ValueError(f"people file for '{alias}' must contain YAML frontmatter object")
@@ -329,7 +428,19 @@ def update_week_allocations(
         data["alias"] = alias
     elif file_alias != alias:
         raise ValueError(f"people file alias mismatch: expected '{alias}', found '{file_alias}'")
+    return data, body
 
+
+def _replace_week_allocations(
+    data: dict[str, Any],
+    normalized_week: str,
+    normalized_entries: list[dict[str, Any]],
+) -> None:
+    """Replace the allocations of ``normalized_week`` in ``data`` with ``normalized_entries``.
+
+    Entries that neither cover the week nor receive it are kept as the
+    same objects, so ``patch_frontmatter`` can leave their lines alone.
+    """
     raw_allocations = data.get("allocations")
     if raw_allocations is None:
         raw_allocations = []
@@ -337,6 +448,8 @@ def update_week_allocations(
         raise ValueError("people file field 'allocations' must be a list")
 
     rebuilt: list[dict[str, Any]] = []
+    # Normalized form of each ``rebuilt`` entry, used to find merge targets.
+    normalized: list[dict[str, Any]] = []
     for entry in raw_allocations:
         if not isinstance(entry, dict):
             continue
@@ -371,29 +484,22 @@ def update_week_allocations(
         else:
             continue
 
-        kept_weeks: list[str] = []
-        for raw_week in weeks:
-            if not isinstance(raw_week, str):
-                continue
-            normalized = _normalize_week(raw_week)
-            if normalized is None or normalized == normalized_week:
-                continue
-            kept_weeks.append(normalized)
+        all_weeks = expand_weeks(weeks)
+        kept_weeks = [parsed for parsed in all_weeks if parsed.label != normalized_week]
 
         if not kept_weeks:
             continue
 
-        unique_sorted_weeks = sorted(set(kept_weeks), key=_week_sort_key)
-        rebuilt.append(
-            {
-                "project": project,
-                "weeks": unique_sorted_weeks,
-                "planned_hours": round(hours, 1),
-                "capacity_hours": capacity,
-                "load": load_value,
-                "state": state_value,
-            }
-        )
+        view = {
+            "project": project,
+            "weeks": compact_weeks(kept_weeks),
+            "planned_hours": round(hours, 1),
+            "capacity_hours": capacity,
+            "load": load_value,
+            "state": state_value,
+        }
+        rebuilt.append(entry if len(kept_weeks) == len(all_weeks) else view)
+        normalized.append(view)
 
     for entry in normalized_entries:
         project = entry["project"]
@@ -402,7 +508,7 @@ def update_week_allocations(
         capacity_hours = entry["capacity_hours"]
         state = entry["state"]
         existing = None
-        for candidate in rebuilt:
+        for index, candidate in enumerate(normalized):
             if (
                 candidate.get("project") == project
                 and candidate.get("load") == load
@@ -410,36 +516,70 @@ def update_week_allocations(
                 and candidate.get("capacity_hours") == capacity_hours
                 and candidate.get("state") == state
             ):
-                existing = candidate
+                existing = index
                 break
 
         if existing is None:
-            rebuilt.append(
-                {
-                    "project": project,
-                    "weeks": [normalized_week],
-                    "planned_hours": planned_hours,
-                    "capacity_hours": capacity_hours,
-                    "load": load,
-                    "state": state,
-                }
-            )
+            added = {
+                "project": project,
+                "weeks": [normalized_week],
+                "planned_hours": planned_hours,
+                "capacity_hours": capacity_hours,
+                "load": load,
+                "state": state,
+            }
+            rebuilt.append(added)
+            normalized.append(added)
         else:
-            weeks = [w for w in existing.get("weeks", []) if isinstance(w, str)]
-            if normalized_week not in weeks:
-                weeks.append(normalized_week)
-            existing["weeks"] = sorted(set(weeks), key=_week_sort_key)
+            view = normalized[existing]
+            view["weeks"] = compact_weeks([*expand_weeks(view["weeks"]), week_of(normalized_week)])
+            rebuilt[existing] = view
 
     data["allocations"] = rebuilt
 
-    people_file.parent.mkdir(parents=True, exist_ok=True)
-    rendered = f"---\n{yaml.safe_dump(data, sort_keys=False, allow_unicode=True).strip()}\n---\n{body}"
-    with NamedTemporaryFile("w", encoding="utf-8", dir=people_file.parent, delete=False) as tmp:
+
+def _write_frontmatter_file(
+    path: Path,
+    data: dict[str, Any],
+    body: str,
+    original_allocations: Any = None,
+) -> Path:
+    """Render ``data`` and ``body`` to a temporary file next to ``path``; return its path.
+
+    With ``original_allocations`` (the list as read from ``path``) only the
+    allocation entries that changed are re-emitted; see ``patch_frontmatter``.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    text = None
+    if isinstance(original_allocations, list):
+        try:
+            text = path.read_text(encoding="utf-8")
+        except (OSError, UnicodeDecodeError):
+            text = None
+    rendered = _render_frontmatter(text, data, body, original_allocations)
+    with NamedTemporaryFile("w", encoding="utf-8", dir=path.parent, delete=False) as tmp:
         tmp.write(rendered)
-        temp_path = Path(tmp.name)
+        return Path(tmp.name)
+
+
+def _render_frontmatter(
+    text: str | None,
+    data: dict[str, Any],
+    body: str,
+    original_allocations: Any = None,
+) -> str:
+    """Render a file for ``data``, patching ``text`` (the current file) when possible."""
+    if text is not None and isinstance(original_allocations, list):
+        return patch_frontmatter(text, data, original_allocations)
+    return dump_frontmatter(data, body)
 
-    temp_path.replace(people_file)
 
+def _week_edit_result(
+    alias: str,
+    normalized_week: str,
+    normalized_entries: list[dict[str, Any]],
+    version: str | None,
+) -> dict[str, Any]:
     total_load = sum(entry["load"] for entry in normalized_entries)
     total_planned_hours = round(sum(float(entry["planned_hours"]) for entry in normalized_entries), 1)
     return {
@@ -449,14 +589,119 @@ def update_week_allocations(
         "total_load": total_load,
         "total_planned_hours": total_planned_hours,
         "capacity_hours": DEFAULT_CAPACITY_HOURS,
+        "version": version,
     }
 
 
+def _people_file_for(planning_dir: str | Path, alias: str) -> Path:
+    people_file = Path(planning_dir) / "people" / f"{alias}.md"
+    if not people_file.exists():
+        raise FileNotFoundError(f"people file not found for alias '{alias}'")
+    return people_file
+
+
+def update_week_allocations(
+    planning_dir: str | Path,
+    alias: str,
+    week: str,
+    allocations: list[dict[str, Any]],
+    expected_version: str | None = None,
+) -> dict[str, Any]:
+    """Replace one person's allocations for one week.
+
+    With ``expected_version`` (a ``file_version`` token) the write is
+    refused with ``VersionConflictError`` if the file changed since.
+    """
+    normalized_week, normalized_entries = _normalize_week_edit(alias, week, allocations)
+    people_file = _people_file_for(planning_dir, alias)
+    with file_lock(people_file):
+        _check_version(people_file, expected_version)
+        data, body = _read_people_frontmatter(people_file, alias)
+        original_allocations = data.get("allocations")
+        _replace_week_allocations(data, normalized_week, normalized_entries)
+        _write_frontmatter_file(people_file, data, body, original_allocations).replace(people_file)
+        version = file_version(people_file)
+    return _week_edit_result(alias, normalized_week, normalized_entries, version)
+
+
+def bulk_update_week_allocations(
+    planning_dir: str | Path,
+    edits: list[dict[str, Any]],
+) -> list[dict[str, Any]]:
+    """Apply many ``{"alias", "week", "allocations"}`` edits all-or-nothing.
+
+    Every edit is validated and every affected people file is parsed
+    before anything is written; each file is then rendered once with all
+    of its edits applied in order. An edit may carry a ``version`` that
+    its file must still have. Returns one result per edit, in order,
+    shaped like ``update_week_allocations``.
+    """
+    if not isinstance(edits, list) or not edits:
+        raise ValueError("edits must be a non-empty list")
+
+    normalized: list[tuple[str, str, list[dict[str, Any]]]] = []
+    people_files: dict[str, Path] = {}
+    for index, edit in enumerate(edits):
+        if not isinstance(edit, dict):
+            raise ValueError(f"edit {index}: each edit must be an object")
+        alias = edit.get("alias")
+        try:
+            normalized_week, normalized_entries = _normalize_week_edit(
+                alias, edit.get("week"), edit.get("allocations")
+            )
+            if alias not in people_files:
+                people_files[alias] = _people_file_for(planning_dir, alias)
+        except FileNotFoundError as exc:
+            raise FileNotFoundError(f"edit {index}: {exc}") from exc
+        except ValueError as exc:
+            raise ValueError(f"edit {index}: {exc}") from exc
+        normalized.append((alias, normalized_week, normalized_entries))
+
+    # Lock in path order so overlapping batches cannot deadlock.
+    with ExitStack() as stack:
+        for people_file in sorted(set(people_files.values())):
+            stack.enter_context(file_lock(people_file))
+
+        files: dict[str, tuple[dict[str, Any], str, Any]] = {}
+        for index, (edit, (alias, _week, _entries)) in enumerate(zip(edits, normalized)):
+            try:
+                _check_version(people_files[alias], edit.get("version"))
+                if alias not in files:
+                    data, body = _read_people_frontmatter(people_files[alias], alias)
+                    files[alias] = (data, body, data.get("allocations"))
+            except VersionConflictError as exc:
+                raise VersionConflictError(f"edit {index}: {exc}", exc.current_version) from exc
+            except ValueError as exc:
+                raise ValueError(f"edit {index}: {exc}") from exc
+
+        for alias, normalized_week, normalized_entries in normalized:
+            _replace_week_allocations(files[alias][0], normalized_week, normalized_entries)
+
+        # Render every file before replacing any, so a failure leaves them all untouched.
+        rendered: list[tuple[Path, Path]] = []
+        try:
+            for alias, (data, body, original_allocations) in files.items():
+                people_file = people_files[alias]
+                temp_path = _write_frontmatter_file(people_file, data, body, original_allocations)
+                rendered.append((temp_path, people_file))
+        except BaseException:
+            for temp_path, _people_file in rendered:
+                temp_path.unlink(missing_ok=True)
+            raise
+        for temp_path, people_file in rendered:
+            temp_path.replace(people_file)
+        versions = {alias: file_version(people_file) for alias, people_file in people_files.items()}
+
+    return [_week_edit_result(alias, week, entries, versions[alias]) for alias, week, entries in normalized]
+
+
 def update_project_metadata(
     planning_dir: str | Path,
     project: str,
     updates: dict[str, Any],
+    expected_version: str | None = None,
 ) -> dict[str, Any]:
+    """Apply ``updates`` to a project file; see ``update_week_allocations`` for ``expected_version``."""
     if not isinstance(project, str) or not project.strip():
         raise ValueError("project must be a non-empty string")
     if not isinstance(updates, dict):
@@ -466,20 +711,19 @@ def update_project_metadata(
     if not projects_dir.exists():
         raise FileNotFoundError("projects directory not found")
 
-    target_path: Path | None = None
-    frontmatter: dict[str, Any] = {}
-    body = ""
-    for path in sorted(projects_dir.glob("*.md")):
-        fm, md_body = _parse_frontmatter(path)
-        name = fm.get("name")
-        if (isinstance(name, str) and name == project) or path.stem == project:
-            target_path = path
-            frontmatter = fm
-            body = md_body
-            break
+    target_path = project_index(projects_dir).resolve(project)
     if target_path is None:
         raise FileNotFoundError(f"project file not found for '{project}'")
 
+    with file_lock(target_path):
+        _check_version(target_path, expected_version)
+        return _write_project_updates(target_path, project, updates)
+
+
+def _write_project_updates(target_path: Path, project: str, updates: dict[str, Any]) -> dict[str, Any]:
+    frontmatter, body = _parse_frontmatter(target_path)
+    frontmatter = copy.deepcopy(frontmatter)
+
     allowed = {"hourly_rate", "milestones", "activities", "start_week_override", "end_week_override"}
     for key in updates:
         if key not in allowed:
@@ -560,176 +804,293 @@ def update_project_metadata(
         )
         frontmatter["activities"] = normalized_activities
 
-    rendered = f"---\n{yaml.safe_dump(frontmatter, sort_keys=False, allow_unicode=True).strip()}\n---\n{body}"
+    rendered = dump_frontmatter(frontmatter, body)
     with NamedTemporaryFile("w", encoding="utf-8", dir=target_path.parent, delete=False) as tmp:
         tmp.write(rendered)
         temp_path = Path(tmp.name)
     temp_path.replace(target_path)
 
-    return {"project": project, "file": target_path.name}
+    return {"project": project, "file": target_path.name, "version": file_version(target_path)}
 
 
-def build_dashboard_data(
-    planning_dir: str | Path,
-    identity_dir: str | Path,
-    include_pii: bool = True,
-) -> dict[str, Any]:
-    planning_path = Path(planning_dir)
-    identity_path = Path(identity_dir)
-    people_dir = planning_path / "people"
-    roles_dir = planning_path / "roles"
-    projects_dir = planning_path / "projects"
+def _load_people_file(path: Path) -> dict[str, Any] | None:
+    """Parse one people file into the normalized record used for aggregation.
 
-    identities = _collect_identities(identity_path)
-    roles = _collect_roles(roles_dir)
-    project_context = _collect_project_context(projects_dir)
+    Returns ``None`` for files the dashboard skips (unparsable frontmatter,
+    missing alias, or a non-list ``allocations`` field).
+    """
+    try:
+        data = _load_frontmatter(path)
+    except Exception:
+        return None
+    return _people_record(data, _cached_file_version(path))
 
-    users_by_alias: dict[str, dict[str, Any]] = {}
-    seen_weeks: set[str] = set()
-    raw_allocations: list[dict[str, Any]] = []
-    project_week_bounds: dict[str, dict[str, str]] = {}
 
-    for people_file in sorted(people_dir.glob("*.md")):
-        try:
-            data, _ = _parse_frontmatter(people_file)
-        except Exception:
-            continue
+def _people_record(data: Any, version: str | None) -> dict[str, Any] | None:
+    """Normalize parsed people frontmatter; see ``_load_people_file``."""
+    if not isinstance(data, dict):
+        return None
 
-        if not isinstance(data, dict):
-            continue
+    alias = data.get("alias")
+    entries = data.get("allocations")
+    if not isinstance(alias, str) or not isinstance(entries, list):
+        return None
 
-        alias = data.get("alias")
-        entries = data.get("allocations")
-        if not isinstance(alias, str) or not isinstance(entries, list):
+    allocations: list[dict[str, Any]] = []
+    for entry in entries:
+        if not isinstance(entry, dict):
+            continue
+        project = entry.get("project")
+        weeks = entry.get("weeks")
+        load = entry.get("load")
+        planned_hours = entry.get("planned_hours")
+        capacity_hours = entry.get("capacity_hours")
+        state = entry.get("state")
+        if not isinstance(project, str) or not isinstance(weeks, list):
+            continue
+        if state is None:
+            state_value = "committed"
+        elif isinstance(state, str) and state.strip().lower() in {"tentative", "committed"}:
+            state_value = state.strip().lower()
+        else:
+            continue
+        if capacity_hours is None:
+            capacity = DEFAULT_CAPACITY_HOURS
+        elif isinstance(capacity_hours, (int, float)):
+            capacity = float(capacity_hours)
+        else:
+            continue
+        if capacity <= 0:
+            continue
+        if isinstance(planned_hours, (int, float)):
+            hours = float(planned_hours)
+            load_value = _to_load_from_hours(hours, capacity)
+        elif isinstance(load, int):
+            load_value = load
+            hours = _to_hours_from_load(load_value, capacity)
+        else:
             continue
 
-        identity = identities.get(alias, {})
-        role_id = data.get("role_id")
-        role_name = roles.get(role_id, {}).get("name") if isinstance(role_id, str) else None
-        role_value = role_name or (role_id if isinstance(role_id, str) and role_id.strip() else "Consultant")
-        user = users_by_alias.setdefault(
-            alias,
+        normalized_weeks = expand_weeks(weeks)
+
+        allocations.append(
             {
-                "alias": alias,
-                "real_name": identity.get("real_name") if include_pii else None,
-                "role": role_value,
-                "role_id": role_id if isinstance(role_id, str) and role_id.strip() else None,
-                "skills": data.get("skills") if isinstance(data.get("skills"), list) else [],
-                "weekly": defaultdict(
-                    lambda: {
-                        "total_load": 0.0,
-                        "total_planned_hours": 0.0,
-                        "capacity_hours": DEFAULT_CAPACITY_HOURS,
-                        "projects": [],
-                    }
-                ),
-            },
+                "project": project,
+                "weeks": normalized_weeks,
+                "load": load_value,
+                "hours": hours,
+                "capacity_hours": capacity,
+                "state": state_value,
+            }
         )
 
-        for entry in entries:
-            if not isinstance(entry, dict):
-                continue
-            project = entry.get("project")
-            weeks = entry.get("weeks")
-            load = entry.get("load")
-            planned_hours = entry.get("planned_hours")
-            capacity_hours = entry.get("capacity_hours")
-            state = entry.get("state")
-            if not isinstance(project, str) or not isinstance(weeks, list):
-                continue
-            if state is None:
-                state_value = "committed"
-            elif isinstance(state, str) and state.strip().lower() in {"tentative", "committed"}:
-                state_value = state.strip().lower()
-            else:
-                continue
-            if capacity_hours is None:
-                capacity = DEFAULT_CAPACITY_HOURS
-            elif isinstance(capacity_hours, (int, float)):
-                capacity = float(capacity_hours)
-            else:
-                continue
-            if capacity <= 0:
+    role_id = data.get("role_id")
+    return {
+        "alias": alias,
+        "role_id": role_id,
+        "skills": data.get("skills") if isinstance(data.get("skills"), list) else [],
+        "allocations": allocations,
+        "version": version,
+    }
+
+
+def _collect_people(people_dir: Path) -> list[dict[str, Any]]:
+    people: list[dict[str, Any]] = []
+    for people_file in sorted(people_dir.glob("*.md")):
+        person = _load_people_file(people_file)
+        if person is not None:
+            people.append(person)
+    return people
+
+
+def _week_filter_bound(value: str | None, name: str) -> IsoWeek | None:
+    if value is None:
+        return None
+    week = week_of(value)
+    if week is None:
+        raise ValueError(f"{name} must be in YYYY-Www format")
+    return week
+
+
+def _filter_people(
+    people: list[dict[str, Any]],
+    first: int | None,
+    last: int | None,
+    aliases: set[str] | None,
+    projects: set[str] | None,
+) -> list[dict[str, Any]]:
+    """Drop people, allocation entries and weeks outside the requested slice."""
+    filtered: list[dict[str, Any]] = []
+    for person in people:
+        if aliases is not None and person["alias"] not in aliases:
+            continue
+        allocations = []
+        for entry in person["allocations"]:
+            if projects is not None and entry["project"] not in projects:
                 continue
-            if isinstance(planned_hours, (int, float)):
-                hours = float(planned_hours)
-                load_value = _to_load_from_hours(hours, capacity)
-            elif isinstance(load, int):
-                load_value = load
-                hours = _to_hours_from_load(load_value, capacity)
-            else:
+            weeks = [
+                week
+                for week in entry["weeks"]
+                if (first is None or week.ordinal >= first) and (last is None or week.ordinal <= last)
+            ]
+            if len(weeks) == len(entry["weeks"]):
+                allocations.append(entry)
+            elif weeks:
+                allocations.append({**entry, "weeks": weeks})
+        filtered.append({**person, "allocations": allocations})
+    return filtered
+
+
+def _project_week_spans(people: list[dict[str, Any]]) -> dict[str, tuple[int, int]]:
+    """First and last week ordinal each project is allocated in, over all people."""
+    spans: dict[str, tuple[int, int]] = {}
+    for person in people:
+        for entry in person["allocations"]:
+            if not entry["weeks"]:
                 continue
+            ordinals = [week.ordinal for week in entry["weeks"]]
+            low, high = min(ordinals), max(ordinals)
+            known = spans.get(entry["project"])
+            if known is not None:
+                low, high = min(low, known[0]), max(high, known[1])
+            spans[entry["project"]] = (low, high)
+    return spans
+
+
+def assemble_dashboard_data(
+    people: list[dict[str, Any]],
+    roles: dict[str, dict[str, str]],
+    project_context: dict[str, dict[str, Any]],
+    identities: dict[str, dict[str, str | None]],
+    include_pii: bool = True,
+    payload_version: int = 1,
+    from_week: str | None = None,
+    to_week: str | None = None,
+    aliases: Iterable[str] | None = None,
+    projects: Iterable[str] | None = None,
+    include_raw: bool | None = None,
+) -> dict[str, Any]:
+    """Aggregate already-loaded planning records into the dashboard payload.
+
+    ``people`` must be in people-file order (sorted by path); the other
+    arguments are the lookups produced by the ``_collect_*`` helpers.
+
+    ``payload_version`` 2 is the normalized form: weekly slots reference
+    their project by name instead of embedding its ``context`` (clients
+    look it up in the top-level ``projects`` list), and ``raw_allocations``
+    is left out since it repeats the slots with alias and week attached.
+    ``include_raw`` overrides whether ``raw_allocations`` is emitted.
+
+    ``from_week``/``to_week`` (inclusive), ``aliases`` and ``projects``
+    restrict the payload before anything is aggregated, so weeks, users,
+    totals and metrics only cover the selected slice. Derived project
+    start/end weeks are still taken from the full allocation history.
+    """
+    if payload_version not in PAYLOAD_VERSIONS:
+        raise ValueError(f"Unsupported payload version: {payload_version}")
+    denormalized = payload_version == 1
+    if include_raw is None:
+        include_raw = denormalized
+
+    first = _week_filter_bound(from_week, "from_week")
+    last = _week_filter_bound(to_week, "to_week")
+    alias_filter = set(aliases) if aliases is not None else None
+    project_filter = set(projects) if projects is not None else None
+    spans: dict[str, tuple[int, int]] | None = None
+    if first is not None or last is not None or alias_filter is not None or project_filter is not None:
+        spans = _project_week_spans(people)
+        people = _filter_people(
+            people,
+            first.ordinal if first is not None else None,
+            last.ordinal if last is not None else None,
+            alias_filter,
+            project_filter,
+        )
+        if project_filter is not None:
+            project_context = {name: ctx for name, ctx in project_context.items() if name in project_filter}
+    users_by_alias: dict[str, dict[str, Any]] = {}
+    seen_weeks: set[int] = set()
+    for person in people:
+        alias = person["alias"]
+        if alias not in users_by_alias:
+            identity = identities.get(alias, {})
+            role_id = person["role_id"]
+            role_name = roles.get(role_id, {}).get("name") if isinstance(role_id, str) else None
+            role_value = role_name or (role_id if isinstance(role_id, str) and role_id.strip() else "Consultant")
+            users_by_alias[alias] = {
+                "real_name": identity.get("real_name") if include_pii else None,
+                "role": role_value,
+                "role_id": role_id if isinstance(role_id, str) and role_id.strip() else None,
+                "skills": person["skills"],
+                "version": person.get("version"),
+            }
+        for entry in person["allocations"]:
+            seen_weeks.update(week.ordinal for week in entry["weeks"])
 
-            for week in weeks:
-                if not isinstance(week, str):
-                    continue
-                normalized = _normalize_week(week)
-                if normalized is None:
-                    continue
-                seen_weeks.add(normalized)
-                bounds = project_week_bounds.setdefault(
-                    project, {"min_week": normalized, "max_week": normalized}
-                )
-                if normalized < bounds["min_week"]:
-                    bounds["min_week"] = normalized
-                if normalized > bounds["max_week"]:
-                    bounds["max_week"] = normalized
-
-                bucket = user["weekly"][normalized]
-                bucket["total_planned_hours"] += hours
-                if capacity > 0:
-                    bucket["capacity_hours"] = capacity
-                bucket["total_load"] = round(
-                    (bucket["total_planned_hours"] / bucket["capacity_hours"]) * 100, 1
-                )
-                bucket["projects"].append(
-                    {
-                        "project": project,
-                        "load": load_value,
-                        "planned_hours": round(hours, 1),
-                        "capacity_hours": capacity,
-                        "state": state_value,
-                        "context": project_context.get(project, {}),
-                    }
-                )
+    sorted_weeks = [week_from_ordinal(ordinal) for ordinal in sorted(seen_weeks)]
+    week_labels = [week.label for week in sorted_weeks]
+    aliases = sorted(users_by_alias)
+    matrix = AllocationMatrix(aliases, sorted_weeks, DEFAULT_CAPACITY_HOURS)
 
+    raw_allocations: list[dict[str, Any]] = []
+    for person in people:
+        alias = person["alias"]
+        for entry in person["allocations"]:
+            project = entry["project"]
+            planned_hours = round(entry["hours"], 1)
+            slot = {
+                "project": project,
+                "load": entry["load"],
+                "planned_hours": planned_hours,
+                "capacity_hours": entry["capacity_hours"],
+                "state": entry["state"],
+            }
+            if denormalized:
+                slot["context"] = project_context.get(project, {})
+            matrix.add(
+                alias,
+                project,
+                entry["weeks"],
+                entry["hours"],
+                entry["capacity_hours"],
+                entry["state"],
+                slot,
+            )
+            if not include_raw:
+                continue
+            for week in entry["weeks"]:
                 raw_allocations.append(
                     {
                         "alias": alias,
-                        "week": normalized,
+                        "week": week.label,
                         "project": project,
-                        "load": load_value,
-                        "planned_hours": round(hours, 1),
-                        "capacity_hours": capacity,
-                        "state": state_value,
+                        "load": entry["load"],
+                        "planned_hours": planned_hours,
+                        "capacity_hours": entry["capacity_hours"],
+                        "state": entry["state"],
                     }
                 )
 
-    sorted_weeks = sorted(seen_weeks, key=_week_sort_key)
-
+    loads = matrix.load_percentages()
     users: list[dict[str, Any]] = []
-    for alias in sorted(users_by_alias):
+    for alias_idx, alias in enumerate(aliases):
         user = users_by_alias[alias]
-        weekly_stats = []
-        for week in sorted_weeks:
-            bucket = user["weekly"].get(
-                week,
-                {
-                    "total_load": 0.0,
-                    "total_planned_hours": 0.0,
-                    "capacity_hours": DEFAULT_CAPACITY_HOURS,
-                    "projects": [],
-                },
-            )
-            weekly_stats.append(
-                {
-                    "week": week,
-                    "total_load": round(float(bucket["total_load"]), 1),
-                    "total_planned_hours": round(float(bucket["total_planned_hours"]), 1),
-                    "capacity_hours": round(float(bucket["capacity_hours"]), 1),
-                    "projects": bucket["projects"],
-                }
+        weekly_stats = [
+            {
+                "week": week,
+                "total_load": load,
+                "total_planned_hours": round(hours, 1),
+                "capacity_hours": round(capacity, 1),
+                "projects": projects or [],
+            }
+            for week, load, hours, capacity, projects in zip(
+                week_labels,
+                matrix.row(loads, alias_idx),
+                matrix.row(matrix.planned, alias_idx),
+                matrix.row(matrix.capacity, alias_idx),
+                matrix.row(matrix.slot_projects, alias_idx),
             )
+        ]
 
         real_name = user["real_name"]
         users.append(
@@ -740,28 +1101,23 @@ def build_dashboard_data(
                 "role": user["role"],
                 "role_id": user.get("role_id"),
                 "skills": user.get("skills", []),
+                "version": user.get("version"),
                 "weekly_stats": weekly_stats,
             }
         )
 
-    total_slots = 0
-    total_load_points = 0
-    overbooked_slots = 0
-    for user in users:
-        for slot in user["weekly_stats"]:
-            total_slots += 1
-            total_load_points += slot["total_load"]
-            if slot["total_load"] > 100:
-                overbooked_slots += 1
-
-    avg_util = round(total_load_points / total_slots, 1) if total_slots else 0.0
+    avg_util, overbooked_slots = matrix.utilization_metrics(loads)
+    state_totals = matrix.state_totals()
 
     projects: list[dict[str, Any]] = []
     for project_name in sorted(project_context):
         ctx = dict(project_context[project_name])
-        bounds = project_week_bounds.get(project_name, {})
-        derived_start = bounds.get("min_week")
-        derived_end = bounds.get("max_week")
+        if spans is None:
+            bounds = matrix.project_bounds(project_name)
+        else:
+            span = spans.get(project_name)
+            bounds = (week_from_ordinal(span[0]), week_from_ordinal(span[1])) if span is not None else None
+        derived_start, derived_end = (bounds[0].label, bounds[1].label) if bounds is not None else (None, None)
         resolved_start = ctx.get("start_week_override") or derived_start or ctx.get("start_week")
         resolved_end = ctx.get("end_week_override") or derived_end or ctx.get("end_week")
         projects.append(
@@ -775,18 +1131,141 @@ def build_dashboard_data(
             }
         )
 
-    return {
+    data = {
         "generated_at": datetime.now().isoformat(timespec="seconds"),
-        "weeks": sorted_weeks,
+        "weeks": week_labels,
         "users": users,
         "projects": projects,
         "metrics": {
             "users_count": len(users),
             "average_utilization": avg_util,
             "overbooked_slots": overbooked_slots,
+            "committed_hours": round(state_totals["committed"], 1),
+            "tentative_hours": round(state_totals["tentative"], 1),
+            "project_planned_hours": {
+                project: round(hours, 1) for project, hours in sorted(matrix.project_totals().items())
+            },
         },
         "raw_allocations": raw_allocations,
     }
+    if not include_raw:
+        del data["raw_allocations"]
+    if not denormalized:
+        data["payload_version"] = payload_version
+    return data
+
+
+def apply_identities(
+    data: dict[str, Any],
+    identities: dict[str, dict[str, str | None]],
+) -> dict[str, Any]:
+    """Return a copy of an alias-only payload with real names filled in.
+
+    Only the user records are copied; weekly stats and everything else are
+    shared with ``data``.
+    """
+    users = []
+    for user in data["users"]:
+        real_name = identities.get(user["alias"], {}).get("real_name")
+        users.append(
+            {
+                **user,
+                "real_name": real_name,
+                "display_name": real_name if isinstance(real_name, str) and real_name.strip() else user["alias"],
+            }
+        )
+    return {**data, "users": users}
+
+
+def _planning_source_files(planning_path: Path, identity_path: Path) -> list[Path]:
+    files: list[Path] = []
+    for directory in (
+        planning_path / "people",
+        planning_path / "roles",
+        planning_path / "projects",
+        identity_path,
+    ):
+        if directory.exists():
+            files.extend(directory.glob("*.md"))
+    return files
+
+
+def build_dashboard_data(
+    planning_dir: str | Path,
+    identity_dir: str | Path,
+    include_pii: bool = True,
+    jobs: int = 1,
+    cache_dir: str | Path | None = None,
+    payload_version: int = 1,
+    **filters: Any,
+) -> dict[str, Any]:
+    """Build the dashboard payload from the planning and identity folders.
+
+    ``jobs`` > 1 parses files in a process pool first. With ``cache_dir``
+    the parsed frontmatter, summaries and file versions are restored from
+    (and saved back to) a snapshot there, so only files changed since the
+    last run are read. See
+    ``assemble_dashboard_data`` for ``payload_version`` and the
+    ``from_week``/``to_week``/``aliases``/``projects``/``include_raw``
+    filters.
+    """
+    planning_path = Path(planning_dir)
+    identity_path = Path(identity_dir)
+    snapshot_roots = [planning_path, identity_path]
+    snapshot_complete = False
+    if cache_dir is not None:
+        work_before = PARSE_CACHE.misses + PARSE_CACHE.computed
+        snapshot_complete = restore_snapshot(cache_dir, snapshot_roots)["complete"]
+    if jobs > 1:
+        prefetch_frontmatter(_planning_source_files(planning_path, identity_path), jobs)
+
+    data = assemble_dashboard_data(
+        people=_collect_people(planning_path / "people"),
+        roles=_collect_roles(planning_path / "roles"),
+        project_context=_collect_project_context(planning_path / "projects"),
+        identities=_collect_identities(identity_path),
+        include_pii=include_pii,
+        payload_version=payload_version,
+        **filters,
+    )
+    if cache_dir is not None and not (snapshot_complete and PARSE_CACHE.misses + PARSE_CACHE.computed == work_before):
+        save_snapshot(cache_dir, snapshot_roots)
+    return data
+
+
+def iter_dashboard_json(data: dict[str, Any], indent: int | None = None) -> Iterator[str]:
+    """Serialize the dashboard payload piece by piece.
+
+    Yields the same text as ``json.dumps(data, indent=indent,
+    ensure_ascii=False)``, but list values at the top level (users,
+    projects, raw allocations, ...) are encoded one item at a time, so the
+    full document never has to exist as a single string.
+    """
+    encode = json.JSONEncoder(ensure_ascii=False, indent=indent).encode
+    if indent is None:
+        item_sep, open_pad, close_pad, item_pad, list_close = ", ", "", "", "", "]"
+    else:
+        item_sep, open_pad, close_pad = ",", "\n" + " " * indent, "\n"
+        item_pad, list_close = "\n" + " " * (2 * indent), "\n" + " " * indent + "]"
+
+    if not data:
+        yield "{}"
+        return
+    yield "{"
+    for index, (key, value) in enumerate(data.items()):
+        yield (item_sep if index else "") + open_pad + encode(key) + ": "
+        if not isinstance(value, list) or not value:
+            text = encode(value)
+            yield text if indent is None else text.replace("\n", open_pad)
+            continue
+        yield "["
+        for item_index, item in enumerate(value):
+            text = encode(item)
+            if indent is not None:
+                text = item_pad + text.replace("\n", item_pad)
+            yield (item_sep if item_index else "") + text
+        yield list_close
+    yield close_pad + "}"
 
 
 def write_dashboard_json(
@@ -794,14 +1273,24 @@ def write_dashboard_json(
     planning_dir: str | Path = "tst-data/planning",
     identity_dir: str | Path = "tst-data/identity",
     include_pii: bool = True,
+    jobs: int = 1,
+    cache_dir: str | Path | None = None,
+    payload_version: int = 1,
+    **filters: Any,
 ) -> Path:
     data = build_dashboard_data(
         planning_dir=planning_dir,
         identity_dir=identity_dir,
         include_pii=include_pii,
+        jobs=jobs,
+        cache_dir=cache_dir,
+        payload_version=payload_version,
+        **filters,
     )
     output_path = Path(output_file)
-    output_path.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
+    with output_path.open("w", encoding="utf-8") as handle:
+        for chunk in iter_dashboard_json(data, indent=2):
+            handle.write(chunk)
     return output_path
 
 
@@ -812,6 +1301,14 @@ if __name__ == "__main__":
     parser.add_argument("--identity-dir", default=None, help="Override identity folder")
     parser.add_argument("--output-file", default="pussla_data.json")
     parser.add_argument("--no-pii", action="store_true", help="Exclude real names from output")
+    parser.add_argument("--jobs", type=int, default=1, help="Parse files with N worker processes (default: 1, serial)")
+    parser.add_argument("--cache-dir", default=None, help="Reuse a parsed-data snapshot stored in this folder between runs")
+    parser.add_argument("--payload-version", type=int, choices=PAYLOAD_VERSIONS, default=1, help="2 references projects by name instead of embedding their context in every weekly slot")
+    parser.add_argument("--from-week", default=None, help="Only include weeks from this YYYY-Www on")
+    parser.add_argument("--to-week", default=None, help="Only include weeks up to this YYYY-Www")
+    parser.add_argument("--aliases", default=None, help="Comma-separated aliases to include")
+    parser.add_argument("--projects", default=None, help="Comma-separated projects to include")
+    parser.add_argument("--no-raw", action="store_true", help="Leave out raw_allocations")
     args = parser.parse_args()
 
     data_dir = Path(args.data_dir)
@@ -823,5 +1320,13 @@ if __name__ == "__main__":
         planning_dir=planning_dir,
         identity_dir=identity_dir,
         include_pii=not args.no_pii,
+        jobs=args.jobs,
+        cache_dir=args.cache_dir,
+        payload_version=args.payload_version,
+        from_week=args.from_week,
+        to_week=args.to_week,
+        aliases=args.aliases.split(",") if args.aliases else None,
+        projects=args.projects.split(",") if args.projects else None,
+        include_raw=False if args.no_raw else None,
     )
     print(f"Wrote {output}")
@@ -2,41 +2,219 @@
 from __future__ import annotations
 
 import argparse
+import asyncio
+import email.utils
 import errno
+import hashlib
 import json
-from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+import os
+import queue
+import select
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from http.server import HTTPServer, SimpleHTTPRequestHandler
 from pathlib import Path
-from urllib.parse import parse_qs, urlparse
+from typing import Callable, Iterable, Iterator
+from urllib.parse import parse_qs, parse_qsl, urlencode, urlparse
 
-from pussla_engine import (
-    build_dashboard_data,
-    update_project_metadata,
-    update_week_allocations,
-)
+from async_http import AsyncHTTPServer
+from planning_model import EVENT_BACKLOG, PlanningModel
+from planning_watcher import PlanningWatcher
+from pussla_engine import VersionConflictError, iter_dashboard_json
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+# ``?format=`` values accepted by /api/dashboard-data.
+PAYLOAD_FORMATS = {"v1": 1, "v2": 2}
+
+# Streamed responses are written in blocks of about this size.
+STREAM_CHUNK_BYTES = 64 * 1024
+# Largest encoded dashboard body kept in the server's response cache.
+MAX_CACHED_BODY_BYTES = 4 * 1024 * 1024
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+# Hashed Vite build output under /assets/ never changes for a given URL.
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+# Precompressed sibling suffixes for static files, in order of preference.
+STATIC_ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+# Largest accepted POST body.
+MAX_BODY_BYTES = 1024 * 1024
+
+
+def _accepted_encodings(header: str | None) -> set[str]:
+    """Content codings listed in ``Accept-Encoding`` with a non-zero q-value."""
+    accepted: set[str] = set()
+    for item in (header or "").split(","):
+        coding, _sep, params = item.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = params.strip().lower()
+        if quality.startswith("q="):
+            try:
+                if float(quality[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(coding)
+    return accepted
+
+
+def _response_encoding(accepted: set[str]) -> str | None:
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted or "*" in accepted:
+        return "gzip"
+    return None
+
+
+def _stream_compressor(encoding: str) -> tuple[Callable[[bytes], bytes], Callable[[], bytes]]:
+    """Return ``(compress, finish)`` functions for an incremental encoder."""
+    if encoding == "br":
+        compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+        return compressor.process, compressor.finish
+    compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    return compressor.compress, compressor.flush
+
+
+def _encode_stream(chunks: Iterable[str], encoding: str | None) -> Iterator[bytes]:
+    """UTF-8 encode (and compress) text chunks into blocks of about ``STREAM_CHUNK_BYTES``."""
+    compress, finish = _stream_compressor(encoding) if encoding is not None else (None, None)
+    pending: list[bytes] = []
+    pending_size = 0
+    for chunk in chunks:
+        data = chunk.encode("utf-8")
+        pending.append(data)
+        pending_size += len(data)
+        if pending_size >= STREAM_CHUNK_BYTES:
+            block = b"".join(pending)
+            pending, pending_size = [], 0
+            if compress is not None:
+                block = compress(block)
+            if block:
+                yield block
+    block = b"".join(pending)
+    if compress is not None:
+        block = compress(block) + finish()
+    if block:
+        yield block
+
+
+def _encoded_etag(etag: str, encoding: str | None) -> str:
+    """Give each content coding of a representation its own strong ETag."""
+    return etag if encoding is None else f'{etag[:-1]}-{encoding}"'
+
+
+def _query_list(query: dict[str, list[str]], name: str) -> list[str] | None:
+    """Values of a list parameter given as ``?name=a,b`` and/or ``?name=a&name=b``."""
+    if name not in query:
+        return None
+    return [item.strip() for value in query[name] for item in value.split(",") if item.strip()]
+
+
+def _dashboard_filters(query: dict[str, list[str]]) -> dict[str, object]:
+    include_raw = query.get("include_raw", [None])[0]
+    return {
+        "from_week": query.get("from_week", [None])[0],
+        "to_week": query.get("to_week", [None])[0],
+        "aliases": _query_list(query, "aliases"),
+        "projects": _query_list(query, "projects"),
+        "include_raw": None if include_raw is None else include_raw != "0",
+    }
+
+
+def _dashboard_etag(fingerprint: str, query: str, ignore: Iterable[str] = ()) -> str:
+    """Strong ETag for one data fingerprint and (order-insensitive) query string.
+
+    Parameters in ``ignore`` do not change the body and are left out.
+    """
+    canonical = urlencode(
+        sorted((name, value) for name, value in parse_qsl(query, keep_blank_values=True) if name not in ignore)
+    )
+    return '"' + hashlib.sha1(f"{fingerprint}?{canonical}".encode("utf-8")).hexdigest() + '"'
+
+
+def _dashboard_headers(last_modified: float) -> dict[str, str]:
+    return {
+        "Last-Modified": email.utils.formatdate(last_modified, usegmt=True),
+        "Cache-Control": "no-cache",
+        "Vary": "Accept-Encoding",
+    }
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    """True if ``header`` lists ``etag`` in any content coding."""
+    if header.strip() == "*":
+        return True
+    variants = {etag, *(_encoded_etag(etag, encoding) for encoding in ("gzip", "br"))}
+    return any(tag.strip().removeprefix("W/") in variants for tag in header.split(","))
+
+
+def _if_match_version(header: str | None) -> str | None:
+    """File version token named by an ``If-Match`` header; ``None`` for absent or ``*``."""
+    if header is None or header.strip() == "*":
+        return None
+    return header.strip().removeprefix("W/").strip('"')
+
+
+def _event_message(name: str, payload: dict) -> bytes:
+    """One Server-Sent Events message; the payload's ``version`` is its id."""
+    data = json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+    return f"id: {payload['version']}\nevent: {name}\ndata: {data}\n\n".encode("utf-8")
+
+
+def _not_modified_since(header: str, last_modified: float) -> bool:
+    try:
+        since = email.utils.parsedate_to_datetime(header)
+    except (TypeError, ValueError):
+        return False
+    return since is not None and int(last_modified) <= since.timestamp()
 
 
 class DashboardHandler(SimpleHTTPRequestHandler):
+    # HTTP/1.1 for chunked dashboard responses (and keep-alive).
+    protocol_version = "HTTP/1.1"
+
     def __init__(self, *args, static_dir: Path, **kwargs):
         self._static_dir = static_dir
+        self._static_headers: list[tuple[str, str]] = []
         super().__init__(*args, directory=str(static_dir), **kwargs)
 
+    def handle(self) -> None:
+        """Serve the connection's requests; the server decides how long to wait between them."""
+        self.handle_one_request()
+        while not self.close_connection and (self._request_buffered() or self.server.wait_for_request(self.connection)):
+            self.handle_one_request()
+
+    def _request_buffered(self) -> bool:
+        """True if a pipelined request already sits in ``rfile``, where select() cannot see it."""
+        timeout = self.connection.gettimeout()
+        self.connection.setblocking(False)
+        try:
+            return bool(self.rfile.peek(1))
+        except OSError:
+            return False
+        finally:
+            self.connection.settimeout(timeout)
+
     def do_GET(self) -> None:  # noqa: N802
         parsed = urlparse(self.path)
 
         if parsed.path == "/api/dashboard-data":
-            query = parse_qs(parsed.query)
-            include_pii = query.get("include_pii", ["1"])[0] != "0"
-            data = build_dashboard_data(
-                planning_dir=self.server.planning_dir,
-                identity_dir=self.server.identity_dir,
-                include_pii=include_pii,
-            )
-            payload = json.dumps(data, ensure_ascii=False).encode("utf-8")
-            self.send_response(200)
-            self.send_header("Content-Type", "application/json; charset=utf-8")
-            self.send_header("Content-Length", str(len(payload)))
-            self.end_headers()
-            self.wfile.write(payload)
+            self._serve_dashboard(parsed.query)
+            return
+
+        if parsed.path == "/api/identities":
+            self._serve_identities()
+            return
+
+        if parsed.path == "/api/events":
+            self._serve_events()
             return
 
         # For the React SPA: any non-asset path that doesn't match a file
@@ -50,11 +228,257 @@ class DashboardHandler(SimpleHTTPRequestHandler):
 
         super().do_GET()
 
-    def _send_json(self, status: int, payload: dict) -> None:
+    def send_head(self):
+        """Serve static files, preferring precompressed ``.br``/``.gz`` siblings."""
+        path = self.translate_path(self.path)
+        self._static_headers = []
+        if not os.path.isfile(path):
+            return super().send_head()
+
+        if urlparse(self.path).path.startswith("/assets/"):
+            self._static_headers.append(("Cache-Control", IMMUTABLE_CACHE_CONTROL))
+        else:
+            self._static_headers.append(("Cache-Control", "no-cache"))
+        accepted = _accepted_encodings(self.headers.get("Accept-Encoding"))
+        for encoding, suffix in STATIC_ENCODINGS:
+            if encoding in accepted and os.path.isfile(path + suffix):
+                return self._send_precompressed(path, path + suffix, encoding)
+        if any(os.path.isfile(path + suffix) for _encoding, suffix in STATIC_ENCODINGS):
+            self._static_headers.append(("Vary", "Accept-Encoding"))
+        return super().send_head()
+
+    def _send_precompressed(self, path: str, encoded_path: str, encoding: str):
+        try:
+            handle = open(encoded_path, "rb")
+        except OSError:
+            self._static_headers = []
+            return super().send_head()
+        try:
+            st = os.fstat(handle.fileno())
+            self.send_response(200)
+            self.send_header("Content-Type", self.guess_type(path))
+            self.send_header("Content-Encoding", encoding)
+            self.send_header("Content-Length", str(st.st_size))
+            self.send_header("Last-Modified", self.date_time_string(int(os.stat(path).st_mtime)))
+            self.send_header("Vary", "Accept-Encoding")
+            self.end_headers()
+        except Exception:
+            handle.close()
+            raise
+        return handle
+
+    def end_headers(self) -> None:
+        for name, value in self._static_headers:
+            self.send_header(name, value)
+        self._static_headers = []
+        if not self.close_connection and self.server.busy():
+            # Hand the connection's worker to someone who is waiting.
+            self.send_header("Connection", "close")
+        super().end_headers()
+
+    def _serve_dashboard(self, raw_query: str) -> None:
+        query = parse_qs(raw_query)
+        include_pii = query.get("include_pii", ["1"])[0] != "0"
+        payload_format = query.get("format", ["v1"])[0]
+        if payload_format not in PAYLOAD_FORMATS:
+            self._send_json(400, {"error": f"Unsupported format: {payload_format}"})
+            return
+        model = self.server.model
+        encoding = _response_encoding(_accepted_encodings(self.headers.get("Accept-Encoding")))
+        if "since" in query:
+            self._serve_delta(query, raw_query, payload_format, encoding)
+            return
+
+        # Conditional and cached responses are answered from the current
+        # data version without assembling anything.
+        payload_version = PAYLOAD_FORMATS[payload_format]
+        with_names = include_pii and payload_version == 1
+        # Alias-only payloads are the same in both privacy modes.
+        ignore = () if with_names else ("include_pii",)
+        fingerprint, last_modified = model.version(with_identities=with_names)
+        etag = _dashboard_etag(fingerprint, raw_query, ignore)
+        if self._client_is_current(etag, last_modified):
+            self._send_not_modified(etag, encoding, last_modified)
+            return
+        cached = self.server.cached_response(etag, encoding)
+        if cached is None:
+            try:
+                built_fingerprint, last_modified, data = model.dashboard_payload(
+                    include_pii=include_pii,
+                    payload_version=payload_version,
+                    **_dashboard_filters(query),
+                )
+            except ValueError as exc:
+                self._send_json(400, {"error": str(exc)})
+                return
+            if built_fingerprint != fingerprint:
+                # A stale-while-revalidate payload, or the data changed meanwhile.
+                etag = _dashboard_etag(built_fingerprint, raw_query, ignore)
+                if self._client_is_current(etag, last_modified):
+                    self._send_not_modified(etag, encoding, last_modified)
+                    return
+                cached = self.server.cached_response(etag, encoding)
+
+        headers = _dashboard_headers(last_modified)
+        if cached is None:
+            self._stream_dashboard(data, etag, encoding, headers)
+            return
+        body_encoding, body = cached
+        headers["ETag"] = _encoded_etag(etag, body_encoding)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        if body_encoding is not None:
+            self.send_header("Content-Encoding", body_encoding)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _serve_delta(self, query: dict[str, list[str]], raw_query: str, payload_format: str, encoding: str | None) -> None:
+        """Answer ``?since=<data_version>`` with ``PlanningModel.dashboard_delta``."""
+        if PAYLOAD_FORMATS[payload_format] != 2:
+            self._send_json(400, {"error": "since requires format=v2"})
+            return
+        if any(value is not None for value in _dashboard_filters(query).values()):
+            self._send_json(400, {"error": "since cannot be combined with filters"})
+            return
+        try:
+            since = int(query["since"][0])
+        except ValueError:
+            self._send_json(400, {"error": "since must be an integer data_version"})
+            return
+
+        fingerprint, last_modified, delta = self.server.model.dashboard_delta(since)
+        etag = _dashboard_etag(fingerprint, raw_query, ("include_pii",))
+        if self._client_is_current(etag, last_modified):
+            self._send_not_modified(etag, encoding, last_modified)
+            return
+        # Deltas are small and rarely repeated; keep the response cache for full payloads.
+        self._stream_dashboard(delta, etag, encoding, _dashboard_headers(last_modified), cache=False)
+
+    def _serve_identities(self) -> None:
+        """Alias -> real name map for clients that show names over alias-only payloads."""
+        fingerprint, last_modified, identities = self.server.model.identities()
+        etag = f'"{fingerprint}"'
+        if self._client_is_current(etag, last_modified):
+            self._send_not_modified(etag, None, last_modified)
+            return
+        names = {
+            alias: identity["real_name"]
+            for alias, identity in sorted(identities.items())
+            if isinstance(identity.get("real_name"), str) and identity["real_name"].strip()
+        }
+        headers = _dashboard_headers(last_modified)
+        headers["ETag"] = etag
+        self._send_json(200, {"identities": names}, headers)
+
+    def _serve_events(self) -> None:
+        """Server-Sent Events feed of model changes.
+
+        The stream opens with a ``version`` event carrying the current
+        fingerprint, then sends one ``change`` event per model change (see
+        ``PlanningModel.subscribe``) with the fingerprint as its id. Idle
+        streams get a comment line every ``event_keepalive`` seconds, which
+        is also when an unwatched model is checked for changes on disk.
+        """
+        if not self.server.begin_stream():
+            self._send_json(503, {"error": "Too many open event streams"}, {"Retry-After": str(self.server.retry_after)})
+            return
+        model = self.server.model
+        events = model.subscribe()
+        try:
+            fingerprint, _last_modified = model.version()
+            self.close_connection = True
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream; charset=utf-8")
+            self.send_header("Cache-Control", "no-cache")
+            self.end_headers()
+            self._send_event("version", {"version": fingerprint})
+            while not self.server.stopping.is_set():
+                try:
+                    event = events.get(timeout=self.server.event_keepalive)
+                except queue.Empty:
+                    self.wfile.write(b": keepalive\n\n")
+                    self.wfile.flush()
+                    if not model.watched:
+                        model.version()
+                    continue
+                self._send_event("change", event)
+        except (BrokenPipeError, ConnectionResetError, TimeoutError):
+            pass
+        finally:
+            model.unsubscribe(events)
+            self.server.end_stream()
+
+    def _send_event(self, name: str, payload: dict) -> None:
+        self.wfile.write(_event_message(name, payload))
+        self.wfile.flush()
+
+    def _send_not_modified(self, etag: str, encoding: str | None, last_modified: float) -> None:
+        self.send_response(304)
+        self.send_header("ETag", _encoded_etag(etag, encoding))
+        for name, value in _dashboard_headers(last_modified).items():
+            self.send_header(name, value)
+        self.end_headers()
+
+    def _stream_dashboard(
+        self,
+        data: dict,
+        etag: str,
+        encoding: str | None,
+        headers: dict[str, str],
+        cache: bool = True,
+    ) -> None:
+        """Write the payload as it is serialized, chunked for HTTP/1.1 clients.
+
+        With ``cache``, bodies up to ``MAX_CACHED_BODY_BYTES`` (after
+        compression) are kept in the server's response cache for the next
+        identical request.
+        """
+        chunked = self.request_version != "HTTP/1.0"
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        if encoding is not None:
+            self.send_header("Content-Encoding", encoding)
+        if chunked:
+            self.send_header("Transfer-Encoding", "chunked")
+        else:
+            self.close_connection = True
+        headers["ETag"] = _encoded_etag(etag, encoding)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+
+        kept: list[bytes] | None = [] if cache else None
+        kept_size = 0
+        for block in _encode_stream(iter_dashboard_json(data), encoding):
+            if kept is not None:
+                kept.append(block)
+                kept_size += len(block)
+                if kept_size > MAX_CACHED_BODY_BYTES:
+                    kept = None
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(block), block) if chunked else block)
+        if kept is not None:
+            self.server.store_response(etag, encoding, (encoding, b"".join(kept)))
+        if chunked:
+            self.wfile.write(b"0\r\n\r\n")
+
+    def _client_is_current(self, etag: str, last_modified: float) -> bool:
+        """Evaluate conditional GET headers; If-None-Match wins over If-Modified-Since."""
+        if_none_match = self.headers.get("If-None-Match")
+        if if_none_match is not None:
+            return _etag_matches(if_none_match, etag)
+        if_modified_since = self.headers.get("If-Modified-Since")
+        return if_modified_since is not None and _not_modified_since(if_modified_since, last_modified)
+
+    def _send_json(self, status: int, payload: dict, headers: dict[str, str] | None = None) -> None:
         body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
         self.send_response(status)
         self.send_header("Content-Type", "application/json; charset=utf-8")
         self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
         self.end_headers()
         self.wfile.write(body)
 
@@ -63,22 +487,32 @@ class DashboardHandler(SimpleHTTPRequestHandler):
         normalized_path = parsed.path.rstrip("/") or "/"
         if normalized_path not in {
             "/api/allocation/update",
+            "/api/allocation/bulk-update",
             "/api/project/update",
             "/api/projects/update",
         }:
+            # The body is left unread, so the connection cannot be reused.
+            self.close_connection = True
             self._send_json(404, {"error": "Not found"})
             return
 
         try:
             content_length = int(self.headers.get("Content-Length", "0"))
         except ValueError:
+            self.close_connection = True
             self._send_json(400, {"error": "Invalid Content-Length header"})
             return
 
         if content_length <= 0:
+            self.close_connection = True
             self._send_json(400, {"error": "Request body is required"})
             return
 
+        if content_length > self.server.max_body_bytes:
+            self.close_connection = True
+            self._send_json(413, {"error": f"Request body exceeds {self.server.max_body_bytes} bytes"})
+            return
+
         raw_body = self.rfile.read(content_length)
         try:
             payload = json.loads(raw_body.decode("utf-8"))
@@ -95,12 +529,15 @@ class DashboardHandler(SimpleHTTPRequestHandler):
             week = payload.get("week")
             allocations = payload.get("allocations")
             try:
-                result = update_week_allocations(
-                    planning_dir=self.server.planning_dir,
+                result = self.server.model.update_week_allocations(
                     alias=alias,
                     week=week,
                     allocations=allocations,
+                    expected_version=_if_match_version(self.headers.get("If-Match")),
                 )
+            except VersionConflictError as exc:
+                self._send_json(409, {"error": str(exc), "version": exc.current_version})
+                return
             except FileNotFoundError as exc:
                 self._send_json(404, {"error": str(exc)})
                 return
@@ -110,17 +547,38 @@ class DashboardHandler(SimpleHTTPRequestHandler):
             except Exception:
                 self._send_json(500, {"error": "Failed to update allocation"})
                 return
-            self._send_json(200, {"ok": True, "updated": result})
+            self._send_json(200, {"ok": True, "updated": result}, {"ETag": f'"{result["version"]}"'})
+            return
+
+        if normalized_path == "/api/allocation/bulk-update":
+            try:
+                results = self.server.model.bulk_update_week_allocations(edits=payload.get("edits"))
+            except VersionConflictError as exc:
+                self._send_json(409, {"error": str(exc), "version": exc.current_version})
+                return
+            except FileNotFoundError as exc:
+                self._send_json(404, {"error": str(exc)})
+                return
+            except ValueError as exc:
+                self._send_json(400, {"error": str(exc)})
+                return
+            except Exception:
+                self._send_json(500, {"error": "Failed to update allocations"})
+                return
+            self._send_json(200, {"ok": True, "updated": results})
             return
 
         project = payload.get("project")
         updates = payload.get("updates")
         try:
-            result = update_project_metadata(
-                planning_dir=self.server.planning_dir,
+            result = self.server.model.update_project_metadata(
                 project=project,
                 updates=updates,
+                expected_version=_if_match_version(self.headers.get("If-Match")),
             )
+        except VersionConflictError as exc:
+            self._send_json(409, {"error": str(exc), "version": exc.current_version})
+            return
         except FileNotFoundError as exc:
             self._send_json(404, {"error": str(exc)})
             return
@@ -131,13 +589,267 @@ class DashboardHandler(SimpleHTTPRequestHandler):
             self._send_json(500, {"error": "Failed to update project metadata"})
             return
 
-        self._send_json(200, {"ok": True, "updated": result})
+        self._send_json(200, {"ok": True, "updated": result}, {"ETag": f'"{result["version"]}"'})
 
 
-class DashboardServer(ThreadingHTTPServer):
-    allow_reuse_address = True
+class _DashboardServerState:
+    """Model, response cache and shutdown flag shared by both server modes."""
+
     planning_dir: Path
     identity_dir: Path
+    model: PlanningModel
+    # Encoded /api/dashboard-data bodies kept per (ETag, requested coding).
+    max_cached_responses = 8
+    # Seconds between keepalive comments on idle /api/events streams.
+    event_keepalive = 15.0
+    max_body_bytes = MAX_BODY_BYTES
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stopping = threading.Event()
+        self._responses: OrderedDict[tuple[str, str | None], tuple[str | None, bytes]] = OrderedDict()
+        self._responses_lock = threading.Lock()
+
+    def cached_response(self, etag: str, encoding: str | None) -> tuple[str | None, bytes] | None:
+        with self._responses_lock:
+            cached = self._responses.get((etag, encoding))
+            if cached is not None:
+                self._responses.move_to_end((etag, encoding))
+            return cached
+
+    def store_response(self, etag: str, encoding: str | None, response: tuple[str | None, bytes]) -> None:
+        with self._responses_lock:
+            self._responses[(etag, encoding)] = response
+            while len(self._responses) > self.max_cached_responses:
+                self._responses.popitem(last=False)
+
+    def busy(self) -> bool:
+        """True if other connections are waiting for this one's worker."""
+        return False
+
+    def server_close(self) -> None:
+        self.stopping.set()
+        super().server_close()
+
+
+class DashboardServer(_DashboardServerState, HTTPServer):
+    """Threaded server with a fixed pool of ``workers`` connection threads.
+
+    Accepted connections wait in a queue of ``queue_depth`` for a free
+    worker. When that queue is full, a single rejecting thread answers them
+    with 503 and ``Retry-After``; connections beyond its own queue are
+    closed. Socket reads and writes time out after ``request_timeout``
+    seconds. A kept-alive connection holds on to its worker for at most
+    ``keep_alive_timeout`` seconds between requests. When other connections
+    are waiting, responses carry ``Connection: close`` and idle connections
+    are dropped, so the worker goes to a waiting connection.
+
+    ``/api/events`` streams leave the pool: a replacement worker is started
+    for each stream, and at most ``max_event_streams`` may be open.
+    """
+
+    allow_reuse_address = True
+    # listen() backlog; the socketserver default of 5 drops bursts of connects.
+    request_queue_size = 128
+    request_timeout = 30.0
+    keep_alive_timeout = 5.0
+    # Seconds suggested to rejected clients.
+    retry_after = 1
+    max_event_streams = 64
+
+    def __init__(self, server_address, handler_class, workers: int | None = None, queue_depth: int = 64):
+        if workers is not None and workers < 1:
+            raise ValueError(f"workers must be at least 1, got {workers}")
+        if queue_depth < 1:
+            # queue.Queue treats a maxsize of 0 or less as unbounded.
+            raise ValueError(f"queue_depth must be at least 1, got {queue_depth}")
+        super().__init__(server_address, handler_class)
+        self.workers = workers or min(32, (os.cpu_count() or 1) + 4)
+        self._connections: queue.Queue = queue.Queue(maxsize=queue_depth)
+        self._rejected: queue.Queue = queue.Queue(maxsize=queue_depth)
+        self._pool_lock = threading.Lock()
+        self._streams = 0
+        self._surplus_workers = 0
+        for _ in range(self.workers):
+            self._start_thread(self._work, "http-worker")
+        self._start_thread(self._reject, "http-reject")
+
+    def _start_thread(self, target: Callable[[], None], name: str) -> None:
+        threading.Thread(target=target, name=name, daemon=True).start()
+
+    def process_request(self, request, client_address) -> None:
+        try:
+            self._connections.put_nowait((request, client_address))
+        except queue.Full:
+            try:
+                self._rejected.put_nowait(request)
+            except queue.Full:
+                self.shutdown_request(request)
+
+    def _work(self) -> None:
+        while True:
+            with self._pool_lock:
+                if self._surplus_workers:
+                    self._surplus_workers -= 1
+                    return
+            item = self._connections.get()
+            if item is None:
+                return
+            request, client_address = item
+            try:
+                request.settimeout(self.request_timeout)
+                self.finish_request(request, client_address)
+            except Exception:
+                self.handle_error(request, client_address)
+            finally:
+                self.shutdown_request(request)
+
+    def _reject(self) -> None:
+        body = json.dumps({"error": "Server busy"}).encode("utf-8")
+        while True:
+            request = self._rejected.get()
+            if request is None:
+                return
+            try:
+                # Read the request first; closing with it unread would reset the connection.
+                request.settimeout(min(1.0, self.request_timeout))
+                request.recv(64 * 1024)
+                request.sendall(
+                    "HTTP/1.1 503 Service Unavailable\r\n"
+                    f"Date: {email.utils.formatdate(usegmt=True)}\r\n"
+                    f"Retry-After: {self.retry_after}\r\n"
+                    "Content-Type: application/json; charset=utf-8\r\n"
+                    f"Content-Length: {len(body)}\r\n"
+                    "Connection: close\r\n\r\n".encode("ascii") + body
+                )
+            except OSError:
+                pass
+            finally:
+                self.shutdown_request(request)
+
+    def busy(self) -> bool:
+        return not self._connections.empty()
+
+    def wait_for_request(self, connection) -> bool:
+        """Wait up to ``keep_alive_timeout`` for the next request on a kept-alive connection."""
+        deadline = time.monotonic() + self.keep_alive_timeout
+        while not self.stopping.is_set() and self._connections.empty():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            readable, _w, _x = select.select([connection], [], [], min(remaining, 0.1))
+            if readable:
+                return True
+        return False
+
+    def begin_stream(self) -> bool:
+        """Move the calling worker out of the pool for a long-lived stream, if allowed."""
+        with self._pool_lock:
+            if self._streams >= self.max_event_streams:
+                return False
+            self._streams += 1
+        self._start_thread(self._work, "http-worker")
+        return True
+
+    def end_stream(self) -> None:
+        with self._pool_lock:
+            self._streams -= 1
+            self._surplus_workers += 1
+
+    def server_close(self) -> None:
+        super().server_close()
+        while True:
+            try:
+                item = self._connections.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None:
+                self.shutdown_request(item[0])
+        for _ in range(self.workers + self._streams):
+            try:
+                self._connections.put_nowait(None)
+            except queue.Full:
+                break
+        try:
+            self._rejected.put_nowait(None)
+        except queue.Full:
+            pass
+
+
+class _WakingQueue(queue.Queue):
+    """Change-event queue that also wakes a stream waiting on the event loop."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, wakeup: asyncio.Event):
+        super().__init__(maxsize=EVENT_BACKLOG)
+        self._loop = loop
+        self._wakeup = wakeup
+
+    def _put(self, item) -> None:
+        super()._put(item)
+        try:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+        except RuntimeError:  # the loop has shut down
+            pass
+
+
+class AsyncDashboardServer(_DashboardServerState, AsyncHTTPServer):
+    """``--server asyncio``: the dashboard routes on an event loop with keep-alive.
+
+    Requests run ``DashboardHandler`` on the bounded pool of
+    ``AsyncHTTPServer``. ``/api/events`` streams are served on the loop
+    itself, so open event streams do not hold pool threads.
+
+    ``queue_depth`` has the meaning it has for ``DashboardServer``: up to
+    that many requests may wait for a worker on top of the ones running, so
+    ``max_pending`` is ``workers + queue_depth``. Requests beyond that are
+    not answered with 503; their bodies stay unread until a slot frees up.
+    """
+
+    def __init__(self, server_address, handler_class, handler_kwargs=None, workers: int | None = None, queue_depth: int = 64):
+        if queue_depth < 1:
+            raise ValueError(f"queue_depth must be at least 1, got {queue_depth}")
+        super().__init__(server_address, handler_class, handler_kwargs, workers=workers)
+        self.max_pending = self.workers + queue_depth
+
+    async def serve_stream(self, method, target, headers, writer) -> bool:
+        if method != "GET" or urlparse(target).path != "/api/events":
+            return False
+        model = self.model
+        wakeup = asyncio.Event()
+        events = await self.run_blocking(model.subscribe, _WakingQueue(asyncio.get_running_loop(), wakeup))
+        try:
+            fingerprint, _last_modified = await self.run_blocking(model.version)
+            writer.write(
+                "HTTP/1.1 200 OK\r\n"
+                f"Date: {email.utils.formatdate(usegmt=True)}\r\n"
+                "Content-Type: text/event-stream; charset=utf-8\r\n"
+                "Cache-Control: no-cache\r\n"
+                "Connection: close\r\n\r\n".encode("ascii")
+            )
+            writer.write(_event_message("version", {"version": fingerprint}))
+            await writer.drain()
+            while not self.stopping.is_set():
+                try:
+                    await asyncio.wait_for(wakeup.wait(), self.event_keepalive)
+                except asyncio.TimeoutError:
+                    writer.write(b": keepalive\n\n")
+                    await writer.drain()
+                    if not model.watched:
+                        await self.run_blocking(model.version)
+                    continue
+                wakeup.clear()
+                while True:
+                    try:
+                        writer.write(_event_message("change", events.get_nowait()))
+                    except queue.Empty:
+                        break
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            # Unsubscribing takes the model lock, which must not block the loop.
+            await self.run_blocking(model.unsubscribe, events)
+        return True
 
 
 def _resolve_planning_dir(data_dir: Path, planning_override: str | None) -> Path:
@@ -178,6 +890,17 @@ def run_server(
     planning_dir: Path,
     identity_dir: Path,
     static_dir_override: str | None = None,
+    jobs: int = 1,
+    cache_dir: str | None = None,
+    stale_while_revalidate: bool = False,
+    write_behind: float | None = None,
+    journal_path: str | None = None,
+    watch: str | None = None,
+    server_mode: str = "threaded",
+    workers: int | None = None,
+    queue_depth: int = 64,
+    request_timeout: float = 30.0,
+    max_body_bytes: int = MAX_BODY_BYTES,
 ) -> None:
     static_dir = _resolve_static_dir(static_dir_override)
 
@@ -185,7 +908,14 @@ def run_server(
         return DashboardHandler(*args, static_dir=static_dir, **kwargs)
 
     try:
-        server = DashboardServer((host, port), handler)
+        if server_mode == "asyncio":
+            server = AsyncDashboardServer(
+                (host, port), DashboardHandler, {"static_dir": static_dir}, workers=workers, queue_depth=queue_depth
+            )
+            server.write_timeout = request_timeout
+        else:
+            server = DashboardServer((host, port), handler, workers=workers, queue_depth=queue_depth)
+            server.request_timeout = request_timeout
     except OSError as exc:
         if exc.errno == errno.EADDRINUSE:
             raise SystemExit(
@@ -197,6 +927,23 @@ def run_server(
 
     server.planning_dir = planning_dir
     server.identity_dir = identity_dir
+    server.max_body_bytes = max_body_bytes
+    server.model = PlanningModel(
+        planning_dir,
+        identity_dir,
+        jobs=jobs,
+        cache_dir=cache_dir,
+        stale_while_revalidate=stale_while_revalidate,
+        write_behind=write_behind,
+        journal_path=journal_path,
+    )
+    watcher = None
+    if watch is not None:
+        watcher = PlanningWatcher(server.model, backend=watch)
+        watcher.start()
+    else:
+        server.model.refresh()
+    server.model.save_snapshot()
 
     resolved_port = server.server_address[1]
     url = f"http://{host}:{resolved_port}"
@@ -204,6 +951,9 @@ def run_server(
     print(f"Frontend:      {static_dir}")
     print(f"Planning data: {planning_dir}")
     print(f"Identity data: {identity_dir}")
+    if watcher is not None:
+        print(f"Watching:      planning and identity files ({watcher.backend})")
+    print(f"Server:        {server_mode}, {server.workers} worker threads")
     print("Press Ctrl+C to stop.")
 
     try:
@@ -212,6 +962,17 @@ def run_server(
         pass
     finally:
         server.server_close()
+        if watcher is not None:
+            watcher.stop()
+        server.model.close()
+        server.model.save_snapshot()
+
+
+def _positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
 
 
 def main() -> None:
@@ -222,6 +983,40 @@ def main() -> None:
     parser.add_argument("--planning-dir", default=None, help="Override planning folder (contains people/, roles/, and projects/)")
     parser.add_argument("--identity-dir", default=None, help="Override identity folder")
     parser.add_argument("--static-dir", default=None, help="Override static frontend directory (must contain index.html)")
+    parser.add_argument("--jobs", type=int, default=1, help="Parse planning files with N worker processes (default: 1, serial)")
+    parser.add_argument("--cache-dir", default=None, help="Persist a parsed-data snapshot here for fast restarts")
+    parser.add_argument("--stale-while-revalidate", action="store_true", help="After a data change, keep serving the previous dashboard while it is rebuilt in the background")
+    parser.add_argument(
+        "--write-behind",
+        type=float,
+        default=None,
+        metavar="SECONDS",
+        help="Acknowledge week edits from a journal and write each people file once SECONDS after its last edit",
+    )
+    parser.add_argument("--journal", default=None, help="Write-behind journal file; keep it outside the planning repository (default: $XDG_STATE_HOME/pussla/edit-journal-<hash of planning dir>.jsonl)")
+    parser.add_argument(
+        "--watch",
+        nargs="?",
+        const="auto",
+        default=None,
+        choices=["auto", "inotify", "poll"],
+        help="Follow planning file changes with inotify (or stat polling) instead of re-scanning on every request",
+    )
+    parser.add_argument(
+        "--server",
+        default="threaded",
+        choices=["threaded", "asyncio"],
+        help="threaded: a pool of connection threads; asyncio: keep-alive connections on an event loop with a bounded worker pool",
+    )
+    parser.add_argument("--workers", type=_positive_int, default=None, help="Request worker threads (default: CPU count + 4, at most 32)")
+    parser.add_argument(
+        "--queue-depth",
+        type=_positive_int,
+        default=64,
+        help="Requests that may wait for a worker: the threaded server answers 503 beyond this, the asyncio server stops reading request bodies (default: 64)",
+    )
+    parser.add_argument("--request-timeout", type=float, default=30.0, metavar="SECONDS", help="Drop connections that stall a read or write this long (default: 30)")
+    parser.add_argument("--max-body-kb", type=int, default=MAX_BODY_BYTES // 1024, help="Largest accepted POST body in KiB (default: 1024)")
     args = parser.parse_args()
 
     data_dir = Path(args.data_dir)
@@ -234,6 +1029,17 @@ def main() -> None:
         planning_dir=planning_dir,
         identity_dir=identity_dir,
         static_dir_override=args.static_dir,
+        jobs=args.jobs,
+        cache_dir=args.cache_dir,
+        stale_while_revalidate=args.stale_while_revalidate,
+        write_behind=args.write_behind,
+        journal_path=args.journal,
+        watch=args.watch,
+        server_mode=args.server,
+        workers=args.workers,
+        queue_depth=args.queue_depth,
+        request_timeout=args.request_timeout,
+        max_body_bytes=args.max_body_kb * 1024,
     )
 
 
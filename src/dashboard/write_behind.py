@@ -0,0 +1,377 @@
+"""Write-behind mode for week allocation edits.
+
+Rapid edits in the heatmap editor used to rewrite the same people file once
+per request. With write-behind, ``WriteBehindQueue`` validates each edit,
+appends it to an fsync'd journal and applies it to an in-memory copy of the
+file, and the request is acknowledged with the version the file will have
+once written. Each file is then rewritten once, ``delay`` seconds after the
+last edit to it (and at most ``max_delay`` after the first).
+
+Journal records are normalized week edits. After every flush the journal is
+rewritten to hold only the edits still pending, so a replay after a crash
+never re-applies an edit that already reached its file over changes made
+to that file since. Replacing one week's allocations is idempotent, so the
+edits of a flush interrupted by the crash can be replayed safely.
+
+People files are written, and ``on_change`` is called, outside the queue
+lock: requests keep staging edits while a flush is writing.
+"""
+
+from __future__ import annotations
+
+import copy
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from typing import Any, Callable, Iterable
+
+from pussla_engine import (
+    VersionConflictError,
+    _normalize_week_edit,
+    _people_file_for,
+    _people_record,
+    _read_people_frontmatter,
+    _render_frontmatter,
+    _replace_week_allocations,
+    _week_edit_result,
+    bulk_update_week_allocations,
+    content_version,
+    file_lock,
+    file_version,
+)
+
+JOURNAL_DIR_NAME = "pussla"
+# {people file: (record, version) while edits are pending, None once written}
+StagedChanges = dict[Path, tuple[dict[str, Any] | None, str] | None]
+
+
+def default_journal_path(planning_dir: str | Path) -> Path:
+    """Return the journal path used when none is given.
+
+    The journal lives in the user's state directory (``$XDG_STATE_HOME``,
+    else ``~/.local/state``), outside the planning repository, so it is
+    never committed along with the people files. It is named after a hash
+    of the resolved planning directory, so checkouts do not share one.
+    """
+    state_home = os.environ.get("XDG_STATE_HOME") or Path.home() / ".local" / "state"
+    key = hashlib.sha1(str(Path(planning_dir).resolve()).encode("utf-8")).hexdigest()[:16]
+    return Path(state_home) / JOURNAL_DIR_NAME / f"edit-journal-{key}.jsonl"
+
+
+class EditJournal:
+    """Append-only JSON-lines file of week edits, fsync'd on every append."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+
+    def append(self, edits: list[dict[str, Any]]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        lines = "".join(json.dumps(edit, separators=(",", ":")) + "\n" for edit in edits)
+        with open(self.path, "a", encoding="utf-8") as handle:
+            handle.write(lines)
+            handle.flush()
+            os.fsync(handle.fileno())
+
+    def read(self) -> list[dict[str, Any]]:
+        """Return the journaled edits, skipping a last line torn by a crash."""
+        try:
+            text = self.path.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return []
+        edits = []
+        for line in text.splitlines():
+            try:
+                edit = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(edit, dict):
+                edits.append(edit)
+        return edits
+
+    def rewrite(self, edits: list[dict[str, Any]]) -> None:
+        """Atomically replace the journal with ``edits``; remove it if there are none."""
+        if not edits:
+            self.clear()
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with NamedTemporaryFile("w", encoding="utf-8", dir=self.path.parent, delete=False) as tmp:
+            tmp.write("".join(json.dumps(edit, separators=(",", ":")) + "\n" for edit in edits))
+            tmp.flush()
+            os.fsync(tmp.fileno())
+        Path(tmp.name).replace(self.path)
+
+    def clear(self) -> None:
+        self.path.unlink(missing_ok=True)
+
+
+class _StagedFile:
+    """Pending state of one people file: the file as read plus the edits applied since."""
+
+    def __init__(self, path: Path, raw: bytes, data: dict[str, Any], body: str):
+        self.path = path
+        self.base_text = raw.decode("utf-8")
+        self.base_version = content_version(raw)
+        self.data = data
+        self.body = body
+        self.original_allocations = data.get("allocations")
+        self.text = self.base_text
+        self.version = self.base_version
+        self.edits: list[dict[str, Any]] = []
+        self.first_staged = time.monotonic()
+        self.deadline = self.first_staged
+
+    def copy(self) -> _StagedFile:
+        staged = copy.copy(self)
+        # ``_replace_week_allocations`` rebinds ``allocations`` and never
+        # mutates entries, so a shallow copy keeps the original untouched.
+        staged.data = dict(self.data)
+        staged.edits = list(self.edits)
+        return staged
+
+    def rebase(self, written: _StagedFile) -> None:
+        """Continue from ``written`` (a copy this was staged on) now that it is on disk."""
+        self.base_text = written.text
+        self.base_version = written.version
+        self.original_allocations = written.data.get("allocations")
+        self.edits = self.edits[len(written.edits):]
+
+
+def _replace_file(path: Path, text: str) -> None:
+    with NamedTemporaryFile("w", encoding="utf-8", dir=path.parent, delete=False) as tmp:
+        tmp.write(text)
+    Path(tmp.name).replace(path)
+
+
+class WriteBehindQueue:
+    """Acknowledge week edits from memory and write each people file once per burst.
+
+    ``on_change`` is called with the people files whose pending state
+    changed, so a model can serve staged edits before they reach disk.
+    Calls are made in order, one at a time, without the queue lock held. Call ``replay`` once before staging anything and
+    ``close`` on shutdown to write what is still pending.
+    """
+
+    def __init__(
+        self,
+        planning_dir: str | Path,
+        journal_path: str | Path,
+        delay: float = 0.5,
+        max_delay: float | None = None,
+        on_change: Callable[[StagedChanges], None] | None = None,
+    ):
+        self.planning_dir = Path(planning_dir)
+        self.journal = EditJournal(journal_path)
+        self.delay = delay
+        self.max_delay = max_delay if max_delay is not None else 10 * delay
+        self.flushes = 0
+        self.lock = threading.RLock()
+        self._wakeup = threading.Condition(self.lock)
+        self._on_change = on_change
+        self._staged: dict[str, _StagedFile] = {}
+        # Files taken by the running flush; edits staged meanwhile build on them.
+        self._writing: dict[str, _StagedFile] = {}
+        self._flush_lock = threading.Lock()
+        self._notify_lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._closed = False
+
+    def replay(self) -> int:
+        """Write edits journaled by a previous run to their files; return how many there were."""
+        with self.lock:
+            edits = self.journal.read()
+            by_alias: dict[Any, list[dict[str, Any]]] = {}
+            for edit in edits:
+                by_alias.setdefault(edit.get("alias"), []).append(edit)
+            for alias, group in by_alias.items():
+                try:
+                    bulk_update_week_allocations(self.planning_dir, group)
+                except (OSError, ValueError) as exc:
+                    print(f"Dropping journaled edits for '{alias}': {exc}", file=sys.stderr)
+            self.journal.clear()
+            return len(edits)
+
+    def pending(self) -> list[str]:
+        """Aliases with edits that have not been written yet."""
+        with self.lock:
+            return list(self._staged)
+
+    def stage(
+        self,
+        alias: str,
+        week: str,
+        allocations: list[dict[str, Any]],
+        expected_version: str | None = None,
+    ) -> dict[str, Any]:
+        """Stage one week edit; same contract as ``update_week_allocations``."""
+        normalized_week, normalized_entries = _normalize_week_edit(alias, week, allocations)
+        _people_file_for(self.planning_dir, alias)
+        return self._stage([(alias, normalized_week, normalized_entries, expected_version)], False)[0]
+
+    def stage_bulk(self, edits: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Stage many edits all-or-nothing; same contract as ``bulk_update_week_allocations``."""
+        if not isinstance(edits, list) or not edits:
+            raise ValueError("edits must be a non-empty list")
+        normalized = []
+        for index, edit in enumerate(edits):
+            if not isinstance(edit, dict):
+                raise ValueError(f"edit {index}: each edit must be an object")
+            alias = edit.get("alias")
+            try:
+                normalized_week, normalized_entries = _normalize_week_edit(
+                    alias, edit.get("week"), edit.get("allocations")
+                )
+                _people_file_for(self.planning_dir, alias)
+            except FileNotFoundError as exc:
+                raise FileNotFoundError(f"edit {index}: {exc}") from exc
+            except ValueError as exc:
+                raise ValueError(f"edit {index}: {exc}") from exc
+            normalized.append((alias, normalized_week, normalized_entries, edit.get("version")))
+        return self._stage(normalized, True)
+
+    def _stage(
+        self,
+        normalized: list[tuple[str, str, list[dict[str, Any]], str | None]],
+        numbered: bool,
+    ) -> list[dict[str, Any]]:
+        with self.lock:
+            if self._closed:
+                raise RuntimeError("write-behind queue is closed")
+            current_files: dict[str, _StagedFile] = {}
+            updated: dict[str, _StagedFile] = {}
+            for index, (alias, normalized_week, normalized_entries, expected_version) in enumerate(normalized):
+                try:
+                    current = (
+                        current_files.get(alias)
+                        or self._staged.get(alias)
+                        or self._writing.get(alias)
+                        or self._load(alias)
+                    )
+                    current_files[alias] = current
+                    if expected_version is not None and expected_version != current.version:
+                        raise VersionConflictError(
+                            f"{current.path.name} was changed by someone else "
+                            f"(version {current.version}, expected {expected_version})",
+                            current.version,
+                        )
+                    staged = updated.get(alias) or current.copy()
+                    _replace_week_allocations(staged.data, normalized_week, normalized_entries)
+                except VersionConflictError as exc:
+                    if numbered:
+                        raise VersionConflictError(f"edit {index}: {exc}", exc.current_version) from exc
+                    raise
+                except ValueError as exc:
+                    if numbered:
+                        raise ValueError(f"edit {index}: {exc}") from exc
+                    raise
+                staged.edits.append({"alias": alias, "week": normalized_week, "allocations": normalized_entries})
+                updated[alias] = staged
+
+            now = time.monotonic()
+            for staged in updated.values():
+                staged.text = _render_frontmatter(staged.base_text, staged.data, staged.body, staged.original_allocations)
+                staged.version = content_version(staged.text.encode("utf-8"))
+                staged.deadline = min(now + self.delay, staged.first_staged + self.max_delay)
+
+            # Journal before acknowledging; nothing is staged if this fails.
+            self.journal.append(
+                [{"alias": alias, "week": week, "allocations": entries} for alias, week, entries, _v in normalized]
+            )
+            self._staged.update(updated)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="write-behind", daemon=True)
+                self._thread.start()
+            self._wakeup.notify()
+            self._notify_lock.acquire()
+        self._notify({staged.path: (_people_record(staged.data, staged.version), staged.version) for staged in updated.values()})
+
+        return [
+            _week_edit_result(alias, week, entries, updated[alias].version)
+            for alias, week, entries, _version in normalized
+        ]
+
+    def _load(self, alias: str) -> _StagedFile:
+        path = _people_file_for(self.planning_dir, alias)
+        with file_lock(path):
+            raw = path.read_bytes()
+            data, body = _read_people_frontmatter(path, alias)
+        return _StagedFile(path, raw, data, body)
+
+    def flush(self, aliases: Iterable[str] | None = None) -> None:
+        """Write pending edits now, for ``aliases`` or for everyone."""
+        with self._flush_lock:
+            with self.lock:
+                names = list(self._staged) if aliases is None else [alias for alias in aliases if alias in self._staged]
+                self._writing = {alias: self._staged.pop(alias) for alias in names}
+            try:
+                for alias, staged in list(self._writing.items()):
+                    written = self._write(staged)
+                    with self.lock:
+                        del self._writing[alias]
+                        self.flushes += 1
+                        pending = self._staged.get(alias)
+                        if pending is not None and written and pending.base_version == staged.base_version:
+                            pending.rebase(staged)
+                        self._notify_lock.acquire()
+                    # Edits staged during the write keep the file pinned.
+                    self._notify({} if pending is not None else {staged.path: None})
+            finally:
+                with self.lock:
+                    for alias, staged in self._writing.items():
+                        staged.deadline = time.monotonic() + self.delay
+                        self._staged.setdefault(alias, staged)
+                    self._writing = {}
+                    self.journal.rewrite([edit for staged in self._staged.values() for edit in staged.edits])
+
+    def _write(self, staged: _StagedFile) -> bool:
+        """Write ``staged`` to its file; return False if it had to be merged into a changed file."""
+        with file_lock(staged.path):
+            written = file_version(staged.path) == staged.base_version
+            if written:
+                _replace_file(staged.path, staged.text)
+        if not written:
+            # Changed on disk meanwhile: apply the edits to what is there now.
+            print(f"{staged.path.name} changed on disk with edits pending; re-applying them", file=sys.stderr)
+            try:
+                bulk_update_week_allocations(self.planning_dir, staged.edits)
+            except (FileNotFoundError, ValueError) as exc:
+                print(f"Dropping pending edits for {staged.path.name}: {exc}", file=sys.stderr)
+        return written
+
+    def _notify(self, changes: StagedChanges) -> None:
+        """Deliver ``changes``; the caller acquired ``_notify_lock`` under the queue lock."""
+        try:
+            if changes and self._on_change is not None:
+                self._on_change(changes)
+        finally:
+            self._notify_lock.release()
+
+    def _run(self) -> None:
+        while True:
+            with self.lock:
+                if self._closed:
+                    return
+                now = time.monotonic()
+                due = [alias for alias, staged in self._staged.items() if staged.deadline <= now]
+                if not due:
+                    deadline = min((staged.deadline for staged in self._staged.values()), default=None)
+                    self._wakeup.wait(None if deadline is None else deadline - now)
+                    continue
+            try:
+                self.flush(due)
+            except Exception as exc:
+                print(f"Write-behind flush failed, retrying: {exc}", file=sys.stderr)
+
+    def close(self) -> None:
+        """Stop the flusher thread and write everything still pending."""
+        with self.lock:
+            self._closed = True
+            self._wakeup.notify()
+            thread = self._thread
+        if thread is not None:
+            thread.join()
+        self.flush()
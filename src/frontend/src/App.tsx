@@ -7,8 +7,8 @@ import {
   Link,
   useLocation,
 } from "react-router-dom";
-import { useQuery } from "@tanstack/react-query";
-import { fetchDashboardData } from "@/api/dashboard";
+import { useQuery, useQueryClient } from "@tanstack/react-query";
+import { fetchDashboardData, subscribeToChanges } from "@/api/dashboard";
 import { useSettingsStore } from "@/store/settings.store";
 import { GanttPage } from "@/modules/planning/GanttPage";
 import { UtilizationPage } from "@/modules/planning/UtilizationPage";
@@ -41,6 +41,13 @@ function AppLayout({ children }: { children: ReactNode }) {
     queryFn: () => fetchDashboardData(includePii),
   });
 
+  // Pick up edits by other planners (and on disk) without polling.
+  const queryClient = useQueryClient();
+  useEffect(
+    () => subscribeToChanges(() => queryClient.invalidateQueries({ queryKey: ["dashboard"] })),
+    [queryClient]
+  );
+
   // Close sidebar on navigation (mobile)
   useEffect(() => {
     setSidebarOpen(false);
@@ -17,6 +17,7 @@ export interface ProjectContext {
   activities?: Array<{ id: string; label: string; start_date: string; end_date: string }>;
   summary?: string | null;
   source_file?: string | null;
+  version?: string | null; // content hash of the project file, for If-Match
 }
 
 export interface ProjectSlot {
@@ -41,6 +42,7 @@ export interface DashboardUser {
   real_name: string | null;
   display_name: string;
   role: string;
+  version?: string | null; // content hash of the people file, for If-Match
   weekly_stats: WeeklyStats[];
 }
 
@@ -48,6 +50,9 @@ export interface DashboardMetrics {
   users_count: number;
   average_utilization: number;
   overbooked_slots: number;
+  committed_hours?: number;
+  tentative_hours?: number;
+  project_planned_hours?: Record<string, number>;
 }
 
 export interface RawAllocation {
@@ -68,21 +73,208 @@ export interface DashboardData {
   raw_allocations: RawAllocation[];
 }
 
+/** Slot in the normalized (v2) payload: `project` keys into `projects`. */
+export type ProjectSlotRef = Omit<ProjectSlot, "context">;
+
+export interface WeeklyStatsV2 extends Omit<WeeklyStats, "projects"> {
+  projects: ProjectSlotRef[];
+}
+
+export interface DashboardUserV2 extends Omit<DashboardUser, "weekly_stats"> {
+  weekly_stats: WeeklyStatsV2[];
+}
+
+/** Normalized payload served by `/api/dashboard-data?format=v2`. */
+export interface DashboardDataV2
+  extends Omit<DashboardData, "users" | "raw_allocations"> {
+  payload_version: 2;
+  data_version: number;
+  users: DashboardUserV2[];
+  raw_allocations?: RawAllocation[]; // only with include_raw=1
+}
+
+/** `/api/dashboard-data?format=v2&since=<data_version>`: what changed since then. */
+export type DashboardDelta =
+  | { payload_version: 2; data_version: number; since: number; full_reload: true }
+  | (Pick<DashboardDataV2, "payload_version" | "data_version" | "weeks" | "users" | "projects" | "metrics"> & {
+      since: number;
+      full_reload?: undefined;
+      removed_aliases: string[];
+      removed_projects: string[];
+    });
+
+/**
+ * Apply a delta to the payload it was requested for. Changed rows carry
+ * only the stats of changed weeks, so stats are merged by week and every
+ * row is then cut down to the delta's `weeks`.
+ */
+export function mergeDashboardDelta(
+  base: DashboardDataV2,
+  delta: Exclude<DashboardDelta, { full_reload: true }>
+): DashboardDataV2 {
+  const users = new Map(base.users.map((user) => [user.alias, user]));
+  for (const alias of delta.removed_aliases) users.delete(alias);
+  for (const user of delta.users) {
+    const stats = new Map((users.get(user.alias)?.weekly_stats ?? []).map((s) => [s.week, s]));
+    for (const s of user.weekly_stats) stats.set(s.week, s);
+    users.set(user.alias, { ...user, weekly_stats: [...stats.values()] });
+  }
+  const merged = [...users.values()]
+    .sort((a, b) => (a.alias < b.alias ? -1 : a.alias > b.alias ? 1 : 0))
+    .map((user) => {
+      const stats = new Map(user.weekly_stats.map((s) => [s.week, s]));
+      return {
+        ...user,
+        weekly_stats: delta.weeks.flatMap((week) => stats.get(week) ?? []),
+      };
+    });
+
+  const projects = new Map((base.projects ?? []).map((project) => [project.name, project]));
+  for (const name of delta.removed_projects) projects.delete(name);
+  for (const project of delta.projects ?? []) projects.set(project.name, project);
+
+  return {
+    ...base,
+    data_version: delta.data_version,
+    weeks: delta.weeks,
+    users: merged,
+    projects: [...projects.values()].sort((a, b) => (a.name < b.name ? -1 : a.name > b.name ? 1 : 0)),
+    metrics: delta.metrics,
+  };
+}
+
+/** Server-side slice of the dashboard; omitted fields are unrestricted. */
+export interface DashboardFilters {
+  fromWeek?: string; // YYYY-Www, inclusive
+  toWeek?: string; // YYYY-Www, inclusive
+  aliases?: string[];
+  projects?: string[];
+}
+
+/**
+ * Expand a v2 payload into the v1 shape the pages consume: every slot gets
+ * the (shared) context object of its project, `raw_allocations` is
+ * rebuilt from the slots and, when `names` is given, real names from
+ * `/api/identities` are filled in. v1 payloads are returned unchanged.
+ */
+export function hydrateDashboardData(
+  data: DashboardData | DashboardDataV2,
+  names: Record<string, string> = {}
+): DashboardData {
+  if (!("payload_version" in data)) return data;
+
+  const contexts = new Map<string, ProjectContext>();
+  for (const project of data.projects ?? []) {
+    const { name, ...ctx } = project;
+    contexts.set(name, ctx);
+  }
+  const empty: ProjectContext = {};
+  const rawAllocations: RawAllocation[] = [];
+  const users: DashboardUser[] = data.users.map((user) => ({
+    ...user,
+    real_name: names[user.alias] ?? null,
+    display_name: names[user.alias] ?? user.alias,
+    weekly_stats: user.weekly_stats.map((stats) => ({
+      ...stats,
+      projects: stats.projects.map((slot) => {
+        rawAllocations.push({ alias: user.alias, week: stats.week, ...slot });
+        return { ...slot, context: contexts.get(slot.project) ?? empty };
+      }),
+    })),
+  }));
+
+  const { payload_version: _version, ...rest } = data;
+  return { ...rest, users, raw_allocations: data.raw_allocations ?? rawAllocations };
+}
+
 // ── Fetchers ──────────────────────────────────────────────────────────────────
 
 export async function fetchDashboardData(
-  includePii: boolean
+  includePii: boolean,
+  filters: DashboardFilters = {}
 ): Promise<DashboardData> {
-  const res = await fetch(
-    `/api/dashboard-data?include_pii=${includePii ? "1" : "0"}`
-  );
+  const params = new URLSearchParams({ format: "v2" });
+  if (filters.fromWeek) params.set("from_week", filters.fromWeek);
+  if (filters.toWeek) params.set("to_week", filters.toWeek);
+  if (filters.aliases) params.set("aliases", filters.aliases.join(","));
+  if (filters.projects) params.set("projects", filters.projects.join(","));
+  const unfiltered = !filters.fromWeek && !filters.toWeek && !filters.aliases && !filters.projects;
+  // The planning payload is alias-only; names come from a separate, small
+  // endpoint so both privacy modes share the same cached payload.
+  const [payload, names] = await Promise.all([
+    unfiltered ? fetchLatestPayload() : fetchPayload(`/api/dashboard-data?${params}`),
+    includePii ? fetchIdentities() : Promise.resolve({}),
+  ]);
+  return hydrateDashboardData(payload, names);
+}
+
+// The last unfiltered payload; refetches only download what changed since.
+let latestPayload: DashboardDataV2 | null = null;
+
+async function fetchLatestPayload(): Promise<DashboardDataV2> {
+  const base = latestPayload;
+  if (base !== null) {
+    const delta = await fetchPayload<DashboardDelta>(
+      `/api/dashboard-data?format=v2&since=${base.data_version}`
+    );
+    if (!delta.full_reload) {
+      const merged = mergeDashboardDelta(base, delta);
+      if (latestPayload === base) latestPayload = merged;
+      return merged;
+    }
+  }
+  const payload = await fetchPayload<DashboardDataV2>("/api/dashboard-data?format=v2");
+  latestPayload = payload;
+  return payload;
+}
+
+async function fetchPayload<T = DashboardDataV2>(url: string): Promise<T> {
+  const res = await fetch(url);
+  if (!res.ok) {
+    const body = await res.json().catch(() => ({ error: res.statusText }));
+    throw new Error(
+      (body as { error?: string }).error ?? `HTTP ${res.status}`
+    );
+  }
+  return (await res.json()) as T;
+}
+
+/** Alias → real name for everyone with an identity file. */
+export async function fetchIdentities(): Promise<Record<string, string>> {
+  const res = await fetch("/api/identities");
   if (!res.ok) {
     const body = await res.json().catch(() => ({ error: res.statusText }));
     throw new Error(
       (body as { error?: string }).error ?? `HTTP ${res.status}`
     );
   }
-  return res.json() as Promise<DashboardData>;
+  const data = (await res.json()) as { identities: Record<string, string> };
+  return data.identities;
+}
+
+/** One `/api/events` change notification. */
+export interface DataChange {
+  version: string;
+  aliases?: string[];
+  weeks?: string[];
+  projects?: string[];
+  /** Real names changed; refetch `/api/identities`. */
+  names?: boolean;
+  /** Too many changes were missed; refetch everything. */
+  resync?: boolean;
+}
+
+/**
+ * Listen to the server's change feed. `onChange` gets every change made
+ * through the API or on disk, including the caller's own saves. Returns a
+ * function that closes the stream.
+ */
+export function subscribeToChanges(onChange: (change: DataChange) => void): () => void {
+  const source = new EventSource("/api/events");
+  source.addEventListener("change", (event) => {
+    onChange(JSON.parse((event as MessageEvent<string>).data) as DataChange);
+  });
+  return () => source.close();
 }
 
 export interface UpdateAllocationPayload {
@@ -105,9 +297,20 @@ export interface UpdateAllocationResult {
     total_load: number;
     total_planned_hours?: number;
     capacity_hours?: number;
+    version?: string | null;
   };
 }
 
+/** Many week edits applied together: all of them are written, or none. */
+export interface BulkUpdateAllocationPayload {
+  edits: Array<UpdateAllocationPayload & { version?: string | null }>;
+}
+
+export interface BulkUpdateAllocationResult {
+  ok: boolean;
+  updated: UpdateAllocationResult["updated"][]; // one per edit, in order
+}
+
 export interface UpdateProjectPayload {
   project: string;
   updates: {
@@ -124,41 +327,79 @@ export interface UpdateProjectResult {
   updated: {
     project: string;
     file: string;
+    version?: string | null;
   };
 }
 
-export async function updateAllocation(
-  payload: UpdateAllocationPayload
-): Promise<UpdateAllocationResult> {
-  const res = await fetch("/api/allocation/update", {
+/** The file was changed by someone else; `version` is its current token. */
+export class VersionConflictError extends Error {
+  constructor(message: string, readonly version: string | null) {
+    super(message);
+    this.name = "VersionConflictError";
+  }
+}
+
+async function postJson(
+  url: string,
+  payload: unknown,
+  version?: string | null
+): Promise<unknown> {
+  const headers: Record<string, string> = { "Content-Type": "application/json" };
+  if (version) headers["If-Match"] = `"${version}"`;
+  const res = await fetch(url, {
     method: "POST",
-    headers: { "Content-Type": "application/json" },
+    headers,
     body: JSON.stringify(payload),
   });
   const data = await res.json().catch(() => ({ error: "Invalid response" }));
+  if (res.status === 409) {
+    const conflict = data as { error?: string; version?: string | null };
+    throw new VersionConflictError(
+      conflict.error ?? "Conflict",
+      conflict.version ?? null
+    );
+  }
   if (!res.ok) {
     throw new Error(
       (data as { error?: string }).error ?? `HTTP ${res.status}`
     );
   }
-  return data as UpdateAllocationResult;
+  return data;
+}
+
+/**
+ * Pass the user's `version` to refuse the write (with a
+ * `VersionConflictError`) if the people file changed since it was loaded.
+ */
+export async function updateAllocation(
+  payload: UpdateAllocationPayload,
+  version?: string | null
+): Promise<UpdateAllocationResult> {
+  return (await postJson(
+    "/api/allocation/update",
+    payload,
+    version
+  )) as UpdateAllocationResult;
+}
+
+export async function bulkUpdateAllocations(
+  payload: BulkUpdateAllocationPayload
+): Promise<BulkUpdateAllocationResult> {
+  return (await postJson(
+    "/api/allocation/bulk-update",
+    payload
+  )) as BulkUpdateAllocationResult;
 }
 
 export async function updateProject(
-  payload: UpdateProjectPayload
+  payload: UpdateProjectPayload,
+  version?: string | null
 ): Promise<UpdateProjectResult> {
-  const res = await fetch("/api/project/update", {
-    method: "POST",
-    headers: { "Content-Type": "application/json" },
-    body: JSON.stringify(payload),
-  });
-  const data = await res.json().catch(() => ({ error: "Invalid response" }));
-  if (!res.ok) {
-    throw new Error(
-      (data as { error?: string }).error ?? `HTTP ${res.status}`
-    );
-  }
-  return data as UpdateProjectResult;
+  return (await postJson(
+    "/api/project/update",
+    payload,
+    version
+  )) as UpdateProjectResult;
 }
 
 // ── Derived helpers ───────────────────────────────────────────────────────────
@@ -12,6 +12,7 @@ import {
   DashboardUser,
   WeeklyStats,
   updateAllocation,
+  VersionConflictError,
   extractProjects,
   DashboardData,
 } from "@/api/dashboard";
@@ -127,14 +128,22 @@ export function EditWeekDialog({
 
     setSaving(true);
     try {
-      await updateAllocation({
-        alias: user.alias,
-        week: slot.week,
-        allocations,
-      });
+      await updateAllocation(
+        {
+          alias: user.alias,
+          week: slot.week,
+          allocations,
+        },
+        user.version
+      );
       qc.invalidateQueries({ queryKey: ["dashboard"] });
       onOpenChange(false);
     } catch (err) {
+      if (err instanceof VersionConflictError) {
+        qc.invalidateQueries({ queryKey: ["dashboard"] });
+        setError("Someone else changed this plan meanwhile. Reload and try again.");
+        return;
+      }
       setError(err instanceof Error ? err.message : "Failed to save");
     } finally {
       setSaving(false);
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""Rewrite people files so runs of consecutive weeks use the range syntax.
+
+``weeks: ["2026-W04", "2026-W05", ..., "2026-W26"]`` becomes
+``weeks: ["2026-W04..2026-W26"]``. Files whose ``weeks`` lists are already
+compact are left untouched; invalid items are kept as they are so the
+validator still reports them.
+"""
+
+from __future__ import annotations
+
+import argparse
+import copy
+import sys
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from typing import Any
+
+from pussla_frontmatter import read_frontmatter
+from pussla_weeks import compact_weeks, weeks_in
+from pussla_writer import patch_frontmatter
+
+
+def compact_allocations(frontmatter: dict[str, Any]) -> bool:
+    """Compact every ``allocations[].weeks`` list; return True if any changed.
+
+    Changed entries are replaced with new dicts so ``patch_frontmatter`` can
+    tell them apart from the untouched ones.
+    """
+    changed = False
+    allocations = frontmatter.get("allocations") or []
+    for idx, entry in enumerate(allocations):
+        if not isinstance(entry, dict) or not isinstance(entry.get("weeks"), list):
+            continue
+        weeks = []
+        invalid = []
+        for item in entry["weeks"]:
+            named = weeks_in(item)
+            if named is None:
+                invalid.append(item)
+            else:
+                weeks.extend(named)
+        compacted = [*compact_weeks(weeks), *invalid]
+        if compacted != entry["weeks"]:
+            allocations[idx] = {**entry, "weeks": compacted}
+            changed = True
+    return changed
+
+
+def migrate_file(path: Path, write: bool = True) -> bool:
+    """Compact one people file; return True if it needed (and, with ``write``, got) a rewrite."""
+    data, _ = read_frontmatter(path)
+    data = copy.deepcopy(data)
+    original = list(data.get("allocations") or [])
+    if not compact_allocations(data):
+        return False
+    if write:
+        rendered = patch_frontmatter(path.read_text(encoding="utf-8"), data, original)
+        with NamedTemporaryFile("w", encoding="utf-8", dir=path.parent, delete=False) as tmp:
+            tmp.write(rendered)
+            temp_path = Path(tmp.name)
+        temp_path.replace(path)
+    return True
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compact weeks lists in Pussla people files into ranges")
+    parser.add_argument("--planning-dir", default="tst-data/planning", help="Path containing people/")
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Only list files that would change; exit 1 if there are any.",
+    )
+    args = parser.parse_args()
+
+    people_dir = Path(args.planning_dir) / "people"
+    if not people_dir.exists():
+        print(f"ERROR: missing directory: {people_dir}")
+        return 1
+
+    changed = []
+    for path in sorted(people_dir.glob("*.md")):
+        try:
+            if migrate_file(path, write=not args.check):
+                changed.append(path)
+        except Exception as exc:
+            print(f"ERROR: {path}: {exc}")
+            return 1
+
+    for path in changed:
+        print(f"{'would compact' if args.check else 'compacted'}: {path}")
+    print(f"{len(changed)} file(s) {'need compaction' if args.check else 'rewritten'}.")
+    return 1 if args.check and changed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
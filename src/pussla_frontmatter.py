@@ -0,0 +1,323 @@
+"""Shared, stat-validated parse cache for Pussla markdown frontmatter files.
+
+The engine, the validator and the aggregation script all read the same
+``---``-delimited YAML frontmatter files. Parsing goes through one
+process-wide LRU cache keyed by the file path and validated against the
+file's ``(mtime_ns, size, inode)`` stat signature, so an unchanged file is
+parsed once per process no matter how many callers ask for it.
+
+Reads stop at the closing ``---`` delimiter and the YAML is loaded with
+libyaml's ``CSafeLoader`` when PyYAML was built with it. The markdown body
+is only read when a caller asks for it (``read_frontmatter``,
+``read_summary``).
+
+Values derived from a whole file, such as the body summary or a content
+hash, can be cached next to the frontmatter with ``ParseCache.derived``.
+They are keyed by the same stat signature, so they are computed once per
+file version instead of on every load.
+
+``prefetch_frontmatter`` can fan the parsing of many files out to a process
+pool; results are stored in the cache in path order, so later reads are
+identical to a serial run.
+
+Cached frontmatter objects are shared between callers: treat them as
+read-only and ``copy.deepcopy`` before mutating.
+"""
+
+from __future__ import annotations
+
+import io
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Callable
+
+import yaml
+
+try:
+    _YAML_LOADER = yaml.CSafeLoader
+except AttributeError:  # PyYAML built without libyaml
+    _YAML_LOADER = yaml.SafeLoader
+
+DEFAULT_MAX_ENTRIES = 8192
+_DELIMITERS = (b"---\n", b"---\r\n")
+
+Signature = tuple[int, int, int]
+# Cache entry: (signature, parse result or None if not parsed yet, derived values).
+Entry = tuple[Signature, Any, dict[str, Any]]
+
+
+class FrontmatterError(ValueError):
+    """Raised when a file has no usable YAML frontmatter block.
+
+    ``body_offset`` is the byte offset of what tolerant callers treat as the
+    markdown body: 0 (the whole file) when a delimiter is missing, otherwise
+    the position right after the closing delimiter.
+    """
+
+    def __init__(self, message: str, body_offset: int = 0):
+        super().__init__(message)
+        self.body_offset = body_offset
+
+    def __reduce__(self):
+        return type(self), (str(self), self.body_offset)
+
+
+def _stat_signature(st: os.stat_result) -> Signature:
+    return st.st_mtime_ns, st.st_size, st.st_ino
+
+
+def _parse_head(handle: io.BufferedReader) -> tuple[dict[str, Any], int]:
+    """Parse the frontmatter block, reading no further than its end delimiter."""
+    if handle.readline() not in _DELIMITERS:
+        raise FrontmatterError("missing YAML frontmatter start delimiter '---'")
+    lines: list[bytes] = []
+    for line in iter(handle.readline, b""):
+        if line in _DELIMITERS:
+            break
+        lines.append(line)
+    else:
+        raise FrontmatterError("missing YAML frontmatter end delimiter '---'")
+    body_offset = handle.tell()
+    text = b"".join(lines).decode("utf-8").replace("\r\n", "\n")
+    data = yaml.load(text, Loader=_YAML_LOADER) or {}
+    if not isinstance(data, dict):
+        raise FrontmatterError("frontmatter must parse to a YAML object", body_offset)
+    return data, body_offset
+
+
+def _parse_path(key: str) -> tuple[Signature, Any] | None:
+    """Process-pool worker: parse one file and return ``(signature, result)``."""
+    try:
+        with open(key, "rb") as handle:
+            signature = _stat_signature(os.fstat(handle.fileno()))
+            try:
+                result: Any = _parse_head(handle)
+            except (FrontmatterError, yaml.YAMLError) as exc:
+                result = exc
+    except (OSError, UnicodeDecodeError):
+        return None
+    return signature, result
+
+
+def _open_body(handle: io.BufferedReader, offset: int) -> io.TextIOWrapper:
+    handle.seek(offset)
+    return io.TextIOWrapper(handle, encoding="utf-8")
+
+
+class ParseCache:
+    """LRU cache of parsed frontmatter, invalidated by file stat signature."""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, Entry] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # Derived values computed (as opposed to served from the cache).
+        self.computed = 0
+
+    def _cached(self, key: str, signature: Signature) -> Any:
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None and cached[0] == signature and cached[1] is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return cached[1]
+            self.misses += 1
+            return None
+
+    def _store(self, key: str, signature: Signature, result: Any, derived: dict[str, Any] | None = None) -> None:
+        with self._lock:
+            cached = self._entries.get(key)
+            if derived is None:
+                # Values derived from this same file version stay valid.
+                derived = cached[2] if cached is not None and cached[0] == signature else {}
+            self._entries[key] = (signature, result, derived)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    @staticmethod
+    def _unwrap(result: Any) -> tuple[dict[str, Any], int]:
+        if isinstance(result, Exception):
+            raise result.with_traceback(None)
+        return result
+
+    def _lookup(self, key: str, handle: io.BufferedReader) -> tuple[dict[str, Any], int]:
+        signature = _stat_signature(os.fstat(handle.fileno()))
+        result = self._cached(key, signature)
+        if result is None:
+            try:
+                result = _parse_head(handle)
+            except (FrontmatterError, yaml.YAMLError) as exc:
+                result = exc
+            self._store(key, signature, result)
+        return self._unwrap(result)
+
+    def load(self, path: str | Path) -> tuple[dict[str, Any], int]:
+        """Return ``(frontmatter, body_offset)`` for ``path``, parsing only on a miss.
+
+        Raises ``FrontmatterError`` for missing delimiters or a non-object
+        frontmatter, ``yaml.YAMLError`` for invalid YAML and ``OSError`` when
+        the file cannot be read. Failures are cached like successes.
+        """
+        key = os.path.abspath(path)
+        with open(key, "rb") as handle:
+            return self._lookup(key, handle)
+
+    def read(self, path: str | Path) -> tuple[dict[str, Any], str]:
+        """Like ``load`` but also read the markdown body."""
+        key = os.path.abspath(path)
+        with open(key, "rb") as handle:
+            data, offset = self._lookup(key, handle)
+            with _open_body(handle, offset) as body:
+                return data, body.read()
+
+    def derived(self, path: str | Path, name: str, compute: Callable[[io.BufferedReader], Any]) -> Any:
+        """Return ``compute(handle)`` for ``path``, cached under ``name`` until the file changes.
+
+        ``compute`` gets the file opened in binary mode at position 0.
+        Derived values are kept with the frontmatter entry and in snapshots.
+        """
+        key = os.path.abspath(path)
+        with open(key, "rb") as handle:
+            signature = _stat_signature(os.fstat(handle.fileno()))
+            with self._lock:
+                cached = self._entries.get(key)
+                if cached is not None and cached[0] == signature and name in cached[2]:
+                    return cached[2][name]
+            value = compute(handle)
+        with self._lock:
+            self.computed += 1
+            cached = self._entries.get(key)
+            if cached is None or cached[0] != signature:
+                cached = (signature, None, {})
+            cached[2][name] = value
+            self._entries[key] = cached
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def summary(self, path: str | Path) -> str:
+        """Return the first non-blank body line, reading only as far as needed."""
+        key = os.path.abspath(path)
+
+        def first_line(handle: io.BufferedReader) -> str:
+            try:
+                _data, offset = self._lookup(key, handle)
+            except FrontmatterError as exc:
+                offset = exc.body_offset
+            with _open_body(handle, offset) as body:
+                for raw_line in body:
+                    for line in raw_line.splitlines():
+                        if line.strip():
+                            return line.strip()
+            return ""
+
+        return self.derived(key, "summary", first_line)
+
+    def prefetch(self, paths: list[str | Path], jobs: int = 1) -> int:
+        """Parse every uncached file in ``paths`` with up to ``jobs`` processes.
+
+        Does nothing when ``jobs`` is 1 or there are no more misses than
+        workers; callers then parse lazily as usual. Returns the number of
+        files parsed.
+        """
+        if jobs <= 1:
+            return 0
+        keys: list[str] = []
+        with self._lock:
+            for path in sorted(os.path.abspath(p) for p in paths):
+                try:
+                    signature = _stat_signature(os.stat(path))
+                except OSError:
+                    continue
+                cached = self._entries.get(path)
+                if cached is None or cached[0] != signature or cached[1] is None:
+                    keys.append(path)
+        if len(keys) <= jobs:
+            return 0
+
+        chunksize = max(1, len(keys) // (jobs * 4))
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=jobs, mp_context=context) as pool:
+            results = list(pool.map(_parse_path, keys, chunksize=chunksize))
+
+        parsed = 0
+        for key, outcome in zip(keys, results):
+            if outcome is None:
+                continue
+            with self._lock:
+                self.misses += 1
+            self._store(key, outcome[0], outcome[1])
+            parsed += 1
+        return parsed
+
+    def export_entries(self, keys: list[str]) -> dict[str, Entry]:
+        """Return ``(signature, result, derived)`` for each of ``keys`` that is cached."""
+        with self._lock:
+            return {
+                key: (entry[0], entry[1], dict(entry[2]))
+                for key in keys
+                if (entry := self._entries.get(key)) is not None
+            }
+
+    def seed(self, key: str, signature: Signature, result: Any, derived: dict[str, Any] | None = None) -> None:
+        """Insert a result parsed elsewhere (e.g. restored from a snapshot)."""
+        self._store(os.path.abspath(key), signature, result, dict(derived or {}))
+
+    def invalidate(self, path: str | Path) -> None:
+        with self._lock:
+            self._entries.pop(os.path.abspath(path), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = self.computed = 0
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "computed": self.computed,
+            }
+
+
+PARSE_CACHE = ParseCache()
+
+
+def load_frontmatter(path: str | Path) -> dict[str, Any]:
+    """Parse only the frontmatter of ``path`` through the process-wide cache."""
+    return PARSE_CACHE.load(path)[0]
+
+
+def read_frontmatter(path: str | Path) -> tuple[dict[str, Any], str]:
+    """Return ``(frontmatter, body)`` for ``path`` (see ``ParseCache.load``)."""
+    return PARSE_CACHE.read(path)
+
+
+def read_body(path: str | Path, offset: int = 0) -> str:
+    """Read the markdown text of ``path`` from byte ``offset`` onwards."""
+    with open(path, "rb") as handle, _open_body(handle, offset) as body:
+        return body.read()
+
+
+def read_summary(path: str | Path) -> str:
+    """Return the first non-blank line of the body of ``path``."""
+    return PARSE_CACHE.summary(path)
+
+
+def prefetch_frontmatter(paths: list[str | Path], jobs: int = 1) -> int:
+    """Warm the process-wide cache for ``paths`` using ``jobs`` worker processes."""
+    return PARSE_CACHE.prefetch(paths, jobs)
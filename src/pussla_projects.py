@@ -0,0 +1,141 @@
+"""Index of planning project files by name, ``project_id`` and file stem.
+
+Allocations and API calls refer to projects by name, while the files live
+under ``projects/`` with arbitrary stems. Instead of parsing every project
+file to find the one a name belongs to, ``ProjectIndex`` keeps a map from
+each of a file's keys to its path. The map is rebuilt only when the
+directory changes (its mtime moves whenever a file is added, removed or
+atomically replaced) and then only re-reads files whose stat signature
+changed, through the shared frontmatter parse cache.
+
+When keys collide, a name or stem wins over a ``project_id``, and an earlier
+file (in sorted path order) wins over a later one, which matches the
+original linear scan. ``names()`` is stricter: it holds only the key the
+dashboard uses for each project, its ``name`` or else its stem.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from pathlib import Path
+
+from pussla_frontmatter import load_frontmatter
+
+Signature = tuple[int, int, int]
+
+
+def _signature(path: Path) -> Signature | None:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size, st.st_ino
+
+
+def _file_keys(path: Path) -> tuple[list[str], list[str]]:
+    """Return ``(primary, secondary)`` keys: name and stem, then ``project_id``.
+
+    The first primary key is the dashboard's key for the project.
+    """
+    primary = [path.stem]
+    secondary: list[str] = []
+    try:
+        frontmatter = load_frontmatter(path)
+    except Exception:
+        return primary, secondary
+    name = frontmatter.get("name")
+    if isinstance(name, str) and name.strip():
+        primary.insert(0, name)
+    project_id = frontmatter.get("project_id")
+    if isinstance(project_id, str) and project_id:
+        secondary.append(project_id)
+    return primary, secondary
+
+
+class ProjectIndex:
+    """Name/``project_id``/stem -> path map for one ``projects/`` directory."""
+
+    def __init__(self, projects_dir: str | Path):
+        self.projects_dir = Path(projects_dir)
+        self._lock = threading.Lock()
+        self._dir_signature: tuple[int, int] | None = None
+        self._files: dict[Path, tuple[Signature, tuple[list[str], list[str]]]] = {}
+        self._keys: dict[str, Path] = {}
+        self.rebuilds = 0
+
+    def _rescan(self) -> None:
+        current: dict[Path, Signature] = {}
+        if self.projects_dir.exists():
+            for path in self.projects_dir.glob("*.md"):
+                signature = _signature(path)
+                if signature is not None:
+                    current[path] = signature
+        files = {}
+        for path in sorted(current):
+            known = self._files.get(path)
+            if known is not None and known[0] == current[path]:
+                files[path] = known
+            else:
+                files[path] = (current[path], _file_keys(path))
+        keys: dict[str, Path] = {}
+        for path, (_sig, (primary, _secondary)) in files.items():
+            for key in primary:
+                keys.setdefault(key, path)
+        for path, (_sig, (_primary, secondary)) in files.items():
+            for key in secondary:
+                keys.setdefault(key, path)
+        self._files = files
+        self._keys = keys
+        self.rebuilds += 1
+
+    def _refresh(self) -> None:
+        try:
+            st = self.projects_dir.stat()
+            dir_signature = (st.st_mtime_ns, st.st_ino)
+        except OSError:
+            dir_signature = None
+        if dir_signature != self._dir_signature or dir_signature is None:
+            self._dir_signature = dir_signature
+            self._rescan()
+
+    def resolve(self, project: str) -> Path | None:
+        """Return the file for a project name, ``project_id`` or stem, or ``None``."""
+        with self._lock:
+            self._refresh()
+            path = self._keys.get(project)
+            if path is not None and _signature(path) == self._files[path][0]:
+                return path
+            # A miss or an in-place edit: stat every file, re-read the changed ones.
+            self._rescan()
+            return self._keys.get(project)
+
+    def paths(self) -> list[Path]:
+        """Every project file, in sorted path order."""
+        with self._lock:
+            self._refresh()
+            return list(self._files)
+
+    def names(self) -> set[str]:
+        """Every project's dashboard key: its ``name``, or its stem if it has none."""
+        with self._lock:
+            # Stat every file, so names edited in place are current.
+            self._rescan()
+            return {primary[0] for _sig, (primary, _secondary) in self._files.values()}
+
+    def __contains__(self, project: object) -> bool:
+        return isinstance(project, str) and self.resolve(project) is not None
+
+
+_INDEXES: dict[str, ProjectIndex] = {}
+_INDEXES_LOCK = threading.Lock()
+
+
+def project_index(projects_dir: str | Path) -> ProjectIndex:
+    """The process-wide ``ProjectIndex`` for ``projects_dir``."""
+    key = os.path.abspath(projects_dir)
+    with _INDEXES_LOCK:
+        index = _INDEXES.get(key)
+        if index is None:
+            index = _INDEXES[key] = ProjectIndex(key)
+        return index
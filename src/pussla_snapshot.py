@@ -0,0 +1,177 @@
+"""Persist the frontmatter parse cache between runs as a binary snapshot.
+
+A snapshot stores, for every ``*.md`` file under the planning and identity
+folders, the parsed frontmatter and the cached derived values (content
+version, body summary) together with two fingerprints: the file's
+stat signature and, for files tracked unmodified in git, their blob id. On
+the next start every file whose fingerprint still matches is seeded into
+the parse cache without touching YAML, so only changed files are
+re-parsed. The blob id lets a ``git checkout`` or ``touch`` (new mtimes
+and inodes, same content) reuse the snapshot.
+
+The summaries and content versions matter as much as the frontmatter: a
+cold start that restored only the YAML would still read and hash every
+file. Snapshots are pickles loaded in full on restore; only point
+``cache_dir`` at a directory you trust.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+import subprocess
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from typing import Any
+
+from pussla_frontmatter import PARSE_CACHE, ParseCache
+
+SNAPSHOT_MAGIC = b"PUSSLA-SNAPSHOT\x02"
+GIT_TIMEOUT_SECONDS = 5
+
+
+def _snapshot_path(cache_dir: Path, roots: list[Path]) -> Path:
+    digest = hashlib.sha1("\0".join(str(root.resolve()) for root in roots).encode("utf-8")).hexdigest()
+    return cache_dir / f"frontmatter-{digest[:16]}.snapshot"
+
+
+def _scan(roots: list[Path]) -> dict[str, tuple[int, int, int]]:
+    """Stat every ``*.md`` file below ``roots``; return absolute path -> signature."""
+    signatures: dict[str, tuple[int, int, int]] = {}
+    for root in roots:
+        for dirpath, _dirnames, filenames in os.walk(os.path.abspath(root)):
+            for name in filenames:
+                if not name.endswith(".md"):
+                    continue
+                path = os.path.join(dirpath, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                signatures[path] = (st.st_mtime_ns, st.st_size, st.st_ino)
+    return signatures
+
+
+def _git(root: Path, *args: str) -> bytes | None:
+    try:
+        completed = subprocess.run(
+            ["git", "-C", str(root), *args],
+            capture_output=True,
+            timeout=GIT_TIMEOUT_SECONDS,
+            check=False,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return completed.stdout if completed.returncode == 0 else None
+
+
+def git_blob_ids(root: Path) -> dict[str, str]:
+    """Map absolute path -> blob id for tracked files under ``root`` that are unmodified."""
+    staged = _git(root, "ls-files", "--stage", "-z", "--", ".")
+    modified = _git(root, "diff", "--name-only", "--relative", "-z", "HEAD", "--", ".")
+    if staged is None or modified is None:
+        return {}
+    dirty = {os.path.abspath(root / name.decode("utf-8")) for name in modified.split(b"\0") if name}
+    blobs: dict[str, str] = {}
+    for record in staged.split(b"\0"):
+        if not record:
+            continue
+        meta, _tab, name = record.partition(b"\t")
+        path = os.path.abspath(root / name.decode("utf-8"))
+        if path not in dirty:
+            blobs[path] = meta.split(b" ")[1].decode("ascii")
+    return blobs
+
+
+def _fingerprint(signatures: dict[str, tuple[int, int, int]]) -> str:
+    digest = hashlib.sha1()
+    for path in sorted(signatures):
+        digest.update(f"{path}\0{signatures[path]}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _blob_ids(roots: list[Path]) -> dict[str, str]:
+    blobs: dict[str, str] = {}
+    for root in roots:
+        if root.exists():
+            blobs.update(git_blob_ids(root))
+    return blobs
+
+
+def _read_snapshot(path: Path) -> dict[str, Any] | None:
+    try:
+        with open(path, "rb") as handle:
+            if handle.read(len(SNAPSHOT_MAGIC)) != SNAPSHOT_MAGIC:
+                return None
+            snapshot = pickle.load(handle)
+    except (OSError, ValueError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        return None
+    return snapshot if isinstance(snapshot, dict) else None
+
+
+def restore_snapshot(cache_dir: str | Path, roots: list[Path], cache: ParseCache = PARSE_CACHE) -> dict[str, Any]:
+    """Seed ``cache`` from the snapshot for ``roots``; return restore statistics.
+
+    A file is restored when its stat signature is unchanged, or when it is
+    an unmodified tracked git file with the same blob id as when the
+    snapshot was written (git is only consulted when some signature
+    changed). ``complete`` is True when every file was restored and the
+    snapshot needs no rewrite.
+    """
+    snapshot = _read_snapshot(_snapshot_path(Path(cache_dir), roots))
+    signatures = _scan(roots)
+    stats: dict[str, Any] = {"restored": 0, "stale": 0, "complete": False}
+    if snapshot is None:
+        return stats
+
+    entries: dict[str, tuple[tuple[int, int, int], str | None, Any, dict[str, Any]]] = snapshot.get("entries", {})
+    changed: list[str] = []
+    for path, current in signatures.items():
+        saved = entries.get(path)
+        if saved is None:
+            stats["stale"] += 1
+        elif saved[0] == current:
+            cache.seed(path, current, saved[2], saved[3])
+            stats["restored"] += 1
+        else:
+            changed.append(path)
+
+    blobs = _blob_ids(roots) if changed else {}
+    for path in changed:
+        _saved_signature, saved_blob, result, derived = entries[path]
+        if saved_blob is not None and blobs.get(path) == saved_blob:
+            cache.seed(path, signatures[path], result, derived)
+            stats["restored"] += 1
+        else:
+            stats["stale"] += 1
+    stats["complete"] = (
+        not changed
+        and stats["stale"] == 0
+        and snapshot.get("fingerprint") == _fingerprint(signatures)
+    )
+    return stats
+
+
+def save_snapshot(cache_dir: str | Path, roots: list[Path], cache: ParseCache = PARSE_CACHE) -> Path:
+    """Write the cached entries for ``roots`` to the snapshot file and return its path."""
+    target = _snapshot_path(Path(cache_dir), roots)
+    signatures = _scan(roots)
+    blobs = _blob_ids(roots)
+
+    entries: dict[str, tuple[tuple[int, int, int], str | None, Any, dict[str, Any]]] = {}
+    for path, (signature, result, derived) in cache.export_entries(sorted(signatures)).items():
+        if signatures[path] == signature:
+            entries[path] = (signature, blobs.get(path), result, derived)
+
+    target.parent.mkdir(parents=True, exist_ok=True)
+    with NamedTemporaryFile("wb", dir=target.parent, delete=False) as tmp:
+        tmp.write(SNAPSHOT_MAGIC)
+        pickle.dump(
+            {"fingerprint": _fingerprint(signatures), "entries": entries},
+            tmp,
+            protocol=pickle.HIGHEST_PROTOCOL,
+        )
+        temp_path = Path(tmp.name)
+    temp_path.replace(target)
+    return target
@@ -0,0 +1,179 @@
+"""Interned ISO week values shared by the engine, validator and aggregator.
+
+Planning files refer to weeks as ``YYYY-Www`` strings. Instead of running a
+regex (and ``strptime`` for month lookups) on every occurrence, each label
+is parsed once into an ``IsoWeek`` and kept in a lookup table; later lookups
+are a dict hit. ``IsoWeek.ordinal`` is ``year * 53 + week - 1``, an integer
+that sorts like the label and is unique for every label the
+``YYYY-Www`` pattern accepts (including ``W53`` in 52-week years, which the
+planning format has always tolerated).
+
+A ``weeks`` list in a people file may also hold inclusive ranges written
+``YYYY-Www..YYYY-Www``. ``expand_weeks`` turns such a list into weeks and
+``compact_weeks`` writes runs of consecutive weeks back as ranges. A range
+only covers weeks that exist in the calendar, so it never contains a
+``W53`` of a 52-week year, and at most ``MAX_RANGE_WEEKS`` weeks; longer
+ranges are invalid. Labels whose Monday falls outside the years
+``datetime.date`` supports are invalid as well.
+"""
+
+from __future__ import annotations
+
+import re
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import Any, Iterable, NamedTuple
+
+ISO_WEEK_RE = re.compile(r"^(\d{4})-W(0[1-9]|[1-4][0-9]|5[0-3])$")
+WEEKS_PER_YEAR_SLOT = 53
+WEEK_RANGE_SEPARATOR = ".."
+# Shorter runs of consecutive weeks are written out one label at a time.
+MIN_RANGE_WEEKS = 3
+# Longest range accepted in a ``weeks`` list, roughly ten years.
+MAX_RANGE_WEEKS = 10 * WEEKS_PER_YEAR_SLOT
+
+
+class IsoWeek(NamedTuple):
+    ordinal: int
+    label: str
+    year: int
+    week: int
+    monday: date
+    month: str
+    quarter: str
+
+
+_BY_LABEL: dict[str, IsoWeek] = {}
+_BY_ORDINAL: dict[int, IsoWeek] = {}
+
+
+def _intern(year: int, week: int) -> IsoWeek | None:
+    ordinal = year * WEEKS_PER_YEAR_SLOT + week - 1
+    cached = _BY_ORDINAL.get(ordinal)
+    if cached is not None:
+        return cached
+    # Same result as strptime("%G-W%V-%u"): W53 of a 52-week year rolls into
+    # the following January.
+    try:
+        monday = date.fromisocalendar(year, 1, 1) + timedelta(weeks=week - 1)
+    except (OverflowError, ValueError):  # outside the years ``date`` supports
+        return None
+    value = IsoWeek(
+        ordinal=ordinal,
+        label=f"{year:04d}-W{week:02d}",
+        year=year,
+        week=week,
+        monday=monday,
+        month=monday.strftime("%Y-%m"),
+        quarter=f"{monday.year:04d}-Q{(monday.month - 1) // 3 + 1}",
+    )
+    _BY_ORDINAL[ordinal] = value
+    _BY_LABEL[value.label] = value
+    return value
+
+
+def prime_weeks(first_year: int, last_year: int) -> None:
+    """Precompute the lookup table for every week label of the given years."""
+    for year in range(first_year, last_year + 1):
+        for week in range(1, WEEKS_PER_YEAR_SLOT + 1):
+            _intern(year, week)
+
+
+def week_of(value: Any) -> IsoWeek | None:
+    """Return the interned week for a ``YYYY-Www`` label, or None if invalid."""
+    if not isinstance(value, str):
+        return None
+    cached = _BY_LABEL.get(value)
+    if cached is not None:
+        return cached
+    m = ISO_WEEK_RE.match(value)
+    if not m:
+        return None
+    year = int(m.group(1))
+    if year < 1:
+        return None
+    return _intern(year, int(m.group(2)))
+
+
+def week_from_ordinal(ordinal: int) -> IsoWeek:
+    """Return the week with ``ordinal``; raises ``ValueError`` if there is none."""
+    cached = _BY_ORDINAL.get(ordinal)
+    if cached is not None:
+        return cached
+    year, offset = divmod(ordinal, WEEKS_PER_YEAR_SLOT)
+    value = _intern(year, offset + 1) if year >= 1 else None
+    if value is None:
+        raise ValueError(f"no ISO week has ordinal {ordinal}")
+    return value
+
+
+def _has_week_53(year: int) -> bool:
+    return date(year, 12, 28).isocalendar()[1] == 53
+
+
+def _next_ordinal(week: IsoWeek) -> int:
+    """Ordinal of the calendar week after ``week``."""
+    if week.week == 52 and not _has_week_53(week.year):
+        return (week.year + 1) * WEEKS_PER_YEAR_SLOT
+    return week.ordinal + 1
+
+
+@lru_cache(maxsize=4096)
+def _week_range(value: str) -> tuple[IsoWeek, ...] | None:
+    start_label, _sep, end_label = value.partition(WEEK_RANGE_SEPARATOR)
+    start = week_of(start_label.strip())
+    end = week_of(end_label.strip())
+    if start is None or end is None or not 0 <= end.ordinal - start.ordinal < MAX_RANGE_WEEKS:
+        return None
+    weeks = [start]
+    while weeks[-1].ordinal < end.ordinal:
+        try:
+            weeks.append(week_from_ordinal(_next_ordinal(weeks[-1])))
+        except ValueError:  # runs past the last year ``date`` supports
+            return None
+    if weeks[-1] is not end:  # ends on a W53 the year does not have
+        return None
+    return tuple(weeks)
+
+
+def weeks_in(value: Any) -> tuple[IsoWeek, ...] | None:
+    """Weeks named by one ``weeks`` item (a label or a range), or None if invalid."""
+    week = week_of(value)
+    if week is not None:
+        return (week,)
+    if not isinstance(value, str) or WEEK_RANGE_SEPARATOR not in value:
+        return None
+    return _week_range(value)
+
+
+def expand_weeks(values: Iterable[Any]) -> list[IsoWeek]:
+    """Weeks named by a ``weeks`` list, in list order; invalid items are skipped."""
+    weeks: list[IsoWeek] = []
+    for value in values:
+        named = weeks_in(value)
+        if named is not None:
+            weeks.extend(named)
+    return weeks
+
+
+def compact_weeks(weeks: Iterable[IsoWeek]) -> list[str]:
+    """Sorted, de-duplicated labels with runs of ``MIN_RANGE_WEEKS`` or more as ranges."""
+    items: list[str] = []
+    run: list[IsoWeek] = []
+
+    def flush() -> None:
+        if len(run) >= MIN_RANGE_WEEKS:
+            items.append(f"{run[0].label}{WEEK_RANGE_SEPARATOR}{run[-1].label}")
+        else:
+            items.extend(week.label for week in run)
+
+    for week in sorted(set(weeks)):
+        if run and week.ordinal != _next_ordinal(run[-1]):
+            flush()
+            run = []
+        run.append(week)
+    flush()
+    return items
+
+
+prime_weeks(date.today().year - 5, date.today().year + 5)
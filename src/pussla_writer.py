@@ -0,0 +1,108 @@
+"""Write planning frontmatter back with minimal diffs.
+
+Re-dumping a whole frontmatter block with ``yaml.safe_dump`` reformats
+everything a human wrote (flow lists, quoting, comments, key spacing), so a
+one-week edit shows up as a rewrite of the file. ``patch_frontmatter``
+instead re-emits only the items of one top-level list (``allocations``) that
+actually changed and copies every other line of the file verbatim.
+
+An item counts as unchanged when the new list holds the very same object
+that was read from the file, so callers keep untouched items by identity.
+The patched text is parsed again and compared with the intended data; if it
+does not match, for example because another key changed or the list uses a
+layout the patcher does not understand, the whole frontmatter is dumped as
+before.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Any
+
+import yaml
+
+try:
+    _YAML_LOADER = yaml.CSafeLoader
+except AttributeError:  # PyYAML built without libyaml
+    _YAML_LOADER = yaml.SafeLoader
+
+
+def _dump(data: Any) -> str:
+    return yaml.safe_dump(data, sort_keys=False, allow_unicode=True)
+
+
+def dump_frontmatter(data: dict[str, Any], body: str) -> str:
+    """Render a whole file: ``data`` as block YAML between ``---`` lines, then ``body``."""
+    return f"---\n{_dump(data).strip()}\n---\n{body}"
+
+
+def _item_starts(lines: list[str], indent: int) -> list[int]:
+    starts = []
+    for idx, line in enumerate(lines):
+        if len(line) - len(line.lstrip(" ")) != indent or line[indent:indent + 1] != "-":
+            continue
+        if line[indent + 1:indent + 2] in ("", " ", "\n", "\r"):
+            starts.append(idx)
+    return starts
+
+
+def _patch_list(lines: list[str], key: str, new_items: Any, old_items: list[Any]) -> list[str] | None:
+    """Return frontmatter ``lines`` with the ``key`` list rewritten, or None if not found."""
+    key_re = re.compile(rf"^{re.escape(key)}\s*:(.*)$")
+    start = next((idx for idx, line in enumerate(lines) if key_re.match(line.rstrip("\r\n"))), None)
+    if start is None:
+        return None
+
+    end = start + 1
+    while end < len(lines) and (not lines[end].strip() or lines[end][0] in " \t#-"):
+        end += 1
+    # Blank lines and comments after the list belong to what follows it.
+    while end > start + 1 and (not lines[end - 1].strip() or lines[end - 1].lstrip().startswith("#")):
+        end -= 1
+
+    inline = key_re.match(lines[start].rstrip("\r\n")).group(1).strip()
+    block = lines[start + 1:end]
+    first_item = next((line for line in block if line.lstrip(" ").startswith("-")), None)
+    if (inline and not inline.startswith("#")) or first_item is None or not isinstance(new_items, list):
+        return [*lines[:start], *_dump({key: new_items}).splitlines(keepends=True), *lines[end:]]
+
+    indent = len(first_item) - len(first_item.lstrip(" "))
+    starts = _item_starts(block, indent)
+    if len(starts) != len(old_items):
+        return [*lines[:start], *_dump({key: new_items}).splitlines(keepends=True), *lines[end:]]
+
+    chunks = [block[begin:stop] for begin, stop in zip(starts, [*starts[1:], len(block)])]
+    kept = {id(item): chunk for item, chunk in zip(old_items, chunks)}
+    patched = [*lines[:start + 1], *block[:starts[0]]]
+    for item in new_items:
+        chunk = kept.get(id(item))
+        if chunk is None:
+            chunk = [" " * indent + line for line in _dump([item]).splitlines(keepends=True)]
+        patched.extend(chunk)
+    if patched and not patched[-1].endswith("\n"):
+        patched[-1] += "\n"
+    return [*patched, *lines[end:]]
+
+
+def patch_frontmatter(text: str, data: dict[str, Any], old_items: list[Any], key: str = "allocations") -> str:
+    """Return ``text`` with its frontmatter changed to ``data``, touching only ``key`` items.
+
+    ``text`` is the current file and ``old_items`` the ``key`` list as it
+    was parsed from it. The markdown body is kept byte for byte. Falls back
+    to ``dump_frontmatter`` when the result would not parse back to ``data``.
+    """
+    lines = text.splitlines(keepends=True)
+    close = next((idx for idx, line in enumerate(lines[1:], 1) if line.rstrip("\r\n") == "---"), None)
+    if not lines or lines[0].rstrip("\r\n") != "---" or close is None:
+        return dump_frontmatter(data, text)
+    body = "".join(lines[close + 1:])
+
+    patched = _patch_list(lines[1:close], key, data.get(key), old_items)
+    if patched is not None:
+        try:
+            reparsed = yaml.load("".join(patched), Loader=_YAML_LOADER)
+        except yaml.YAMLError:
+            reparsed = None
+        if reparsed == data:
+            return "".join([lines[0], *patched, *lines[close:]])
+    return dump_frontmatter(data, body)
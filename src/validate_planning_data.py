@@ -10,7 +10,9 @@ from collections import defaultdict
 from pathlib import Path
 from typing import Any
 
-import yaml
+from pussla_frontmatter import prefetch_frontmatter, read_frontmatter
+from pussla_projects import project_index
+from pussla_weeks import weeks_in
 
 
 ISO_WEEK_RE = re.compile(r"^\d{4}-W(0[1-9]|[1-4][0-9]|5[0-3])$")
@@ -23,18 +25,7 @@ SKILLS_REQUIRED_FIELDS = {"canonical_skills"}
 
 
 def parse_frontmatter(path: Path) -> tuple[dict[str, Any], str]:
-    text = path.read_text(encoding="utf-8")
-    if not text.startswith("---\n"):
-        raise ValueError("missing YAML frontmatter start delimiter '---'")
-    parts = text.split("\n---\n", 1)
-    if len(parts) != 2:
-        raise ValueError("missing YAML frontmatter end delimiter '---'")
-    frontmatter_text = parts[0][4:]
-    body = parts[1]
-    data = yaml.safe_load(frontmatter_text) or {}
-    if not isinstance(data, dict):
-        raise ValueError("frontmatter must parse to a YAML object")
-    return data, body
+    return read_frontmatter(path)
 
 
 def normalize_skill(value: str) -> str:
@@ -267,18 +258,20 @@ def validate_people(
                     continue
                 hours = (load / 100.0) * capacity
 
-            for week in weeks:
-                if not isinstance(week, str) or not ISO_WEEK_RE.match(week):
-                    errors.append(f"{location}: invalid ISO week '{week}' (expected YYYY-Www)")
+            for item in weeks:
+                named = weeks_in(item)
+                if named is None:
+                    errors.append(f"{location}: invalid ISO week '{item}' (expected YYYY-Www or YYYY-Www..YYYY-Www)")
                     continue
-                if week in capacities[alias] and abs(capacities[alias][week] - capacity) > 0.001:
-                    errors.append(
-                        f"{location}: conflicting capacity_hours for alias '{alias}' week {week} "
-                        f"({capacities[alias][week]} vs {capacity})"
-                    )
-                    continue
-                capacities[alias][week] = capacity
-                totals[alias][week] += hours
+                for week in (parsed.label for parsed in named):
+                    if week in capacities[alias] and abs(capacities[alias][week] - capacity) > 0.001:
+                        errors.append(
+                            f"{location}: conflicting capacity_hours for alias '{alias}' week {week} "
+                            f"({capacities[alias][week]} vs {capacity})"
+                        )
+                        continue
+                    capacities[alias][week] = capacity
+                    totals[alias][week] += hours
 
     for alias, by_week in sorted(totals.items()):
         for week, total_hours in sorted(by_week.items()):
@@ -387,6 +380,12 @@ def main() -> int:
         action="store_true",
         help="Do not fail validation on over-allocation; emit warnings instead.",
     )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Parse files with N worker processes before validating (default: 1, serial).",
+    )
     args = parser.parse_args()
 
     planning_dir = Path(args.planning_dir)
@@ -410,6 +409,18 @@ def main() -> int:
             print(f"ERROR: {err}")
         return 1
 
+    if args.jobs > 1:
+        prefetch_frontmatter(
+            [
+                *people_dir.glob("*.md"),
+                *roles_dir.glob("*.md"),
+                *projects_dir.glob("*.md"),
+                *identity_dir.glob("*.md"),
+                skills_path,
+            ],
+            args.jobs,
+        )
+
     role_errors, role_warnings, role_names = validate_roles(roles_dir)
     skills_errors, skills_warnings, canonical_skills, skill_synonyms = validate_skills_catalog(skills_path)
     people_errors, people_warnings, totals, ref_projects, known_aliases = validate_people(
@@ -421,7 +432,9 @@ def main() -> int:
     )
     project_errors, ref_aliases = validate_projects(projects_dir)
 
-    known_projects = {p.stem for p in projects_dir.glob("*.md")}
+    project_files = project_index(projects_dir)
+    # Allocations must use the name the dashboard keys projects by, not a stem or project_id.
+    known_projects = project_files.names()
     cross_errors: list[str] = []
     for proj in sorted(ref_projects):
         if proj not in known_projects:
@@ -451,7 +464,7 @@ def main() -> int:
     print("Validation passed.")
     print(f"- people files: {len(known_aliases)}")
     print(f"- role files: {len(role_names)}")
-    print(f"- project files: {len(known_projects)}")
+    print(f"- project files: {len(project_files.paths())}")
     print(f"- weekly total slots computed: {sum(len(v) for v in totals.values())}")
     print(f"- warnings: {len(all_warnings)}")
     print(f"- identity files scanned: {len(list(identity_dir.glob('*.md')))}")
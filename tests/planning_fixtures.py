@@ -0,0 +1,40 @@
+"""Planning and identity trees shared by the model and watcher tests."""
+
+from pathlib import Path
+
+PERSON_TEMPLATE = """
+---
+alias: {alias}
+role_id: Dev-Role
+skills: [python]
+allocations:
+  - project: Project-X
+    weeks: ["2026-W10"]
+    planned_hours: {hours}
+    capacity_hours: 40
+---
+Profile
+""".lstrip()
+
+
+def make_repo(root: Path) -> tuple[Path, Path]:
+    """Create ``planning`` and ``identity`` folders under ``root`` with one person, alice."""
+    planning = root / 'planning'
+    identity = root / 'identity'
+    (planning / 'people').mkdir(parents=True)
+    (planning / 'roles').mkdir(parents=True)
+    (planning / 'projects').mkdir(parents=True)
+    identity.mkdir(parents=True)
+    (planning / 'roles' / 'Dev-Role.md').write_text(
+        "---\nrole_id: Dev-Role\nname: Developer\n---\nRole\n", encoding='utf-8'
+    )
+    (planning / 'projects' / 'Project-X.md').write_text(
+        "---\nproject_id: project-x\nname: Project-X\n---\nScope\n", encoding='utf-8'
+    )
+    (planning / 'people' / 'alice.md').write_text(
+        PERSON_TEMPLATE.format(alias='alice', hours=16), encoding='utf-8'
+    )
+    (identity / 'alice.md').write_text(
+        "---\nalias: alice\nreal_name: Alice A\n---\n", encoding='utf-8'
+    )
+    return planning, identity
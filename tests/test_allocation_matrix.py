@@ -0,0 +1,36 @@
+import os
+import sys
+import unittest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src', 'dashboard'))
+
+from allocation_matrix import AllocationMatrix
+from pussla_weeks import week_of
+
+W1, W2, W3 = (week_of(f'2026-W0{n}') for n in (1, 2, 3))
+
+
+class TestAllocationMatrix(unittest.TestCase):
+    def test_reductions_over_cells_and_projects(self):
+        matrix = AllocationMatrix(['alice', 'bob'], [W1, W2, W3], 40.0)
+        matrix.add('alice', 'P1', [W1, W2], 24.0, 40.0, 'committed', {'project': 'P1'})
+        matrix.add('alice', 'P2', [W2], 20.0, 40.0, 'tentative', {'project': 'P2'})
+        matrix.add('bob', 'P1', [W3], 0.0, 32.0, 'committed', {'project': 'P1'})
+        matrix.add('bob', 'P2', [W1, W3, W1], 2.0, 0.0, 'tentative', {'project': 'P2'})
+
+        self.assertEqual(matrix.load_percentages(), [60.0, 110.0, 0.0, 10.0, 0.0, 6.2])
+        self.assertEqual(list(matrix.row(matrix.capacity, 1)), [40.0, 40.0, 32.0])
+        self.assertEqual(list(matrix.row(matrix.layers['tentative'], 1)), [4.0, 0.0, 2.0])
+        self.assertEqual(matrix.utilization_metrics(matrix.load_percentages()), (31.0, 1))
+        self.assertEqual(matrix.state_totals(), {'committed': 48.0, 'tentative': 26.0})
+        self.assertEqual(matrix.project_totals(), {'P1': 48.0, 'P2': 26.0})
+        self.assertEqual(matrix.utilization_metrics([]), (0.0, 0))
+        self.assertEqual(matrix.project_bounds('P1'), (W1, W3))
+        self.assertEqual(matrix.project_bounds('P2'), (W1, W3))
+        self.assertIsNone(matrix.project_bounds('unknown'))
+        self.assertEqual(len(matrix.slot_projects[matrix.cell('alice', W2)]), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,7 @@
 import os
 import sys
 import tempfile
+import threading
 import unittest
 from pathlib import Path
 
@@ -143,5 +144,140 @@ Notes
             self.assertEqual(entry['load'], 40)
 
 
+    def test_bulk_update_applies_edits_per_file_and_is_all_or_nothing(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            planning = Path(tmp) / 'planning'
+            people_dir = planning / 'people'
+            people_dir.mkdir(parents=True)
+            for alias in ('alice', 'bob'):
+                (people_dir / f'{alias}.md').write_text(
+                    f"---\nalias: {alias}\nrole_id: Dev-Role\nallocations: []\n---\nNotes\n",
+                    encoding='utf-8',
+                )
+            original = (people_dir / 'bob.md').read_text(encoding='utf-8')
+
+            with self.assertRaisesRegex(ValueError, 'edit 1: '):
+                pussla_engine.bulk_update_week_allocations(
+                    planning_dir=planning,
+                    edits=[
+                        {'alias': 'bob', 'week': '2026-W05', 'allocations': [{'project': 'P', 'load': 50}]},
+                        {'alias': 'bob', 'week': 'bad', 'allocations': []},
+                    ],
+                )
+            with self.assertRaises(FileNotFoundError):
+                pussla_engine.bulk_update_week_allocations(
+                    planning_dir=planning,
+                    edits=[
+                        {'alias': 'bob', 'week': '2026-W05', 'allocations': [{'project': 'P', 'load': 50}]},
+                        {'alias': 'carol', 'week': '2026-W05', 'allocations': []},
+                    ],
+                )
+            self.assertEqual((people_dir / 'bob.md').read_text(encoding='utf-8'), original)
+
+            results = pussla_engine.bulk_update_week_allocations(
+                planning_dir=planning,
+                edits=[
+                    {'alias': 'alice', 'week': week, 'allocations': [{'project': 'P', 'load': 50}]}
+                    for week in ('2026-W05', '2026-W06', '2026-W07')
+                ] + [
+                    {'alias': 'bob', 'week': '2026-W06', 'allocations': [{'project': 'Q', 'load': 20}]},
+                    {'alias': 'alice', 'week': '2026-W06', 'allocations': []},
+                ],
+            )
+
+            self.assertEqual([(r['alias'], r['week'], r['total_load']) for r in results], [
+                ('alice', '2026-W05', 50),
+                ('alice', '2026-W06', 50),
+                ('alice', '2026-W07', 50),
+                ('bob', '2026-W06', 20),
+                ('alice', '2026-W06', 0),
+            ])
+            alice = self._read_frontmatter(people_dir / 'alice.md')
+            self.assertEqual(alice['allocations'][0]['weeks'], ['2026-W05', '2026-W07'])
+            bob = self._read_frontmatter(people_dir / 'bob.md')
+            self.assertEqual(bob['allocations'][0]['weeks'], ['2026-W06'])
+            self.assertEqual(sorted(p.name for p in people_dir.iterdir()), ['alice.md', 'bob.md'])
+
+    def test_expected_version_guards_concurrent_writers(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            planning = Path(tmp) / 'planning'
+            people_dir = planning / 'people'
+            people_dir.mkdir(parents=True)
+            path = people_dir / 'alice.md'
+            path.write_text("---\nalias: alice\nallocations: []\n---\nNotes\n", encoding='utf-8')
+            version = pussla_engine.file_version(path)
+
+            result = pussla_engine.update_week_allocations(
+                planning_dir=planning,
+                alias='alice',
+                week='2026-W05',
+                allocations=[{'project': 'P', 'load': 50}],
+                expected_version=version,
+            )
+            self.assertEqual(result['version'], pussla_engine.file_version(path))
+            self.assertNotEqual(result['version'], version)
+
+            with self.assertRaises(pussla_engine.VersionConflictError) as ctx:
+                pussla_engine.update_week_allocations(
+                    planning_dir=planning,
+                    alias='alice',
+                    week='2026-W06',
+                    allocations=[{'project': 'P', 'load': 50}],
+                    expected_version=version,
+                )
+            self.assertEqual(ctx.exception.current_version, result['version'])
+            self.assertNotIn('2026-W06', path.read_text(encoding='utf-8'))
+
+            # Unconditional writers to the same file are serialized, not lost.
+            threads = [
+                threading.Thread(
+                    target=pussla_engine.update_week_allocations,
+                    kwargs={
+                        'planning_dir': planning,
+                        'alias': 'alice',
+                        'week': f'2026-W{week:02d}',
+                        'allocations': [{'project': f'P{week}', 'load': 10}],
+                    },
+                )
+                for week in range(10, 30)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            projects = {entry['project'] for entry in self._read_frontmatter(path)['allocations']}
+            self.assertEqual(projects, {'P'} | {f'P{week}' for week in range(10, 30)})
+
+    def test_week_ranges_are_read_and_written_compacted(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            planning = Path(tmp) / 'planning'
+            people_dir = planning / 'people'
+            people_dir.mkdir(parents=True)
+            path = people_dir / 'alice.md'
+            path.write_text(
+                "---\nalias: alice\nallocations:\n"
+                "  - project: P\n    weeks: [\"2026-W04..2026-W10\", \"2026-W12\"]\n    load: 50\n"
+                "---\nNotes\n",
+                encoding='utf-8',
+            )
+            person = pussla_engine._load_people_file(path)
+            self.assertEqual(len(person['allocations'][0]['weeks']), 8)
+
+            pussla_engine.update_week_allocations(
+                planning_dir=planning,
+                alias='alice',
+                week='2026-W07',
+                allocations=[{'project': 'Q', 'load': 50}],
+            )
+            pussla_engine.update_week_allocations(
+                planning_dir=planning,
+                alias='alice',
+                week='2026-W11',
+                allocations=[{'project': 'P', 'load': 50}],
+            )
+            by_project = {entry['project']: entry for entry in self._read_frontmatter(path)['allocations']}
+            self.assertEqual(by_project['P']['weeks'], ['2026-W04..2026-W06', '2026-W08..2026-W12'])
+            self.assertEqual(by_project['Q']['weeks'], ['2026-W07'])
+
 if __name__ == '__main__':
     unittest.main()
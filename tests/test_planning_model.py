@@ -0,0 +1,392 @@
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src', 'dashboard'))
+sys.path.append(os.path.dirname(__file__))
+
+import planning_model
+import pussla_engine
+import write_behind
+from planning_fixtures import PERSON_TEMPLATE, make_repo
+from planning_model import PlanningModel
+
+
+class TestPlanningModel(unittest.TestCase):
+    def test_matches_build_dashboard_data_and_reuses_payload(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            planning, identity = make_repo(Path(tmp))
+            model = PlanningModel(planning, identity)
+
+            first = model.dashboard_data(include_pii=True)
+            expected = pussla_engine.build_dashboard_data(planning, identity, include_pii=True)
+            first_cmp = {k: v for k, v in first.items() if k != 'generated_at'}
+            expected.pop('generated_at')
+            self.assertEqual(first_cmp, expected)
+
+            self.assertIs(model.dashboard_data(include_pii=True), first)
+            self.assertFalse(model.refresh())
+
+    def test_identity_index_is_lazy_and_shares_the_planning_build(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            planning, identity = make_repo(Path(tmp))
+            model = PlanningModel(planning, identity)
+
+            with mock.patch.object(planning_model, 'assemble_dashboard_data', wraps=pussla_engine.assemble_dashboard_data) as assemble:
+                anonymous = model.dashboard_data(include_pii=False)
+                self.assertIsNone(model._identity_index)
+                named = model.dashboard_data(include_pii=True)
+                self.assertIs(model.dashboard_data(include_pii=True, payload_version=2),
+                              model.dashboard_data(include_pii=False, payload_version=2))
+            self.assertEqual(assemble.call_count, 2)
+            self.assertIsNone(anonymous['users'][0]['real_name'])
+            self.assertEqual(named['users'][0]['display_name'], 'Alice A')
+            self.assertIs(named['users'][0]['weekly_stats'], anonymous['users'][0]['weekly_stats'])
+
+            fingerprint, _modified, _index = model.identities()
+            (identity / 'alice.md').write_text(
+                "---\nalias: alice\nreal_name: Alice B\n---\n", encoding='utf-8'
+            )
+            os.utime(identity / 'alice.md', ns=(1, 1))
+            new_fingerprint, _modified, index = model.identities()
+            self.assertNotEqual(new_fingerprint, fingerprint)
+            self.assertEqual(index['alice']['real_name'], 'Alice B')
+            self.assertEqual(model.dashboard_data(include_pii=True)['users'][0]['display_name'], 'Alice B')
+            self.assertIs(model.dashboard_data(include_pii=False), anonymous)
+
+    def test_refresh_picks_up_changed_added_and_removed_files(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            planning, identity = make_repo(Path(tmp))
+            model = PlanningModel(planning, identity)
+            model.refresh()
+
+            people = planning / 'people'
+            (people / 'alice.md').write_text(
+                PERSON_TEMPLATE.format(alias='alice', hours=24), encoding='utf-8'
+            )
+            (people / 'bob.md').write_text(
+                PERSON_TEMPLATE.format(alias='bob', hours=8), encoding='utf-8'
+            )
+            data = model.dashboard_data(include_pii=False)
+            hours = {u['alias']: u['weekly_stats'][0]['total_planned_hours'] for u in data['users']}
+            self.assertEqual(hours, {'alice': 24.0, 'bob': 8.0})
+
+            (people / 'bob.md').unlink()
+            data = model.dashboard_data(include_pii=False)
+            self.assertEqual([u['alias'] for u in data['users']], ['alice'])
+
+    def test_update_week_allocations_refreshes_model_in_place(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            planning, identity = make_repo(Path(tmp))
+            model = PlanningModel(planning, identity)
+            before = model.dashboard_data(include_pii=False)
+
+            model.update_week_allocations(
+                alias='alice',
+                week='2026-W11',
+                allocations=[{'project': 'Project-X', 'planned_hours': 20}],
+            )
+
+            after = model.dashboard_data(include_pii=False)
+            self.assertIsNot(after, before)
+            self.assertEqual(after['weeks'], ['2026-W10', '2026-W11'])
+
+    def test_v2_payload_references_projects_by_name(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            planning, identity = make_repo(Path(tmp))
+            model = PlanningModel(planning, identity)
+
+            v1 = model.dashboard_data(include_pii=False)
+            v2 = model.dashboard_data(include_pii=False, payload_version=2)
+
+            self.assertEqual(v2['payload_version'], 2)
+            self.assertNotIn('raw_allocations', v2)
+            slot = v2['users'][0]['weekly_stats'][0]['projects'][0]
+            self.assertNotIn('context', slot)
+            self.assertEqual(
+                {**slot, 'context': v1['users'][0]['weekly_stats'][0]['projects'][0]['context']},
+                v1['users'][0]['weekly_stats'][0]['projects'][0],
+            )
+            self.assertEqual([p['name'] for p in v2['projects']], ['Project-X'])
+            self.assertEqual(v2['projects'], v1['projects'])
+            with self.assertRaises(ValueError):
+                model.dashboard_data(payload_version=3)
+
+    def test_filters_slice_weeks_aliases_and_projects(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            planning, identity = make_repo(Path(tmp))
+            (planning / 'people' / 'bob.md').write_text(
+                PERSON_TEMPLATE.format(alias='bob', hours=8).replace(
+                    '["2026-W10"]', '["2026-W09", "2026-W10", "2026-W11"]'
+                ),
+                encoding='utf-8',
+            )
+            model = PlanningModel(planning, identity)
+            full = model.dashboard_data(include_pii=False)
+
+            sliced = model.dashboard_data(
+                include_pii=False, from_week='2026-W10', to_week='2026-W11', aliases=['bob']
+            )
+            self.assertEqual(sliced['weeks'], ['2026-W10', '2026-W11'])
+            self.assertEqual([u['alias'] for u in sliced['users']], ['bob'])
+            self.assertEqual(len(sliced['raw_allocations']), 2)
+            self.assertEqual(sliced['metrics']['users_count'], 1)
+            self.assertEqual(
+                (sliced['metrics']['committed_hours'], sliced['metrics']['tentative_hours']), (16.0, 0.0)
+            )
+            self.assertEqual(sliced['metrics']['project_planned_hours'], {'Project-X': 16.0})
+            self.assertEqual(full['metrics']['project_planned_hours'], {'Project-X': 40.0})
+            project = sliced['projects'][0]
+            self.assertEqual(project['derived_start_week'], '2026-W09')
+            self.assertEqual(project, full['projects'][0])
+            self.assertIs(model.dashboard_data(include_pii=False), full)
+
+            none = model.dashboard_data(include_pii=False, projects=['Other'], include_raw=False)
+            self.assertEqual(none['weeks'], [])
+            self.assertEqual(none['projects'], [])
+            self.assertNotIn('raw_allocations', none)
+            with self.assertRaisesRegex(ValueError, 'from_week'):
+                model.dashboard_data(from_week='2026-10')
+
+    def test_concurrent_requests_share_one_build(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            planning, identity = make_repo(Path(tmp))
+            model = PlanningModel(planning, identity)
+            model.refresh()
+            calls = []
+
+            def slow_assemble(**kwargs):
+                calls.append(kwargs)
+                time.sleep(0.2)
+                return pussla_engine.assemble_dashboard_data(**kwargs)
+
+            results = []
+            with mock.patch.object(planning_model, 'assemble_dashboard_data', slow_assemble):
+                threads = [
+                    threading.Thread(target=lambda: results.append(model.dashboard_data(include_pii=False, aliases=['alice'])))
+                    for _ in range(5)
+                ]
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+
+            self.assertEqual(len(calls), 1)
+            self.assertEqual(len(results), 5)
+            self.assertTrue(all(result is results[0] for result in results))
+
+    def test_stale_while_revalidate_serves_previous_payload_during_rebuild(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            planning, identity = make_repo(Path(tmp))
+            model = PlanningModel(planning, identity, stale_while_revalidate=True)
+            old_fingerprint, _modified, old = model.dashboard_payload(include_pii=False)
+
+            (planning / 'people' / 'alice.md').write_text(
+                PERSON_TEMPLATE.format(alias='alice', hours=24), encoding='utf-8'
+            )
+            fingerprint, _modified, stale = model.dashboard_payload(include_pii=False)
+            self.assertIs(stale, old)
+            self.assertEqual(fingerprint, old_fingerprint)
+
+            deadline = time.monotonic() + 5
+            while time.monotonic() < deadline:
+                fingerprint, _modified, fresh = model.dashboard_payload(include_pii=False)
+                if fresh is not old:
+                    break
+                time.sleep(0.01)
+            self.assertEqual(fingerprint, model.version()[0])
+            self.assertEqual(fresh['users'][0]['weekly_stats'][0]['total_planned_hours'], 24.0)
+
+    def test_write_behind_serves_edits_from_memory_and_writes_once(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            planning, identity = make_repo(Path(tmp))
+            journal = Path(tmp) / 'journal.jsonl'
+            people_file = planning / 'people' / 'alice.md'
+            original = people_file.read_text(encoding='utf-8')
+            model = PlanningModel(planning, identity, write_behind=60, journal_path=journal)
+            model.dashboard_data(include_pii=False)
+
+            results = [
+                model.update_week_allocations('alice', week, [{'project': 'Project-X', 'planned_hours': 8}])
+                for week in ('2026-W11', '2026-W12', '2026-W11')
+            ]
+            self.assertEqual(people_file.read_text(encoding='utf-8'), original)
+            self.assertEqual(len(journal.read_text(encoding='utf-8').splitlines()), 3)
+            data = model.dashboard_data(include_pii=False)
+            self.assertEqual(data['weeks'], ['2026-W10', '2026-W11', '2026-W12'])
+            self.assertEqual(data['users'][0]['version'], results[-1]['version'])
+            with self.assertRaises(pussla_engine.VersionConflictError):
+                model.update_week_allocations('alice', '2026-W13', [], expected_version=results[0]['version'])
+
+            model.close()
+            self.assertEqual(model.write_behind.flushes, 1)
+            self.assertEqual(pussla_engine.file_version(people_file), results[-1]['version'])
+            self.assertFalse(journal.exists())
+            self.assertEqual(model.dashboard_data(include_pii=False)['weeks'], data['weeks'])
+
+    def test_write_behind_journal_keeps_only_pending_edits(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            planning, identity = make_repo(Path(tmp))
+            people = planning / 'people'
+            (people / 'bob.md').write_text(PERSON_TEMPLATE.format(alias='bob', hours=8), encoding='utf-8')
+            journal = Path(tmp) / 'journal.jsonl'
+            model = PlanningModel(planning, identity, write_behind=60, journal_path=journal)
+            model.update_week_allocations('alice', '2026-W11', [{'project': 'Project-X', 'planned_hours': 8}])
+            model.update_week_allocations('bob', '2026-W12', [{'project': 'Project-X', 'planned_hours': 4}])
+
+            model.write_behind.flush(['alice'])
+            self.assertEqual(model.write_behind.pending(), ['bob'])
+            self.assertNotIn('alice', journal.read_text(encoding='utf-8'))
+
+            # A later edit on disk survives a replay of the journal after a crash.
+            (people / 'alice.md').write_text(PERSON_TEMPLATE.format(alias='alice', hours=30), encoding='utf-8')
+            PlanningModel(planning, identity, write_behind=60, journal_path=journal)
+            self.assertEqual((people / 'alice.md').read_text(encoding='utf-8'), PERSON_TEMPLATE.format(alias='alice', hours=30))
+            self.assertIn('2026-W12', (people / 'bob.md').read_text(encoding='utf-8'))
+
+    def test_write_behind_stages_edits_while_a_flush_is_writing(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            planning, identity = make_repo(Path(tmp))
+            journal = Path(tmp) / 'journal.jsonl'
+            people_file = planning / 'people' / 'alice.md'
+            model = PlanningModel(planning, identity, write_behind=60, journal_path=journal)
+            model.update_week_allocations('alice', '2026-W11', [{'project': 'Project-X', 'planned_hours': 8}])
+            replace_file = write_behind._replace_file
+            results = []
+
+            def replace_while_staging(path, text):
+                # Runs in another thread: it would block if the flush held the queue lock.
+                stager = threading.Thread(target=lambda: results.append(model.update_week_allocations(
+                    'alice', '2026-W12', [{'project': 'Project-X', 'planned_hours': 4}]
+                )))
+                stager.start()
+                stager.join(5)
+                replace_file(path, text)
+
+            with mock.patch.object(write_behind, '_replace_file', replace_while_staging):
+                model.write_behind.flush()
+            self.assertEqual(len(results), 1)
+            self.assertEqual(model.write_behind.pending(), ['alice'])
+            self.assertEqual(len(journal.read_text(encoding='utf-8').splitlines()), 1)
+            self.assertEqual(model.dashboard_data(include_pii=False)['users'][0]['version'], results[0]['version'])
+
+            model.close()
+            self.assertEqual(pussla_engine.file_version(people_file), results[0]['version'])
+            self.assertEqual(model.write_behind.flushes, 2)
+            self.assertFalse(journal.exists())
+
+    def test_write_behind_replays_the_journal_on_startup(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            planning, identity = make_repo(Path(tmp))
+            journal = Path(tmp) / 'journal.jsonl'
+            edit = '{"alias": "alice", "week": "2026-W11", "allocations": [{"project": "Project-X", "load": 50}]}\n'
+            # The last append was torn by a crash.
+            journal.write_text(edit * 2 + '{"alias": "ali', encoding='utf-8')
+
+            model = PlanningModel(planning, identity, write_behind=60, journal_path=journal)
+
+            self.assertFalse(journal.exists())
+            self.assertIn('2026-W11', (planning / 'people' / 'alice.md').read_text(encoding='utf-8'))
+            self.assertEqual(model.dashboard_data(include_pii=False)['weeks'], ['2026-W10', '2026-W11'])
+
+    def test_default_journal_is_kept_outside_the_planning_repo(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            planning, identity = make_repo(Path(tmp))
+            state = Path(tmp) / 'state'
+            with mock.patch.dict(os.environ, {'XDG_STATE_HOME': str(state)}):
+                model = PlanningModel(planning, identity, write_behind=60)
+                journal = write_behind.default_journal_path(planning)
+                model.update_week_allocations('alice', '2026-W12', [{'project': 'Project-X', 'load': 50}])
+
+            self.assertEqual(journal.parent, state / 'pussla')
+            self.assertTrue(journal.exists())
+            self.assertEqual([path.name for path in planning.iterdir() if path.is_file()], [])
+            model.close()
+            self.assertFalse(journal.exists())
+
+
+def _merge_delta(base, delta):
+    """Apply a ``dashboard_delta`` to a v2 payload the way the frontend does."""
+    users = {user['alias']: user for user in base['users']}
+    for alias in delta['removed_aliases']:
+        users.pop(alias, None)
+    for user in delta['users']:
+        stats = {s['week']: s for s in users.get(user['alias'], {}).get('weekly_stats', [])}
+        stats.update((s['week'], s) for s in user['weekly_stats'])
+        users[user['alias']] = {**user, 'weekly_stats': list(stats.values())}
+    weeks = delta['weeks']
+    for alias, user in users.items():
+        stats = {s['week']: s for s in user['weekly_stats']}
+        users[alias] = {**user, 'weekly_stats': [stats[week] for week in weeks]}
+    projects = {project['name']: project for project in base['projects']}
+    for name in delta['removed_projects']:
+        projects.pop(name, None)
+    projects.update((project['name'], project) for project in delta['projects'])
+    return {
+        **base,
+        'weeks': weeks,
+        'users': [users[alias] for alias in sorted(users)],
+        'projects': [projects[name] for name in sorted(projects)],
+        'metrics': delta['metrics'],
+        'data_version': delta['data_version'],
+    }
+
+
+class TestDashboardDelta(unittest.TestCase):
+    def _full(self, model):
+        payload = dict(model.dashboard_data(include_pii=False, payload_version=2))
+        payload.pop('generated_at')
+        return payload
+
+    def test_merged_deltas_reproduce_the_full_payload(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            planning, identity = make_repo(Path(tmp))
+            people = planning / 'people'
+            (people / 'bob.md').write_text(PERSON_TEMPLATE.format(alias='bob', hours=8), encoding='utf-8')
+            model = PlanningModel(planning, identity)
+            base = self._full(model)
+
+            steps = [
+                lambda: model.update_week_allocations('alice', '2026-W10', [{'project': 'Project-X', 'planned_hours': 30}]),
+                # A new week adds a column to every row.
+                lambda: model.update_week_allocations('bob', '2026-W12', [{'project': 'Project-Y', 'load': 50}]),
+                lambda: (people / 'carol.md').write_text(PERSON_TEMPLATE.format(alias='carol', hours=4), encoding='utf-8'),
+                lambda: (planning / 'roles' / 'Dev-Role.md').write_text(
+                    "---\nrole_id: Dev-Role\nname: Engineer\n---\n", encoding='utf-8'
+                ),
+                lambda: (people / 'bob.md').unlink(),
+            ]
+            for step in steps:
+                step()
+                model.refresh()
+                _fingerprint, _modified, delta = model.dashboard_delta(base['data_version'])
+                self.assertNotIn('full_reload', delta)
+                base = _merge_delta(base, delta)
+                base.pop('generated_at', None)
+                self.assertEqual(base, self._full(model))
+
+            _fingerprint, _modified, delta = model.dashboard_delta(base['data_version'])
+            self.assertEqual((delta['users'], delta['projects']), ([], []))
+            _fingerprint, _modified, delta = model.dashboard_delta(base['data_version'] - 1)
+            self.assertEqual((delta['users'], delta['removed_aliases']), ([], ['bob']))
+
+    def test_unknown_or_evicted_versions_require_a_full_reload(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            planning, identity = make_repo(Path(tmp))
+            model = PlanningModel(planning, identity)
+            version = self._full(model)['data_version']
+            model._change_log = planning_model.deque(maxlen=2)
+            for hours in (10, 11, 12):
+                model.update_week_allocations('alice', '2026-W10', [{'project': 'Project-X', 'planned_hours': hours}])
+            self.assertTrue(model.dashboard_delta(version)[2]['full_reload'])
+            self.assertNotIn('full_reload', model.dashboard_delta(version + 1)[2])
+            self.assertTrue(model.dashboard_delta(version + 100)[2]['full_reload'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,140 @@
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src', 'dashboard'))
+sys.path.append(os.path.dirname(__file__))
+
+from planning_fixtures import PERSON_TEMPLATE, make_repo
+from planning_model import PlanningModel
+from planning_watcher import PlanningWatcher
+
+
+class _ChurningBackend:
+    """Reports a change to the same file on every wait, so a burst never ends."""
+
+    name = 'churn'
+
+    def __init__(self, path):
+        self.path = path
+
+    def wait(self, timeout):
+        time.sleep(min(timeout, 0.01))
+        return {self.path}
+
+    def close(self):
+        pass
+
+
+class _RecordingModel:
+    def __init__(self):
+        self.batches = []
+        self.watched = True
+
+    def apply_changes(self, paths):
+        self.batches.append(paths)
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+class TestPlanningWatcher(unittest.TestCase):
+    def _check_backend(self, backend):
+        with tempfile.TemporaryDirectory() as tmp:
+            planning, identity = make_repo(Path(tmp))
+            model = PlanningModel(planning, identity)
+            watcher = PlanningWatcher(model, backend=backend, debounce=0.05, poll_interval=0.05)
+            watcher.start()
+            try:
+                self.assertEqual(watcher.backend, backend)
+                self.assertTrue(model.watched)
+                loads = lambda: {
+                    user['alias']: user['weekly_stats'][0]['total_load']
+                    for user in model.dashboard_data(include_pii=False)['users']
+                }
+                self.assertEqual(loads(), {'alice': 40})
+
+                people = planning / 'people'
+                for n in range(20):
+                    (people / f'p{n:02d}.md').write_text(PERSON_TEMPLATE.format(alias=f'p{n:02d}', hours=4), encoding='utf-8')
+                (people / 'alice.md').write_text(PERSON_TEMPLATE.format(alias='alice', hours=24), encoding='utf-8')
+                (planning / 'skills.md').write_text("# Skills\n", encoding='utf-8')
+                self.assertTrue(_wait_for(lambda: len(loads()) == 21 and loads()['alice'] == 60))
+                # The burst arrives as a handful of batches, not one per file.
+                self.assertLess(watcher.batches, 5)
+
+                for n in range(20):
+                    (people / f'p{n:02d}.md').unlink()
+                self.assertTrue(_wait_for(lambda: loads() == {'alice': 60}))
+            finally:
+                watcher.stop()
+            self.assertFalse(model.watched)
+
+    def _check_recreated_directory(self, backend):
+        with tempfile.TemporaryDirectory() as tmp:
+            planning, identity = make_repo(Path(tmp))
+            people = planning / 'people'
+            shutil.rmtree(people)
+            model = PlanningModel(planning, identity)
+            watcher = PlanningWatcher(model, backend=backend, debounce=0.05, poll_interval=0.05)
+            watcher.start()
+            try:
+                aliases = lambda: [user['alias'] for user in model.dashboard_data(include_pii=False)['users']]
+                self.assertEqual(aliases(), [])
+
+                # people/ did not exist at startup, and is then removed and re-created.
+                for alias in ('alice', 'bob'):
+                    people.mkdir()
+                    (people / f'{alias}.md').write_text(PERSON_TEMPLATE.format(alias=alias, hours=8), encoding='utf-8')
+                    self.assertTrue(_wait_for(lambda: aliases() == [alias]))
+                    # Later edits inside the new directory are seen too.
+                    (people / 'carol.md').write_text(PERSON_TEMPLATE.format(alias='carol', hours=8), encoding='utf-8')
+                    self.assertTrue(_wait_for(lambda: aliases() == [alias, 'carol']))
+                    shutil.rmtree(people)
+                    self.assertTrue(_wait_for(lambda: aliases() == []))
+            finally:
+                watcher.stop()
+
+    def test_continuous_changes_are_delivered_within_max_latency(self):
+        model = _RecordingModel()
+        watcher = PlanningWatcher(model, debounce=0.05, max_latency=0.2)
+        path = Path('planning') / 'people' / 'alice.md'
+        watcher._backend = _ChurningBackend(path)
+        watcher._thread = threading.Thread(target=watcher._run, daemon=True)
+        started = time.monotonic()
+        watcher._thread.start()
+        try:
+            self.assertTrue(_wait_for(lambda: len(model.batches) >= 2))
+        finally:
+            watcher.stop()
+        self.assertLess(time.monotonic() - started, 2.0)
+        self.assertEqual(model.batches[0], [path])
+
+    def test_polling_backend_feeds_changes_to_the_model(self):
+        self._check_backend('poll')
+
+    @unittest.skipUnless(sys.platform.startswith('linux'), 'inotify is Linux only')
+    def test_inotify_backend_feeds_changes_to_the_model(self):
+        self._check_backend('inotify')
+
+    def test_polling_backend_follows_recreated_directories(self):
+        self._check_recreated_directory('poll')
+
+    @unittest.skipUnless(sys.platform.startswith('linux'), 'inotify is Linux only')
+    def test_inotify_backend_follows_recreated_directories(self):
+        self._check_recreated_directory('inotify')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,131 @@
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import yaml
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import pussla_frontmatter
+
+
+class TestParseCache(unittest.TestCase):
+    def test_unchanged_file_is_parsed_once(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "alice.md"
+            path.write_text("---\nalias: alice\n---\nProfile\n", encoding="utf-8")
+            cache = pussla_frontmatter.ParseCache()
+
+            first = cache.read(path)
+            second = cache.read(path)
+
+            self.assertEqual(first, ({"alias": "alice"}, "Profile\n"))
+            self.assertIs(first[0], second[0])
+            self.assertEqual(cache.stats()["misses"], 1)
+            self.assertEqual(cache.stats()["hits"], 1)
+
+    def test_changed_file_is_reparsed(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "alice.md"
+            path.write_text("---\nalias: alice\n---\n", encoding="utf-8")
+            cache = pussla_frontmatter.ParseCache()
+            cache.read(path)
+
+            path.write_text("---\nalias: alice\nrole_id: Dev-Role\n---\n", encoding="utf-8")
+            data, _body = cache.read(path)
+
+            self.assertEqual(data["role_id"], "Dev-Role")
+            self.assertEqual(cache.stats()["misses"], 2)
+
+    def test_lru_eviction(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = []
+            for name in ("a", "b", "c"):
+                path = Path(tmp) / f"{name}.md"
+                path.write_text(f"---\nalias: {name}\n---\n", encoding="utf-8")
+                paths.append(path)
+            cache = pussla_frontmatter.ParseCache(max_entries=2)
+
+            cache.read(paths[0])
+            cache.read(paths[1])
+            cache.read(paths[0])
+            cache.read(paths[2])  # evicts b, the least recently used
+            cache.read(paths[0])
+            cache.read(paths[1])
+
+            stats = cache.stats()
+            self.assertEqual(stats["entries"], 2)
+            self.assertEqual(stats["evictions"], 2)
+            self.assertEqual(stats["misses"], 4)
+
+    def test_failures_are_cached_and_reraised(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "broken.md"
+            path.write_text("no frontmatter here\n", encoding="utf-8")
+            cache = pussla_frontmatter.ParseCache()
+
+            for _ in range(2):
+                with self.assertRaisesRegex(pussla_frontmatter.FrontmatterError, "start delimiter") as ctx:
+                    cache.read(path)
+                self.assertEqual(ctx.exception.body_offset, 0)
+            self.assertEqual(cache.stats()["misses"], 1)
+
+    def test_summary_and_crlf_bodies(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "Project-X.md"
+            path.write_bytes(b"---\r\nname: Project-X\r\n---\r\n\r\n## Scope\r\nMore text\r\n")
+            cache = pussla_frontmatter.ParseCache()
+
+            self.assertEqual(cache.summary(path), "## Scope")
+            data, body = cache.read(path)
+            self.assertEqual(data, {"name": "Project-X"})
+            self.assertEqual(body, "\n## Scope\nMore text\n")
+            self.assertEqual(cache.stats()["misses"], 1)
+
+    def test_derived_values_are_computed_once_per_signature(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "alice.md"
+            path.write_text("---\nalias: alice\n---\n", encoding="utf-8")
+            cache = pussla_frontmatter.ParseCache()
+            calls = []
+
+            def version(handle):
+                calls.append(1)
+                return len(handle.read())
+
+            self.assertEqual(cache.derived(path, "version", version), 21)
+            self.assertEqual(cache.derived(path, "version", version), 21)
+            self.assertEqual(len(calls), 1)
+
+            path.write_text("---\nalias: alice-b\n---\n", encoding="utf-8")
+            self.assertEqual(cache.derived(path, "version", version), 23)
+            self.assertEqual(len(calls), 2)
+            self.assertEqual(cache.stats()["misses"], 0)
+
+    def test_prefetch_with_process_pool_matches_serial_parse(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = []
+            for idx in range(6):
+                path = Path(tmp) / f"p{idx}.md"
+                path.write_text(f"---\nalias: p{idx}\nweeks: [2026-W0{idx + 1}]\n---\nBody {idx}\n", encoding="utf-8")
+                paths.append(path)
+            broken = Path(tmp) / "broken.md"
+            broken.write_text("---\nalias: [unclosed\n---\n", encoding="utf-8")
+            paths.append(broken)
+
+            serial = pussla_frontmatter.ParseCache()
+            parallel = pussla_frontmatter.ParseCache()
+            self.assertEqual(parallel.prefetch(paths, jobs=2), len(paths))
+
+            for path in paths[:-1]:
+                self.assertEqual(parallel.read(path), serial.read(path))
+            with self.assertRaises(yaml.YAMLError):
+                parallel.load(broken)
+            self.assertEqual(parallel.stats()["misses"], len(paths))
+
+
+if __name__ == '__main__':
+    unittest.main()
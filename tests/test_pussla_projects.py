@@ -0,0 +1,58 @@
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import pussla_projects
+
+
+def _write_project(path: Path, name: str, project_id: str) -> None:
+    path.write_text(f"---\nproject_id: {project_id}\nname: {name}\n---\nScope\n", encoding='utf-8')
+
+
+class TestProjectIndex(unittest.TestCase):
+    def test_resolves_name_project_id_and_stem(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            projects = Path(tmp)
+            _write_project(projects / 'lighthouse.md', 'Project-Lighthouse', 'proj-1')
+            _write_project(projects / 'other.md', 'Other', 'lighthouse')
+            index = pussla_projects.ProjectIndex(projects)
+
+            self.assertEqual(index.resolve('Project-Lighthouse'), projects / 'lighthouse.md')
+            self.assertEqual(index.resolve('proj-1'), projects / 'lighthouse.md')
+            # A stem wins over another file's project_id.
+            self.assertEqual(index.resolve('lighthouse'), projects / 'lighthouse.md')
+            self.assertEqual(index.resolve('Other'), projects / 'other.md')
+            self.assertIsNone(index.resolve('Missing'))
+            self.assertEqual(index.paths(), [projects / 'lighthouse.md', projects / 'other.md'])
+            self.assertEqual(index.names(), {'Project-Lighthouse', 'Other'})
+
+    def test_follows_added_renamed_and_removed_files(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            projects = Path(tmp)
+            _write_project(projects / 'a.md', 'Alpha', 'a')
+            index = pussla_projects.project_index(projects)
+            self.assertIs(index, pussla_projects.project_index(str(projects)))
+            self.assertEqual(index.resolve('Alpha'), projects / 'a.md')
+            rebuilds = index.rebuilds
+            self.assertIn('Alpha', index)
+            self.assertEqual(index.rebuilds, rebuilds)
+
+            _write_project(projects / 'b.md', 'Beta', 'b')
+            self.assertEqual(index.resolve('Beta'), projects / 'b.md')
+
+            # Renamed in place: the old name no longer resolves.
+            _write_project(projects / 'a.md', 'Alpha-2', 'a')
+            self.assertEqual(index.resolve('Alpha-2'), projects / 'a.md')
+            self.assertNotIn('Alpha', index)
+
+            (projects / 'b.md').unlink()
+            self.assertIsNone(index.resolve('Beta'))
+
+
+if __name__ == '__main__':
+    unittest.main()
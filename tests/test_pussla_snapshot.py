@@ -0,0 +1,94 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import pussla_frontmatter
+import pussla_snapshot
+
+
+def _write(path, alias):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(f"---\nalias: {alias}\n---\nBody\n", encoding="utf-8")
+
+
+class TestSnapshot(unittest.TestCase):
+    def test_restore_skips_parsing_unchanged_files(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp) / "planning"
+            _write(root / "people" / "alice.md", "alice")
+            _write(root / "people" / "bob.md", "bob")
+            cache_dir = Path(tmp) / "cache"
+
+            first = pussla_frontmatter.ParseCache()
+            for path in sorted((root / "people").glob("*.md")):
+                first.load(path)
+            pussla_snapshot.save_snapshot(cache_dir, [root], cache=first)
+
+            _write(root / "people" / "bob.md", "bobby-with-longer-alias")
+            second = pussla_frontmatter.ParseCache()
+            stats = pussla_snapshot.restore_snapshot(cache_dir, [root], cache=second)
+
+            self.assertEqual(stats["restored"], 1)
+            self.assertEqual(stats["stale"], 1)
+            self.assertFalse(stats["complete"])
+            self.assertEqual(second.load(root / "people" / "alice.md")[0], {"alias": "alice"})
+            self.assertEqual(second.load(root / "people" / "bob.md")[0], {"alias": "bobby-with-longer-alias"})
+            self.assertEqual(second.stats()["misses"], 1)
+
+    def test_restore_keeps_summaries_and_versions(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp) / "planning"
+            path = root / "people" / "alice.md"
+            _write(path, "alice")
+            cache_dir = Path(tmp) / "cache"
+
+            first = pussla_frontmatter.ParseCache()
+            self.assertEqual(first.summary(path), "Body")
+            first.derived(path, "version", lambda handle: len(handle.read()))
+            pussla_snapshot.save_snapshot(cache_dir, [root], cache=first)
+
+            second = pussla_frontmatter.ParseCache()
+            pussla_snapshot.restore_snapshot(cache_dir, [root], cache=second)
+
+            self.assertEqual(second.summary(path), "Body")
+            self.assertEqual(second.derived(path, "version", lambda handle: self.fail("rehashed")), 26)
+            self.assertEqual(second.stats()["computed"], 0)
+            self.assertEqual(second.stats()["misses"], 0)
+
+    def test_git_blob_id_restores_touched_files(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp) / "planning"
+            path = root / "people" / "alice.md"
+            _write(path, "alice")
+            try:
+                subprocess.run(["git", "init", "-q", tmp], check=True)
+                subprocess.run(["git", "-C", tmp, "add", "."], check=True)
+                subprocess.run(
+                    ["git", "-C", tmp, "-c", "user.name=t", "-c", "user.email=t@t", "commit", "-qm", "init"],
+                    check=True,
+                )
+            except (OSError, subprocess.CalledProcessError):
+                self.skipTest("git is not available")
+            cache_dir = Path(tmp) / "cache"
+
+            first = pussla_frontmatter.ParseCache()
+            first.load(path)
+            pussla_snapshot.save_snapshot(cache_dir, [root], cache=first)
+
+            os.utime(path, ns=(1, 1))
+            second = pussla_frontmatter.ParseCache()
+            stats = pussla_snapshot.restore_snapshot(cache_dir, [root], cache=second)
+
+            self.assertEqual(stats["restored"], 1)
+            self.assertEqual(second.load(path)[0], {"alias": "alice"})
+            self.assertEqual(second.stats()["misses"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
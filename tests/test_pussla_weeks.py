@@ -0,0 +1,66 @@
+import os
+import sys
+import unittest
+from datetime import datetime
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import pussla_weeks
+
+
+class TestIsoWeeks(unittest.TestCase):
+    def test_week_of_interns_and_rejects_invalid_labels(self):
+        week = pussla_weeks.week_of("2026-W09")
+        self.assertIs(week, pussla_weeks.week_of("2026-W09"))
+        self.assertEqual((week.year, week.week, week.label), (2026, 9, "2026-W09"))
+        self.assertIsNone(pussla_weeks.week_of("2026-W9"))
+        self.assertIsNone(pussla_weeks.week_of("2026-W54"))
+        self.assertIsNone(pussla_weeks.week_of(None))
+        # Matches the pattern, but its Monday is past the last date ``date`` supports.
+        self.assertIsNone(pussla_weeks.week_of("9999-W53"))
+        self.assertEqual(pussla_weeks.week_of("9999-W52").label, "9999-W52")
+
+    def test_ordinals_sort_like_labels_across_years(self):
+        labels = ["2027-W01", "2026-W53", "2026-W10", "2025-W52", "2026-W09"]
+        by_ordinal = sorted(labels, key=lambda label: pussla_weeks.week_of(label).ordinal)
+        self.assertEqual(by_ordinal, sorted(labels))
+        week = pussla_weeks.week_of("2031-W17")
+        self.assertIs(pussla_weeks.week_from_ordinal(week.ordinal), week)
+
+    def test_month_and_quarter_match_strptime(self):
+        for label in ("2026-W09", "2026-W10", "2026-W53", "2027-W53", "2028-W13"):
+            expected = datetime.strptime(label + "-1", "%G-W%V-%u").strftime("%Y-%m")
+            self.assertEqual(pussla_weeks.week_of(label).month, expected, label)
+        self.assertEqual(pussla_weeks.week_of("2026-W15").quarter, "2026-Q2")
+        self.assertEqual(pussla_weeks.week_of("2027-W53").quarter, "2028-Q1")
+
+
+    def test_week_ranges_expand_and_compact_across_year_boundaries(self):
+        weeks = pussla_weeks.expand_weeks(["2026-W51..2027-W02", "2027-W05", "bad", "2027-W03..2027-W01"])
+        self.assertEqual(
+            [week.label for week in weeks],
+            ["2026-W51", "2026-W52", "2026-W53", "2027-W01", "2027-W02", "2027-W05"],
+        )
+        # 2027 has no W53: a range skips straight to the next year ...
+        self.assertEqual(
+            [week.label for week in pussla_weeks.weeks_in("2027-W52..2028-W01")], ["2027-W52", "2028-W01"]
+        )
+        # ... and cannot end on it.
+        self.assertIsNone(pussla_weeks.weeks_in("2027-W50..2027-W53"))
+        self.assertIsNone(pussla_weeks.weeks_in("9999-W51..9999-W53"))
+        # Ranges are capped at MAX_RANGE_WEEKS.
+        self.assertEqual(len(pussla_weeks.weeks_in("2020-W01..2029-W52")), 522)
+        self.assertIsNone(pussla_weeks.weeks_in("2000-W01..2999-W01"))
+
+        self.assertEqual(
+            pussla_weeks.compact_weeks(weeks + [pussla_weeks.week_of("2027-W06"), pussla_weeks.week_of("2026-W51")]),
+            ["2026-W51..2027-W02", "2027-W05", "2027-W06"],
+        )
+        self.assertEqual(
+            pussla_weeks.compact_weeks(pussla_weeks.expand_weeks(["2027-W52", "2027-W53", "2028-W01"])),
+            ["2027-W52", "2027-W53", "2028-W01"],
+        )
+
+if __name__ == '__main__':
+    unittest.main()
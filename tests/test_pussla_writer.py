@@ -0,0 +1,66 @@
+import os
+import sys
+import unittest
+
+import yaml
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import pussla_writer
+
+HAND_WRITTEN = """---
+alias: alice   # keep this comment
+role_id: Dev-Role
+skills: [python, "sql"]
+allocations:
+  # Q1 work
+  - project: A
+    weeks: ["2026-W01", "2026-W02"]
+    load: 50
+  - {project: B, weeks: [2026-W03], load: 20}
+
+notes: free text
+---
+Body stays *exactly* as written.
+"""
+
+
+def _read(text):
+    return yaml.safe_load(text.split('\n---\n', 1)[0][4:])
+
+
+class TestPatchFrontmatter(unittest.TestCase):
+    def test_only_changed_items_are_rewritten(self):
+        data = _read(HAND_WRITTEN)
+        original = data['allocations']
+        data['allocations'] = [original[0], {'project': 'C', 'weeks': ['2026-W04'], 'load': 10}]
+
+        patched = pussla_writer.patch_frontmatter(HAND_WRITTEN, data, original)
+
+        self.assertEqual(_read(patched), data)
+        self.assertIn('alias: alice   # keep this comment\n', patched)
+        self.assertIn('skills: [python, "sql"]\n', patched)
+        self.assertIn('  # Q1 work\n  - project: A\n    weeks: ["2026-W01", "2026-W02"]\n', patched)
+        self.assertIn('  - project: C\n    weeks:\n    - 2026-W04\n', patched)
+        self.assertNotIn('project: B', patched)
+        self.assertTrue(patched.endswith('\nnotes: free text\n---\nBody stays *exactly* as written.\n'))
+
+    def test_flow_style_list_is_replaced_as_a_block(self):
+        text = "---\nalias: bob\nallocations: []\nskills: [go]\n---\nBody\n"
+        data = {'alias': 'bob', 'allocations': [{'project': 'P', 'weeks': ['2026-W01'], 'load': 40}], 'skills': ['go']}
+        patched = pussla_writer.patch_frontmatter(text, data, [])
+        self.assertEqual(_read(patched), data)
+        self.assertTrue(patched.startswith('---\nalias: bob\nallocations:\n- project: P\n'))
+        self.assertIn('skills: [go]\n', patched)
+
+    def test_falls_back_to_a_full_dump_when_other_keys_change(self):
+        data = _read(HAND_WRITTEN)
+        original = data['allocations']
+        data['role_id'] = 'Ops-Role'
+        patched = pussla_writer.patch_frontmatter(HAND_WRITTEN, data, original)
+        self.assertEqual(patched, pussla_writer.dump_frontmatter(data, 'Body stays *exactly* as written.\n'))
+
+
+if __name__ == '__main__':
+    unittest.main()
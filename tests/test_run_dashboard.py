@@ -0,0 +1,475 @@
+import gzip
+import http.client
+import json
+import os
+import shutil
+import socket
+import sys
+import tempfile
+import threading
+import time
+import unittest
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src', 'dashboard'))
+
+import precompress_static
+import pussla_engine
+import run_dashboard
+from planning_model import PlanningModel
+
+TST_DATA = Path(__file__).resolve().parent.parent / 'tst-data'
+
+
+class QuietHandler(run_dashboard.DashboardHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+class DashboardServerTestCase(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        root = Path(self._tmp.name)
+        shutil.copytree(TST_DATA / 'planning', root / 'planning')
+        shutil.copytree(TST_DATA / 'identity', root / 'identity')
+        self.planning = root / 'planning'
+        static_dir = root / 'static'
+        static_dir.mkdir()
+        (static_dir / 'index.html').write_text('<html></html>', encoding='utf-8')
+        self.static_dir = static_dir
+
+        self.server = self._make_server(static_dir)
+        self.server.model = PlanningModel(self.planning, root / 'identity')
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.base_url = f'http://127.0.0.1:{self.server.server_address[1]}'
+
+    def _make_server(self, static_dir):
+        return run_dashboard.DashboardServer(
+            ('127.0.0.1', 0),
+            lambda *args, **kwargs: QuietHandler(*args, static_dir=static_dir, **kwargs),
+        )
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self._tmp.cleanup()
+
+    def request(self, path, headers=None, data=None, method=None):
+        req = urllib.request.Request(self.base_url + path, headers=headers or {}, data=data, method=method)
+        try:
+            with urllib.request.urlopen(req) as resp:
+                return resp.status, resp.headers, resp.read()
+        except urllib.error.HTTPError as exc:
+            with exc:
+                return exc.code, exc.headers, exc.read()
+
+
+class TestConditionalRequests(DashboardServerTestCase):
+    def test_etag_and_last_modified_answer_304_until_data_changes(self):
+        status, headers, body = self.request('/api/dashboard-data?format=v2')
+        self.assertEqual(status, 200)
+        etag = headers['ETag']
+        self.assertTrue(json.loads(body)['users'])
+
+        status, headers, body = self.request('/api/dashboard-data?format=v2', {'If-None-Match': etag})
+        self.assertEqual((status, body), (304, b''))
+        self.assertEqual(headers['ETag'], etag)
+        status, _headers, _body = self.request(
+            '/api/dashboard-data?format=v2', {'If-Modified-Since': headers['Last-Modified']}
+        )
+        self.assertEqual(status, 304)
+
+        status, headers, _body = self.request('/api/dashboard-data?format=v2&include_pii=0')
+        self.assertEqual(status, 200)
+        self.assertEqual(headers['ETag'], etag)
+        status, headers, _body = self.request('/api/dashboard-data?format=v2&to_week=2026-W30')
+        self.assertEqual(status, 200)
+        self.assertNotEqual(headers['ETag'], etag)
+
+        alias = sorted(self.planning.glob('people/*.md'))[0].stem
+        payload = json.dumps({'alias': alias, 'week': '2026-W30', 'allocations': []}).encode('utf-8')
+        status, _headers, _body = self.request(
+            '/api/allocation/update', {'Content-Type': 'application/json'}, payload, 'POST'
+        )
+        self.assertEqual(status, 200)
+        status, headers, _body = self.request('/api/dashboard-data?format=v2', {'If-None-Match': etag})
+        self.assertEqual(status, 200)
+        self.assertNotEqual(headers['ETag'], etag)
+
+
+class TestBulkUpdate(DashboardServerTestCase):
+    def test_bulk_update_applies_all_edits_or_reports_the_failing_one(self):
+        aliases = [path.stem for path in sorted(self.planning.glob('people/*.md'))[:2]]
+        edits = [
+            {'alias': alias, 'week': week, 'allocations': [{'project': 'Bulk-Project', 'load': 30}]}
+            for alias in aliases
+            for week in ('2026-W40', '2026-W41')
+        ]
+        bad = json.dumps({'edits': edits + [{'alias': aliases[0], 'week': 'W41', 'allocations': []}]})
+        status, _headers, body = self.request(
+            '/api/allocation/bulk-update', {'Content-Type': 'application/json'}, bad.encode('utf-8'), 'POST'
+        )
+        self.assertEqual(status, 400)
+        self.assertIn('edit 4', json.loads(body)['error'])
+
+        status, _headers, body = self.request(
+            '/api/allocation/bulk-update',
+            {'Content-Type': 'application/json'},
+            json.dumps({'edits': edits}).encode('utf-8'),
+            'POST',
+        )
+        self.assertEqual(status, 200)
+        self.assertEqual(len(json.loads(body)['updated']), 4)
+        _status, _headers, body = self.request('/api/dashboard-data?format=v2&projects=Bulk-Project&include_raw=1')
+        raw = json.loads(body)['raw_allocations']
+        self.assertEqual(sorted((r['alias'], r['week']) for r in raw), sorted((e['alias'], e['week']) for e in edits))
+
+
+class TestOptimisticVersioning(DashboardServerTestCase):
+    def test_if_match_rejects_stale_versions_with_409(self):
+        _status, _headers, body = self.request('/api/dashboard-data?format=v2')
+        user = json.loads(body)['users'][0]
+        allocations = [{'project': 'Versioned', 'load': 20}]
+        payload = json.dumps({'alias': user['alias'], 'week': '2026-W40', 'allocations': allocations}).encode('utf-8')
+        headers = {'Content-Type': 'application/json', 'If-Match': f'"{user["version"]}"'}
+
+        status, response_headers, body = self.request('/api/allocation/update', headers, payload, 'POST')
+        self.assertEqual(status, 200)
+        new_version = json.loads(body)['updated']['version']
+        self.assertEqual(response_headers['ETag'], f'"{new_version}"')
+
+        status, _headers, body = self.request('/api/allocation/update', headers, payload, 'POST')
+        self.assertEqual(status, 409)
+        self.assertEqual(json.loads(body)['version'], new_version)
+
+        _status, _headers, body = self.request('/api/dashboard-data?format=v2')
+        by_alias = {u['alias']: u for u in json.loads(body)['users']}
+        self.assertEqual(by_alias[user['alias']]['version'], new_version)
+
+
+class TestIdentities(DashboardServerTestCase):
+    def test_identities_endpoint_serves_names_separately(self):
+        _status, _headers, body = self.request('/api/dashboard-data?format=v2')
+        users = json.loads(body)['users']
+        self.assertTrue(all(user['real_name'] is None for user in users))
+
+        status, headers, body = self.request('/api/identities')
+        self.assertEqual(status, 200)
+        names = json.loads(body)['identities']
+        self.assertEqual(names['FishCatcher'], 'Erik Andersson')
+        status, _headers, _body = self.request('/api/identities', {'If-None-Match': headers['ETag']})
+        self.assertEqual(status, 304)
+
+
+class TestCompression(DashboardServerTestCase):
+    def test_api_response_is_gzipped_when_accepted(self):
+        _status, plain_headers, plain = self.request('/api/dashboard-data')
+        self.assertIsNone(plain_headers['Content-Encoding'])
+
+        status, headers, body = self.request('/api/dashboard-data', {'Accept-Encoding': 'gzip, br;q=0'})
+        self.assertEqual(status, 200)
+        self.assertEqual(headers['Content-Encoding'], 'gzip')
+        self.assertEqual(headers['Vary'], 'Accept-Encoding')
+        self.assertLess(len(body), len(plain))
+        self.assertEqual(json.loads(gzip.decompress(body)), json.loads(plain))
+        self.assertNotEqual(headers['ETag'], plain_headers['ETag'])
+
+        status, _headers, _body = self.request(
+            '/api/dashboard-data', {'Accept-Encoding': 'gzip', 'If-None-Match': headers['ETag']}
+        )
+        self.assertEqual(status, 304)
+
+    def test_precompressed_static_files_and_immutable_assets(self):
+        assets = self.static_dir / 'assets'
+        assets.mkdir()
+        script = 'console.log("pussla");\n' * 200
+        (assets / 'index-abc123.js').write_text(script, encoding='utf-8')
+        precompress_static.precompress(self.static_dir)
+
+        status, headers, body = self.request('/assets/index-abc123.js', {'Accept-Encoding': 'gzip'})
+        self.assertEqual(status, 200)
+        self.assertEqual(headers['Content-Encoding'], 'gzip')
+        self.assertIn('javascript', headers['Content-Type'])
+        self.assertIn('immutable', headers['Cache-Control'])
+        self.assertEqual(gzip.decompress(body).decode('utf-8'), script)
+
+        status, headers, body = self.request('/assets/index-abc123.js')
+        self.assertIsNone(headers['Content-Encoding'])
+        self.assertEqual(body.decode('utf-8'), script)
+
+        status, headers, _body = self.request('/planning')
+        self.assertEqual(status, 200)
+        self.assertEqual(headers['Cache-Control'], 'no-cache')
+
+
+class TestStreaming(DashboardServerTestCase):
+    def test_streamed_json_matches_json_dumps(self):
+        data = self.server.model.dashboard_data()
+        for indent in (None, 2):
+            self.assertEqual(
+                ''.join(pussla_engine.iter_dashboard_json(data, indent=indent)),
+                json.dumps(data, indent=indent, ensure_ascii=False),
+            )
+        self.assertEqual(''.join(pussla_engine.iter_dashboard_json({'users': []})), '{"users": []}')
+
+        output = Path(self._tmp.name) / 'out.json'
+        pussla_engine.write_dashboard_json(output, self.planning, self.planning.parent / 'identity')
+        self.assertEqual(json.loads(output.read_text(encoding='utf-8'))['users'], data['users'])
+
+    def test_first_response_is_chunked_and_repeat_is_served_from_cache(self):
+        status, headers, body = self.request('/api/dashboard-data?format=v2', {'Accept-Encoding': 'gzip'})
+        self.assertEqual(status, 200)
+        self.assertEqual(headers['Transfer-Encoding'], 'chunked')
+        first = json.loads(gzip.decompress(body))
+
+        status, headers, body = self.request('/api/dashboard-data?format=v2', {'Accept-Encoding': 'gzip'})
+        self.assertIsNone(headers['Transfer-Encoding'])
+        self.assertEqual(int(headers['Content-Length']), len(body))
+        self.assertEqual(json.loads(gzip.decompress(body)), first)
+
+
+class TestDelta(DashboardServerTestCase):
+    def test_since_returns_only_changed_rows(self):
+        _status, _headers, body = self.request('/api/dashboard-data?format=v2')
+        version = json.loads(body)['data_version']
+        alias = sorted(self.planning.glob('people/*.md'))[0].stem
+        edit = {'alias': alias, 'week': '2026-W45', 'allocations': [{'project': 'Delta-Project', 'load': 20}]}
+        self.request('/api/allocation/update', {'Content-Type': 'application/json'}, json.dumps(edit).encode('utf-8'), 'POST')
+
+        status, headers, body = self.request(f'/api/dashboard-data?format=v2&since={version}')
+        self.assertEqual(status, 200)
+        delta = json.loads(body)
+        self.assertEqual(delta['data_version'], version + 1)
+        self.assertIn('2026-W45', delta['weeks'])
+        row = next(user for user in delta['users'] if user['alias'] == alias)
+        self.assertEqual([stats['week'] for stats in row['weekly_stats']], ['2026-W45'])
+        status, _headers, _body = self.request(
+            f'/api/dashboard-data?format=v2&since={version}', {'If-None-Match': headers['ETag']}
+        )
+        self.assertEqual(status, 304)
+
+        self.assertTrue(json.loads(self.request('/api/dashboard-data?format=v2&since=1')[2])['full_reload'])
+        for query in ('since=1', 'format=v2&since=x', 'format=v2&since=1&aliases=a'):
+            self.assertEqual(self.request(f'/api/dashboard-data?{query}')[0], 400)
+
+class TestEvents(DashboardServerTestCase):
+    def _next_event(self, stream):
+        fields = {}
+        while True:
+            line = stream.readline().decode('utf-8').rstrip('\n')
+            if not line:
+                if 'event' in fields:
+                    return fields['event'], json.loads(fields['data'])
+                continue
+            if not line.startswith(':'):
+                name, _sep, value = line.partition(': ')
+                fields[name] = value
+
+    def test_events_report_api_and_disk_changes(self):
+        self.server.event_keepalive = 0.05
+        aliases = [path.stem for path in sorted(self.planning.glob('people/*.md'))[:2]]
+        with urllib.request.urlopen(self.base_url + '/api/events', timeout=10) as stream:
+            self.assertEqual(stream.headers['Content-Type'], 'text/event-stream; charset=utf-8')
+            name, event = self._next_event(stream)
+            self.assertEqual(name, 'version')
+            self.assertEqual(event['version'], self.server.model.version()[0])
+
+            edit = {'alias': aliases[0], 'week': '2026-W45', 'allocations': [{'project': 'Event-Project', 'load': 20}]}
+            status, _headers, _body = self.request(
+                '/api/allocation/update', {'Content-Type': 'application/json'}, json.dumps(edit).encode('utf-8'), 'POST'
+            )
+            self.assertEqual(status, 200)
+            name, event = self._next_event(stream)
+            self.assertEqual(name, 'change')
+            self.assertEqual((event['aliases'], event['weeks'], event['projects']), ([aliases[0]], ['2026-W45'], ['Event-Project']))
+            self.assertEqual(event['version'], self.server.model.version()[0])
+
+            # Edited on disk, found by the keepalive check of an unwatched model.
+            other = self.planning / 'people' / f'{aliases[1]}.md'
+            other.write_text(other.read_text(encoding='utf-8').replace('role_id:', 'role_id: Changed-', 1), encoding='utf-8')
+            _name, event = self._next_event(stream)
+            self.assertEqual(event['aliases'], [aliases[1]])
+            self.assertEqual(event['weeks'], [])
+
+
+class TestRequestLimits(DashboardServerTestCase):
+    def test_oversized_request_body_is_rejected(self):
+        conn = http.client.HTTPConnection('127.0.0.1', self.server.server_address[1], timeout=10)
+        try:
+            conn.putrequest('POST', '/api/allocation/update')
+            conn.putheader('Content-Length', str(self.server.max_body_bytes + 1))
+            conn.endheaders()
+            self.assertEqual(conn.getresponse().status, 413)
+        finally:
+            conn.close()
+
+
+class TestWorkerPool(DashboardServerTestCase):
+    def _make_server(self, static_dir):
+        server = run_dashboard.DashboardServer(
+            ('127.0.0.1', 0),
+            lambda *args, **kwargs: QuietHandler(*args, static_dir=static_dir, **kwargs),
+            workers=1,
+            queue_depth=1,
+        )
+        server.request_timeout = 2.0
+        return server
+
+    def _connect(self):
+        sock = socket.create_connection(('127.0.0.1', self.server.server_address[1]), timeout=10)
+        self.addCleanup(sock.close)
+        return sock
+
+    def _wait_for(self, condition):
+        deadline = time.monotonic() + 5
+        while not condition():
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.01)
+
+    def test_saturated_pool_answers_503_and_stalled_clients_time_out(self):
+        stalled = self._connect()
+        stalled.sendall(b'GET / HTTP/1.1\r\n')
+        self._wait_for(self.server._connections.empty)
+        queued = self._connect()
+        queued.sendall(b'GET /api/identities HTTP/1.1\r\nHost: test\r\nConnection: close\r\n\r\n')
+        self._wait_for(lambda: not self.server._connections.empty())
+
+        status, headers, _body = self.request('/api/identities')
+        self.assertEqual(status, 503)
+        self.assertEqual(headers['Retry-After'], '1')
+
+        # The stalled request times out, freeing the worker for the queued one.
+        self.assertEqual(stalled.recv(1024), b'')
+        response = queued.makefile('rb').read()
+        self.assertTrue(response.startswith(b'HTTP/1.1 200 OK'))
+        self.assertEqual(self.request('/api/identities')[0], 200)
+
+    def test_pool_sizes_below_one_are_rejected(self):
+        for kwargs in ({'workers': 0}, {'queue_depth': 0}, {'queue_depth': -1}):
+            with self.subTest(**kwargs), self.assertRaises(ValueError):
+                run_dashboard.DashboardServer(('127.0.0.1', 0), QuietHandler, **kwargs)
+
+
+class TestPipelining(DashboardServerTestCase):
+    def test_pipelined_requests_are_all_answered(self):
+        self.server.keep_alive_timeout = 1.0
+        sock = socket.create_connection(('127.0.0.1', self.server.server_address[1]), timeout=10)
+        self.addCleanup(sock.close)
+        sock.sendall(b'GET /api/identities HTTP/1.1\r\nHost: test\r\n\r\n' * 2)
+
+        # The second request is read along with the first; it must not wait for more input.
+        responses = sock.makefile('rb')
+        for _ in range(2):
+            self.assertTrue(responses.readline().startswith(b'HTTP/1.1 200 '))
+            headers = http.client.parse_headers(responses)
+            json.loads(responses.read(int(headers['Content-Length'])))
+
+
+class AsyncServerMixin:
+    def _make_server(self, static_dir):
+        return run_dashboard.AsyncDashboardServer(
+            ('127.0.0.1', 0), QuietHandler, {'static_dir': static_dir}, workers=2
+        )
+
+
+class TestAsyncConditionalRequests(AsyncServerMixin, TestConditionalRequests):
+    pass
+
+
+class TestAsyncCompression(AsyncServerMixin, TestCompression):
+    pass
+
+
+class TestAsyncDelta(AsyncServerMixin, TestDelta):
+    pass
+
+
+class TestAsyncEvents(AsyncServerMixin, TestEvents):
+    pass
+
+
+class TestAsyncRequestLimits(AsyncServerMixin, TestRequestLimits):
+    pass
+
+
+class TestAsyncPipelining(AsyncServerMixin, TestPipelining):
+    pass
+
+
+class TestAsyncServer(AsyncServerMixin, DashboardServerTestCase):
+    def test_queue_depth_bounds_pending_requests(self):
+        self.assertEqual(self.server.max_pending, 2 + 64)
+        with self.assertRaises(ValueError):
+            run_dashboard.AsyncDashboardServer(('127.0.0.1', 0), QuietHandler, queue_depth=0)
+
+    def test_keep_alive_connection_serves_several_requests(self):
+        conn = http.client.HTTPConnection('127.0.0.1', self.server.server_address[1], timeout=10)
+        try:
+            conn.request('GET', '/api/dashboard-data?format=v2')
+            resp = conn.getresponse()
+            self.assertEqual(resp.headers['Transfer-Encoding'], 'chunked')
+            etag = resp.headers['ETag']
+            first = json.loads(resp.read())
+            sock = conn.sock
+
+            alias = first['users'][0]['alias']
+            body = json.dumps({'alias': alias, 'week': '2026-W30', 'allocations': []})
+            conn.request('POST', '/api/allocation/update', body, {'Content-Type': 'application/json'})
+            resp = conn.getresponse()
+            self.assertEqual(resp.status, 200)
+            resp.read()
+
+            conn.request('GET', '/api/dashboard-data?format=v2', headers={'If-None-Match': etag})
+            resp = conn.getresponse()
+            self.assertEqual(resp.status, 200)
+            self.assertNotEqual(json.loads(resp.read())['data_version'], first['data_version'])
+            conn.request('GET', '/')
+            resp = conn.getresponse()
+            self.assertEqual(resp.read(), b'<html></html>')
+            self.assertIs(conn.sock, sock)
+        finally:
+            conn.close()
+
+    def test_open_connections_do_not_add_threads(self):
+        self.request('/api/dashboard-data?format=v2')
+        threads = threading.active_count()
+        conns = [http.client.HTTPConnection('127.0.0.1', self.server.server_address[1], timeout=10) for _ in range(40)]
+        try:
+            for conn in conns:
+                conn.request('GET', '/api/identities')
+            for conn in conns:
+                resp = conn.getresponse()
+                self.assertEqual(resp.status, 200)
+                resp.read()
+            self.assertLessEqual(threading.active_count(), threads + self.server.workers)
+        finally:
+            for conn in conns:
+                conn.close()
+
+    def test_connections_beyond_the_cap_are_answered_503(self):
+        self.server.max_connections = 2
+        conns = [http.client.HTTPConnection('127.0.0.1', self.server.server_address[1], timeout=10) for _ in range(2)]
+        try:
+            for conn in conns:
+                conn.request('GET', '/api/identities')
+                conn.getresponse().read()
+
+            status, headers, _body = self.request('/api/identities')
+            self.assertEqual(status, 503)
+            self.assertEqual(headers['Retry-After'], '1')
+
+            conns.pop().close()
+            deadline = time.monotonic() + 5
+            while (status := self.request('/api/identities')[0]) == 503 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            self.assertEqual(status, 200)
+        finally:
+            for conn in conns:
+                conn.close()
+
+
+if __name__ == '__main__':
+    unittest.main()